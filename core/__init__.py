@@ -0,0 +1 @@
+"""Shared execution and grading helpers used by the Streamlit pages."""
@@ -0,0 +1,352 @@
+"""
+Static analysis of pandas submissions for performance anti-patterns.
+
+``analyze(code)`` walks the AST before the code is executed and returns a
+``Finding`` per hit:
+
+- ``iterrows`` / ``itertuples`` loops;
+- ``DataFrame.apply(..., axis=1)``;
+- chained indexing (``df[mask]['col']``, ``df['col'][i] = ...``);
+- a DataFrame grown inside a loop (``acc = pd.concat([acc, ...])``,
+  ``acc.loc[len(acc)] = ...``);
+- builtin ``sum`` over a Series.
+
+Where the expression can be rewritten mechanically (a row-wise lambda made
+only of arithmetic, comparisons and ``and``/``or`` on ``row['col']``,
+chained indexing, ``sum(series)``) the finding carries the candidate's own
+expression and its vectorized form. Otherwise a small template of the
+pattern is used. The "antipatterns" job kind times both versions in the
+sandbox on growing prefixes of the problem's scale-mode dataset until the
+slow one takes ``BUDGET`` seconds, so the candidate sees the real speedup.
+"""
+import ast
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from pandas.api import types
+
+from core.fixtures import load_fixtures, views
+from core.sandbox import Limits, Verdict, register_job_kind
+from core.scale import SEED
+
+# Prefix lengths tried in turn; the quadratic patterns grow 16x per step at most.
+SIZES = (500, 2_000, 8_000, 32_000, 128_000, 512_000)
+BUDGET = 0.5  # stop growing once the slow version takes this long
+FAST_REPEAT = 3
+LIMITS = Limits(cpu_seconds=60, wall_seconds=90, memory_mb=2048)
+SCALE_ROWS = 1_000_000
+
+
+@dataclass
+class Finding:
+    rule: str  # iterrows | itertuples | apply_axis1 | chained_indexing | chained_assignment
+               # | grow_in_loop | builtin_sum
+    line: int
+    code: str  # the offending source
+    message: str
+    suggestion: str  # vectorized equivalent, as code
+    frame: str = ""  # name of the DataFrame involved, when known
+    slow: str = None  # expression to time; None: use the rule's template
+    fast: str = None
+
+
+@dataclass
+class Timing:
+    rule: str
+    line: int
+    rows: int
+    slow_seconds: float
+    fast_seconds: float
+    templated: bool
+    error: str = ""
+
+    @property
+    def speedup(self):
+        return self.slow_seconds / self.fast_seconds if self.fast_seconds else None
+
+
+def _axis_is_rows(call):
+    for kw in call.keywords:
+        if kw.arg == "axis" and isinstance(kw.value, ast.Constant) and kw.value.value in (1, "columns"):
+            return True
+    return False
+
+
+def _root_name(node):
+    """``df`` for ``df``, ``df['a']``, ``df.loc[...]``, ``df.a.b``; None otherwise."""
+    while isinstance(node, (ast.Subscript, ast.Attribute)):
+        node = node.value
+    return node.id if isinstance(node, ast.Name) else None
+
+
+class _Vectorize(ast.NodeTransformer):
+    """Turns a row-wise lambda body into a column expression, or raises ValueError."""
+
+    BOOL_OPS = {ast.And: ast.BitAnd, ast.Or: ast.BitOr}
+
+    def __init__(self, row, frame):
+        self.row, self.frame = row, frame
+
+    def generic_visit(self, node):
+        allowed = (ast.BinOp, ast.UnaryOp, ast.Compare, ast.Constant, ast.BoolOp, ast.IfExp,
+                   ast.operator, ast.unaryop, ast.cmpop, ast.boolop, ast.Load)
+        if not isinstance(node, allowed):
+            raise ValueError(type(node).__name__)
+        return super().generic_visit(node)
+
+    def visit_Subscript(self, node):
+        if isinstance(node.value, ast.Name) and node.value.id == self.row and isinstance(node.slice, ast.Constant):
+            return ast.Subscript(ast.Name(self.frame, ast.Load()), node.slice, ast.Load())
+        raise ValueError("subscript")
+
+    def visit_Attribute(self, node):
+        if isinstance(node.value, ast.Name) and node.value.id == self.row:
+            return ast.Subscript(ast.Name(self.frame, ast.Load()), ast.Constant(node.attr), ast.Load())
+        raise ValueError("attribute")
+
+    def visit_Name(self, node):
+        raise ValueError("name")
+
+    def visit_BoolOp(self, node):
+        values = [self.visit(v) for v in node.values]
+        out = values[0]
+        for v in values[1:]:
+            out = ast.BinOp(out, self.BOOL_OPS[type(node.op)](), v)
+        return out
+
+    def visit_UnaryOp(self, node):
+        operand = self.visit(node.operand)
+        op = ast.Invert() if isinstance(node.op, ast.Not) else node.op
+        return ast.UnaryOp(op, operand)
+
+    def visit_Compare(self, node):
+        if len(node.ops) != 1 or isinstance(node.ops[0], (ast.Is, ast.IsNot, ast.In, ast.NotIn)):
+            raise ValueError("compare")
+        return ast.Compare(self.visit(node.left), node.ops, [self.visit(node.comparators[0])])
+
+    def visit_IfExp(self, node):
+        args = [self.visit(node.test), self.visit(node.body), self.visit(node.orelse)]
+        return ast.Call(ast.Attribute(ast.Name("np", ast.Load()), "where", ast.Load()), args, [])
+
+
+def _vectorize_lambda(call, frame):
+    fn = call.args[0] if call.args else None
+    if not isinstance(fn, ast.Lambda) or len(fn.args.args) != 1:
+        return None
+    try:
+        body = _Vectorize(fn.args.args[0].arg, frame).visit(fn.body)
+    except ValueError:
+        return None
+    return ast.unparse(ast.fix_missing_locations(body))
+
+
+def _is_column_key(node):
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return True
+    return isinstance(node, ast.List) and all(isinstance(e, ast.Constant) and isinstance(e.value, str)
+                                              for e in node.elts)
+
+
+class _Analyzer(ast.NodeVisitor):
+    def __init__(self, source):
+        self.source = source
+        self.findings = []
+        self.loops = 0
+        self.seen = set()
+
+    def add(self, node, **kw):
+        key = (kw["rule"], node.lineno, node.col_offset)
+        if key not in self.seen:
+            self.seen.add(key)
+            self.findings.append(Finding(line=node.lineno, code=ast.get_source_segment(self.source, node) or "", **kw))
+
+    # --- loops: iterrows/itertuples and frames grown inside them ---
+    def _iter_call(self, node):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and \
+                node.func.attr in ("iterrows", "itertuples"):
+            self.add(node, rule=node.func.attr, frame=_root_name(node.func.value) or "",
+                     message=f"`.{node.func.attr}()` membuat satu objek Python per baris; loop ini berjalan di "
+                             "interpreter, bukan di kode C pandas/NumPy.",
+                     suggestion="df['baru'] = df['a'] * df['b']   # operasi kolom sekaligus\n"
+                                "df['flag'] = np.where(df['a'] > 0, 'ya', 'tidak')")
+
+    def visit_For(self, node):
+        self._iter_call(node.iter)
+        self.loops += 1
+        self.generic_visit(node)
+        self.loops -= 1
+
+    def visit_While(self, node):
+        self.loops += 1
+        self.generic_visit(node)
+        self.loops -= 1
+
+    def visit_comprehension(self, node):
+        self._iter_call(node.iter)
+        self.generic_visit(node)
+
+    def visit_Assign(self, node):
+        if self.loops:
+            self._grow(node)
+        self.generic_visit(node)
+
+    def _grow(self, node):
+        target = node.targets[0]
+        value = node.value
+        if isinstance(target, ast.Name) and isinstance(value, ast.Call):
+            name = target.id
+            func = value.func
+            concat = isinstance(func, ast.Attribute) and func.attr == "concat" or \
+                isinstance(func, ast.Name) and func.id == "concat"
+            appended = isinstance(func, ast.Attribute) and func.attr in ("append", "_append") and \
+                _root_name(func.value) == name
+            uses_self = any(isinstance(n, ast.Name) and n.id == name for a in value.args for n in ast.walk(a))
+            if (concat and uses_self) or appended:
+                self._add_grow(node, name)
+        elif isinstance(target, ast.Subscript) and isinstance(target.value, ast.Attribute) and \
+                target.value.attr == "loc" and isinstance(target.slice, ast.Call) and \
+                isinstance(target.slice.func, ast.Name) and target.slice.func.id == "len":
+            self._add_grow(node, _root_name(target.value) or "")
+
+    def _add_grow(self, node, name):
+        self.add(node, rule="grow_in_loop", frame=name,
+                 message=f"`{name}` diperbesar di dalam loop: setiap iterasi menyalin seluruh isinya, "
+                         "jadi totalnya O(n²).",
+                 suggestion="rows = []\nfor ...:\n    rows.append({...})        # list Python murah ditambah\n"
+                            "result = pd.DataFrame(rows)       # satu kali pembuatan DataFrame\n"
+                            "# lebih baik lagi: hitung kolomnya langsung secara vektor")
+
+    # --- calls: apply(axis=1) and builtin sum ---
+    def visit_Call(self, node):
+        func = node.func
+        if isinstance(func, ast.Attribute) and func.attr == "apply" and _axis_is_rows(node):
+            frame = _root_name(func.value) or "df"
+            obj = ast.unparse(func.value)
+            fast = _vectorize_lambda(node, obj)
+            if fast is not None:
+                suggestion = f"{fast}"
+            else:
+                suggestion = f"{obj}['a'] * {obj}['b']   # ekspresi kolom, bukan fungsi per baris"
+            self.add(node, rule="apply_axis1", frame=frame,
+                     message="`apply(axis=1)` memanggil fungsi Python sekali per baris dengan membangun "
+                             "sebuah Series untuk setiap baris.",
+                     suggestion=suggestion, slow=ast.unparse(node) if fast else None, fast=fast)
+        elif isinstance(func, ast.Name) and func.id == "sum" and len(node.args) == 1 and not node.keywords:
+            self._builtin_sum(node, node.args[0])
+        self.generic_visit(node)
+
+    def _builtin_sum(self, node, arg):
+        if isinstance(arg, ast.GeneratorExp) and len(arg.generators) == 1:
+            gen = arg.generators[0]
+            if isinstance(gen.target, ast.Name) and isinstance(arg.elt, ast.Name) and \
+                    arg.elt.id == gen.target.id and not gen.ifs:
+                arg = gen.iter
+            else:
+                return
+        if not isinstance(arg, (ast.Subscript, ast.Attribute)) or _root_name(arg) is None:
+            return
+        series = ast.unparse(arg)
+        self.add(node, rule="builtin_sum", frame=_root_name(arg),
+                 message="`sum()` bawaan Python mengambil elemen Series satu per satu sebagai objek Python.",
+                 suggestion=f"{series}.sum()", slow=ast.unparse(node), fast=f"({series}).sum()")
+
+    # --- chained indexing ---
+    def visit_Subscript(self, node):
+        inner = node.value
+        if isinstance(inner, ast.Subscript) and isinstance(inner.value, ast.Name) and \
+                not isinstance(inner.slice, ast.Slice) and not isinstance(node.slice, ast.Slice):
+            frame = inner.value.id
+            rows, cols = inner.slice, node.slice
+            if _is_column_key(rows) and not _is_column_key(cols):
+                rows, cols = cols, rows
+            if _is_column_key(cols) and not _is_column_key(rows):
+                fixed = f"{frame}.loc[{ast.unparse(rows)}, {ast.unparse(cols)}]"
+                store = isinstance(node.ctx, ast.Store)
+                message = ("Chained indexing: dengan copy-on-write, penugasan ini hanya mengubah salinan "
+                           "sementara, bukan `{0}`." if store else
+                           "Chained indexing: `{0}` diindeks dua kali dan membuat objek perantara.").format(frame)
+                self.add(node, rule="chained_assignment" if store else "chained_indexing", frame=frame,
+                         message=message, suggestion=fixed,
+                         slow=None if store else ast.unparse(node), fast=None if store else fixed)
+                return  # the inner subscript is part of this finding
+        self.generic_visit(node)
+
+
+def analyze(code):
+    """Anti-pattern findings in ``code``, in source order (none if it does not parse)."""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return []
+    analyzer = _Analyzer(code)
+    analyzer.visit(tree)
+    return sorted(analyzer.findings, key=lambda f: f.line)
+
+
+def _template(finding, frame, data):
+    """(slow, fast) statements that reproduce the finding's pattern on ``data[frame]``, or None."""
+    df = data[frame]
+    numeric = [c for c in df.columns if types.is_numeric_dtype(df[c].dtype) and not types.is_bool_dtype(df[c].dtype)]
+    col = numeric[0] if numeric else df.columns[0]
+    c, pos = repr(col), list(df.columns).index(col) + 1
+    return {
+        "iterrows": (f"_ = [row[{c}] * 2 for _i, row in {frame}.iterrows()]", f"_ = ({frame}[{c}] * 2).tolist()"),
+        "itertuples": (f"_ = [row[{pos}] * 2 for row in {frame}.itertuples()]", f"_ = ({frame}[{c}] * 2).tolist()"),
+        "apply_axis1": (f"_ = {frame}.apply(lambda row: row[{c}] * 2, axis=1)", f"_ = {frame}[{c}] * 2"),
+        "grow_in_loop": ("acc = pd.DataFrame({'x': []})\n"
+                         f"for v in {frame}[{c}].to_numpy():\n"
+                         "    acc = pd.concat([acc, pd.DataFrame({'x': [v * 2]})], ignore_index=True)",
+                         f"acc = pd.DataFrame({{'x': {frame}[{c}] * 2}})"),
+        "chained_indexing": (f"_ = {frame}[{frame}[{c}] > 0][{c}]", f"_ = {frame}.loc[{frame}[{c}] > 0, {c}]"),
+        "builtin_sum": (f"_ = sum({frame}[{c}])", f"_ = {frame}[{c}].sum()"),
+    }.get(finding.rule)  # a chained assignment is a correctness bug, there is nothing to time
+
+
+def _run(code, namespace):
+    start = time.perf_counter()
+    exec(code, dict(namespace))
+    return time.perf_counter() - start
+
+
+def _measure_pair(finding, slow, fast, templated, data, frame, sizes, budget):
+    timing = None
+    for rows in sizes:
+        namespace = {"pd": pd, "np": np, **{k: v.head(rows) for k, v in views(data).items()}}
+        slow_s = _run(slow, namespace)
+        fast_s = min(_run(fast, namespace) for _ in range(FAST_REPEAT))
+        timing = Timing(finding.rule, finding.line, len(namespace[frame]), slow_s, fast_s, templated)
+        if slow_s >= budget or rows >= len(data[frame]):
+            break
+    return timing
+
+
+def measure(finding, data, sizes=SIZES, budget=BUDGET):
+    """
+    Times the slow and the vectorized version on growing prefixes of ``data``
+    (None when the finding has nothing to time).
+    The candidate's own expression is used when it runs on the datasets alone;
+    if it needs the candidate's variables, the rule's template is timed instead.
+    """
+    frame = finding.frame if finding.frame in data else next(iter(data))
+    pairs = [(f"_ = {finding.slow}", f"_ = {finding.fast}", False)] if finding.slow is not None else []
+    template = _template(finding, frame, data)
+    if template is not None:
+        pairs.append((*template, True))
+    if not pairs:
+        return None
+    error = ""
+    for slow, fast, templated in pairs:
+        try:
+            return _measure_pair(finding, slow, fast, templated, data, frame, sizes, budget)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+    return Timing(finding.rule, finding.line, 0, 0.0, 0.0, True, error=error)
+
+
+@register_job_kind("antipatterns")
+def _run_antipatterns(job):
+    data = load_fixtures(job["scale"], job["datasets"], job.get("n", SCALE_ROWS), job.get("seed", SEED))
+    timings = [t for t in (measure(f, data) for f in job["findings"]) if t is not None]
+    return Verdict("ok", seconds=sum(t.slow_seconds + t.fast_seconds for t in timings), detail=timings)
@@ -0,0 +1,211 @@
+"""
+Benchmark suite for the reference solutions, with a local regression history.
+
+Every run times each reference solution on small / medium / large inputs and
+appends the results to ``.benchmarks/history.jsonl``. The current run is
+compared against the median of recent runs with the same suite version on
+the same machine, so a slower reference implementation shows up as a
+regression.
+
+Usage::
+
+    python -m core.benchmark                       # all tiers, save to history
+    python -m core.benchmark --tiers small,medium  # skip the heavy tier
+    python -m core.benchmark --problems twoSum --no-save
+"""
+import argparse
+import copy
+import hashlib
+import inspect
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+
+from core.complexity import PROBLEMS
+from core.solutions import ADAPTERS, REFERENCES
+
+# Bump whenever sizes or generators change: older history is then not comparable.
+SUITE_VERSION = 1
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY_PATH = os.path.join(ROOT, ".benchmarks", "history.jsonl")
+TIERS = ("small", "medium", "large")
+
+
+def _contains_duplicate(n, rng):
+    nums = list(range(n))
+    rng.shuffle(nums)
+    return [nums]  # no duplicate: worst case, the whole array is scanned
+
+
+def _is_valid(n, rng):
+    pairs = {"(": ")", "[": "]", "{": "}"}
+    out, stack = [], []
+    while len(out) + len(stack) < n:
+        if stack and rng.random() < 0.5:
+            out.append(pairs[stack.pop()])
+        else:
+            stack.append(rng.choice("([{"))
+            out.append(stack[-1])
+    out.extend(pairs[c] for c in reversed(stack))
+    return ["".join(out)]
+
+
+def _climb_stairs(n, rng):
+    return [n]
+
+
+GENERATORS = {name: spec.generator for name, spec in PROBLEMS.items()}
+GENERATORS.update({
+    "containsDuplicate": _contains_duplicate,
+    "isValid": _is_valid,
+    "climbStairs": _climb_stairs,
+})
+
+# n per tier; for numIslands n is the number of cells (4000 x 4000 at "large").
+SIZES = {
+    "twoSum": (1_000, 100_000, 1_000_000),
+    "isAnagram": (1_000, 100_000, 1_000_000),
+    "containsDuplicate": (1_000, 100_000, 1_000_000),
+    "isValid": (1_000, 100_000, 1_000_000),
+    "maxArea": (1_000, 100_000, 1_000_000),
+    "lengthOfLongestSubstring": (1_000, 100_000, 1_000_000),
+    "numIslands": (100 * 100, 1_000 * 1_000, 4_000 * 4_000),
+    "climbStairs": (100, 10_000, 100_000),
+    "mergeKLists": (1_000, 100_000, 1_000_000),
+}
+REPEATS = {"small": 20, "medium": 5, "large": 3}
+
+
+@dataclass
+class BenchResult:
+    problem: str
+    tier: str
+    n: int
+    best: float
+    mean: float
+    repeats: int
+    source_hash: str
+
+
+def source_hash(fn):
+    """Short hash of the implementation, so history shows when a reference changed."""
+    return hashlib.sha1(inspect.getsource(fn).encode()).hexdigest()[:10]
+
+
+def time_call(fn, args, adapter=None, repeats=5):
+    """Best and mean wall time of ``fn(*args)``; inputs are rebuilt for every call."""
+    adapt_in, _ = ADAPTERS.get(adapter, (list, None))
+    times = []
+    for _ in range(repeats):
+        call_args = adapt_in(copy.deepcopy(args))
+        t0 = time.perf_counter()
+        fn(*call_args)
+        times.append(time.perf_counter() - t0)
+    return min(times), statistics.mean(times)
+
+
+def run_suite(problems=None, tiers=TIERS, seed=0, log=None):
+    results = []
+    for problem in problems or REFERENCES:
+        fn = REFERENCES[problem]
+        adapter = PROBLEMS[problem].adapter if problem in PROBLEMS else None
+        for tier in tiers:
+            n = SIZES[problem][TIERS.index(tier)]
+            args = GENERATORS[problem](n, random.Random(seed + n))
+            best, mean = time_call(fn, args, adapter, REPEATS[tier])
+            results.append(BenchResult(problem, tier, n, best, mean, REPEATS[tier], source_hash(fn)))
+            if log:
+                log(f"{problem:<26}{tier:<8}n={n:<10}{best * 1000:10.3f} ms")
+    return results
+
+
+def _machine():
+    return f"{platform.node()}|{platform.machine()}|{platform.python_version()}"
+
+
+def _git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def load_history(path=HISTORY_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def save_run(results, path=HISTORY_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    record = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "suite_version": SUITE_VERSION,
+        "machine": _machine(),
+        "git": _git_revision(),
+        "results": [asdict(r) for r in results],
+    }
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+    return record
+
+
+def find_regressions(results, history, threshold=0.2, window=5):
+    """
+    Compares each result with the median best time of the last ``window``
+    comparable runs. Returns ``(result, baseline, ratio)`` for every result
+    slower than ``baseline * (1 + threshold)``.
+    """
+    machine = _machine()
+    runs = [h for h in history if h["suite_version"] == SUITE_VERSION and h["machine"] == machine]
+    regressions = []
+    for r in results:
+        past = [p["best"] for h in runs for p in h["results"]
+                if p["problem"] == r.problem and p["tier"] == r.tier][-window:]
+        if not past:
+            continue
+        baseline = statistics.median(past)
+        ratio = r.best / baseline if baseline else float("inf")
+        if ratio > 1 + threshold:
+            regressions.append((r, baseline, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the reference solutions.")
+    parser.add_argument("--problems", help="comma-separated problem names (default: all)")
+    parser.add_argument("--tiers", default=",".join(TIERS), help="comma-separated subset of small,medium,large")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before flagging (0.2 = 20%%)")
+    parser.add_argument("--no-save", action="store_true", help="do not append this run to the history")
+    args = parser.parse_args(argv)
+
+    problems = args.problems.split(",") if args.problems else None
+    tiers = [t for t in args.tiers.split(",") if t]
+    unknown = set(problems or []) - set(REFERENCES) | set(tiers) - set(TIERS)
+    if unknown:
+        parser.error(f"unknown problem/tier: {', '.join(sorted(unknown))}")
+
+    history = load_history()
+    results = run_suite(problems, tiers, log=print)
+    regressions = find_regressions(results, history, args.threshold)
+    if not args.no_save:
+        save_run(results)
+
+    for r, baseline, ratio in regressions:
+        print(f"REGRESSION {r.problem} [{r.tier}]: {r.best * 1000:.3f} ms vs baseline "
+              f"{baseline * 1000:.3f} ms ({ratio:.2f}x, source {r.source_hash})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
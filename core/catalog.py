@@ -0,0 +1,113 @@
+"""
+Problem catalogs: the statements, starter code, tests and explanations of a
+page, kept as data in ``catalog/<name>.toml`` instead of page code.
+
+``load_catalog(name)`` parses a file into frozen ``Level``/``Problem``
+objects once and returns the same ``Catalog`` on every rerun until the file
+changes on disk. Pages then build widgets only for the selected problem, so
+a rerun costs the same with 10 problems or 500.
+
+Fields every page understands are attributes of ``Problem``; anything else
+in a ``[[problems]]`` table (e.g. the pandas ``setup`` code) lands in
+``Problem.extra``. See the header of each TOML file for the schema.
+"""
+import functools
+import os
+from dataclasses import dataclass, field, fields
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python < 3.11
+    import tomli as tomllib
+
+CATALOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "catalog")
+
+
+@dataclass(frozen=True)
+class Level:
+    id: str
+    tab: str
+    header: str = ""
+    intro: str = ""
+
+
+@dataclass(frozen=True)
+class Problem:
+    slot: str
+    level: str
+    title: str
+    number: int = 0  # position within its level, from 1
+    entry: str = ""
+    statement: str = ""
+    info: str = ""
+    starter: str = ""
+    height: int = 150
+    tests: tuple = ()
+    compare: str = "exact"
+    adapter: str = None
+    explanation: str = ""
+    time: str = ""
+    time_why: str = ""
+    space: str = ""
+    space_why: str = ""
+    notes: str = ""
+    extra: dict = field(default_factory=dict)
+
+    def complexity_markdown(self):
+        lines = []
+        for label, value, why in (("Waktu", self.time, self.time_why), ("Memori", self.space, self.space_why)):
+            if value:
+                lines.append(f"-   **{label}**: ${value}$" + (f" - {why}" if why else ""))
+        return "**Kompleksitas**:\n" + "\n".join(lines) if lines else ""
+
+
+_PROBLEM_FIELDS = {f.name for f in fields(Problem)} - {"number", "extra"}
+
+
+@dataclass(frozen=True)
+class Catalog:
+    name: str
+    levels: tuple
+    problems: tuple
+
+    def level(self, level_id):
+        return next(l for l in self.levels if l.id == level_id)
+
+    def problem(self, slot):
+        return next(p for p in self.problems if p.slot == slot)
+
+    def problems_in(self, level_id):
+        return [p for p in self.problems if p.level == level_id]
+
+
+def _parse(name, raw):
+    levels = tuple(Level(**level) for level in raw.get("levels", []))
+    level_ids = {l.id for l in levels}
+    problems, seen, counts = [], set(), {}
+    for item in raw.get("problems", []):
+        known = {k: v for k, v in item.items() if k in _PROBLEM_FIELDS}
+        missing = {"slot", "level", "title"} - set(known)
+        if missing:
+            raise ValueError(f"{name}: problem {item.get('slot', '?')} missing {', '.join(sorted(missing))}")
+        if known["level"] not in level_ids:
+            raise ValueError(f"{name}: problem {known['slot']} has unknown level {known['level']!r}")
+        if known["slot"] in seen:
+            raise ValueError(f"{name}: duplicate slot {known['slot']!r}")
+        seen.add(known["slot"])
+        counts[known["level"]] = counts.get(known["level"], 0) + 1
+        known["tests"] = tuple(known.get("tests", ()))
+        extra = {k: v for k, v in item.items() if k not in _PROBLEM_FIELDS}
+        problems.append(Problem(number=counts[known["level"]], extra=extra, **known))
+    return Catalog(name, levels, tuple(problems))
+
+
+@functools.lru_cache(maxsize=32)
+def _load(path, mtime_ns):
+    with open(path, "rb") as f:
+        return _parse(os.path.basename(path), tomllib.load(f))
+
+
+def load_catalog(name, directory=CATALOG_DIR):
+    """Parsed ``<directory>/<name>.toml``; re-read only when the file's mtime changes."""
+    path = os.path.join(directory, f"{name}.toml")
+    return _load(path, os.stat(path).st_mtime_ns)
@@ -0,0 +1,242 @@
+"""
+Empirical Big-O profiler.
+
+Runs a solution on geometrically growing generated inputs, keeps the best
+of a few timings per size and fits the curve against the usual complexity
+classes. Profiling jobs run inside the sandbox. ``kind="profile_pair"``
+times the candidate and the reference in the same job, alternating the two
+calls at every size, so load on the host slows both alike instead of
+skewing one curve against the other.
+"""
+import copy
+import math
+import random
+import string
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from core import solutions
+from core.sandbox import Verdict, load_submission, register_job_kind
+from core.solutions import ADAPTERS
+
+MODELS = {
+    "O(1)": lambda n: np.ones_like(n),
+    "O(log n)": np.log2,
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * np.log2(n),
+    "O(n²)": lambda n: n ** 2,
+}
+
+
+def _two_sum(n, rng):
+    # Only the last two numbers add up to target, so every solution scans it all.
+    nums = [2 * i for i in range(max(n - 2, 0))]
+    rng.shuffle(nums)
+    return [nums + [10 * n + 1, 10 * n + 3], 20 * n + 4]
+
+
+def _is_anagram(n, rng):
+    s = "".join(rng.choices(string.ascii_lowercase, k=n))
+    t = list(s)
+    rng.shuffle(t)
+    return [s, "".join(t)]
+
+
+def _max_area(n, rng):
+    return [[rng.randint(1, 10_000) for _ in range(n)]]
+
+
+def _longest_substring(n, rng):
+    return ["".join(rng.choices(string.ascii_lowercase, k=n))]
+
+
+def _num_islands(n, rng):
+    side = max(1, math.isqrt(n))
+    return [[["1" if rng.random() < 0.5 else "0" for _ in range(side)] for _ in range(side)]]
+
+
+def _merge_k_lists(n, rng):
+    k = max(1, math.isqrt(n))
+    values = [rng.randint(0, 10 * n) for _ in range(n)]
+    return [[sorted(values[i::k]) for i in range(k)]]
+
+
+@dataclass
+class ProblemSpec:
+    generator: object
+    claimed: str
+    space: str
+    adapter: str = None
+
+
+# n is the total input size: array length, string length, grid cells or nodes.
+PROBLEMS = {
+    "twoSum": ProblemSpec(_two_sum, "O(n)", "O(n)"),
+    # 26-letter alphabet, so the frequency maps are bounded
+    "isAnagram": ProblemSpec(_is_anagram, "O(n)", "O(1)"),
+    "maxArea": ProblemSpec(_max_area, "O(n)", "O(1)"),
+    "lengthOfLongestSubstring": ProblemSpec(_longest_substring, "O(n)", "O(1)"),
+    "numIslands": ProblemSpec(_num_islands, "O(n)", "O(n)"),
+    # k = sqrt(n) lists; log k only adds ~0.05 to the slope, so this reads as O(n)
+    "mergeKLists": ProblemSpec(_merge_k_lists, "O(n log k)", "O(k)", adapter="linked_lists"),
+}
+
+
+@dataclass
+class Profile:
+    problem: str
+    sizes: list = field(default_factory=list)
+    times: list = field(default_factory=list)
+    label: str = ""
+    residuals: dict = field(default_factory=dict)
+    slope: float = 0.0
+    halves: tuple = ()  # best-of timings over the even and the odd repeats (profile_pair only)
+
+
+def growth_slope(sizes, times):
+    """Log-log slope over the larger half of the sizes: ~1 for O(n), ~2 for O(n²)."""
+    half = len(sizes) // 2
+    x = np.log(np.asarray(sizes[half:], dtype=float))
+    y = np.log(np.maximum(np.asarray(times[half:], dtype=float), 1e-9))
+    if len(x) < 2:
+        return 0.0
+    return float(np.polyfit(x, y, 1)[0])
+
+
+def fit_complexity(sizes, times):
+    """
+    Classifies a timing curve and returns ``(label, residuals)``.
+
+    The label is the model whose own log-log slope over the same sizes is
+    closest to the measured one; anything within 0.15 of the best match
+    loses to a simpler model, because cache and allocator effects make
+    CPython loops look slightly superlinear. Residuals of the least-squares
+    fit ``t = a + b * f(n)`` (SSE / sum of t²) are returned for display.
+    """
+    n = np.asarray(sizes, dtype=float)
+    t = np.asarray(times, dtype=float)
+    scale = float(np.sum(t ** 2)) or 1.0
+    observed = growth_slope(sizes, times)
+    residuals, distance = {}, {}
+    for label, f in MODELS.items():
+        x = f(n)
+        if label == "O(1)":
+            pred = np.full_like(t, t.mean())
+        else:
+            A = np.column_stack([np.ones_like(x), x])
+            (a, b), *_ = np.linalg.lstsq(A, t, rcond=None)
+            pred = a + b * x if b > 0 else np.full_like(t, t.mean())
+        residuals[label] = float(np.sum((t - pred) ** 2) / scale)
+        distance[label] = abs(growth_slope(sizes, x) - observed)
+
+    best = min(distance.values())
+    label = next(l for l in MODELS if distance[l] <= best + 0.15)
+    return label, residuals
+
+
+def _time_call(fn, adapt_in, args):
+    # CPU time of this thread: on a busy host, wall-clock time of the longer calls
+    # includes time slices given to other processes and bends the curve upwards.
+    call_args = adapt_in(copy.deepcopy(args))
+    t0 = time.thread_time()
+    fn(*call_args)
+    return time.thread_time() - t0
+
+
+def _finish(result):
+    if len(result.sizes) >= 3:
+        result.label, result.residuals = fit_complexity(result.sizes, result.times)
+        result.slope = growth_slope(result.sizes, result.times)
+    return result
+
+
+def profile(fn, problem, start=256, max_n=2 ** 17, repeats=3, call_budget=0.25, seed=0):
+    """
+    Times ``fn`` on doubling input sizes until ``max_n`` or until one call
+    takes longer than ``call_budget`` seconds (CPU time, see ``_time_call``).
+    """
+    spec = PROBLEMS[problem]
+    adapt_in, _ = ADAPTERS.get(spec.adapter, (list, None))
+    result = Profile(problem)
+    n = start
+    while n <= max_n:
+        args = spec.generator(n, random.Random(seed + n))
+        best = min(_time_call(fn, adapt_in, args) for _ in range(repeats))
+        result.sizes.append(n)
+        result.times.append(best)
+        if best > call_budget:
+            break
+        n *= 2
+    return _finish(result)
+
+
+def profile_pair(fn, reference, problem, start=256, max_n=2 ** 17, repeats=4, call_budget=0.25, seed=0):
+    """
+    ``(candidate, reference)`` Profiles over the same sizes. The two calls
+    alternate within each size; both curves stop growing once either one
+    call takes longer than ``call_budget``. Besides the best of all
+    ``repeats``, each Profile keeps the best of the even and of the odd
+    repeats in ``halves``: two independent curves for ``compare_growth``.
+    """
+    spec = PROBLEMS[problem]
+    adapt_in, _ = ADAPTERS.get(spec.adapter, (list, None))
+    results = [Profile(problem, halves=([], [])) for _ in range(2)]
+    n = start
+    while n <= max_n:
+        args = spec.generator(n, random.Random(seed + n))
+        runs = [[], []]
+        for _ in range(repeats):
+            for i, f in enumerate((fn, reference)):
+                runs[i].append(_time_call(f, adapt_in, args))
+        for result, times in zip(results, runs):
+            result.sizes.append(n)
+            result.times.append(min(times))
+            result.halves[0].append(min(times[0::2]))
+            result.halves[1].append(min(times[1::2]))
+        if max(r.times[-1] for r in results) > call_budget:
+            break
+        n *= 2
+    return tuple(_finish(r) for r in results)
+
+
+def is_slower_class(candidate, reference, tolerance=0.5):
+    """True when the candidate grows clearly faster than the reference (e.g. O(n²) vs O(n))."""
+    return candidate.slope > reference.slope + tolerance
+
+
+def compare_growth(candidate, reference, tolerance=0.5):
+    """
+    "slower", "same" or "unstable" for two ``profile_pair`` Profiles: the
+    even and the odd repeats must reach the same ``is_slower_class`` answer,
+    otherwise the timings were too noisy to flag anything.
+    """
+    if not candidate.halves:
+        return "slower" if is_slower_class(candidate, reference, tolerance) else "same"
+    answers = {growth_slope(candidate.sizes, mine) > growth_slope(reference.sizes, ref) + tolerance
+               for mine, ref in zip(candidate.halves, reference.halves)}
+    if len(answers) > 1:
+        return "unstable"
+    return "slower" if answers.pop() else "same"
+
+
+@register_job_kind("profile")
+def _run_profile(job):
+    if job["code"] is None:
+        fn = getattr(solutions, job["entry"])
+    else:
+        fn = load_submission(job["code"], job["entry"])
+        if fn is None:
+            return Verdict("error", message=f"Fungsi `{job['entry']}` tidak ditemukan.")
+    result = profile(fn, job["entry"], **job.get("options", {}))
+    return Verdict("ok", seconds=sum(result.times), detail=result)
+
+
+@register_job_kind("profile_pair")
+def _run_profile_pair(job):
+    fn = load_submission(job["code"], job["entry"])
+    if fn is None:
+        return Verdict("error", message=f"Fungsi `{job['entry']}` tidak ditemukan.")
+    mine, ref = profile_pair(fn, getattr(solutions, job["entry"]), job["entry"], **job.get("options", {}))
+    return Verdict("ok", seconds=sum(mine.times), detail=(mine, ref))
@@ -0,0 +1,177 @@
+"""
+DuckDB as an alternate engine for the pandas challenges.
+
+Every pandas problem in ``catalog/pandas.toml`` can carry an ``sql`` field:
+the same answer as a DuckDB query over the problem's datasets (a filter,
+a ``GROUP BY`` mean, an ``AVG(...) OVER (ROWS 2 PRECEDING)`` window).
+The "duckdb" job kind runs a candidate's query inside the sandbox:
+
+1. the fixture files (see ``core.fixtures``) are memory-mapped as Arrow
+   tables and registered under their dataset names, so DuckDB scans the
+   mapped buffers directly: nothing is copied or converted;
+2. the query result is fetched as Arrow, reshaped like the pandas
+   reference (``sql_index`` columns become the index, a one-column result
+   becomes a Series) and checked with ``compare_frames``;
+3. both engines are timed on the same data.
+
+SQL has no row labels, so without ``sql_index`` the comparison ignores the
+index of the pandas result and looks at the values in order.
+
+``python -m core.engines`` times pandas against DuckDB on the scale-mode
+datasets for growing row counts, to show where each engine wins.
+"""
+import argparse
+import time
+from dataclasses import dataclass
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+from core.fixtures import materialize, read_fixture, read_table, views
+from core.frames import compare_frames
+from core.sandbox import Limits, Verdict, register_job_kind
+
+SIZES = (10_000, 100_000, 1_000_000, 10_000_000)
+# DuckDB's own allocations are not counted by RLIMIT_AS until they happen, so cap them explicitly.
+LIMITS = Limits(cpu_seconds=20, wall_seconds=30, memory_mb=1024)
+MEMORY_LIMIT = "512MB"
+
+
+@dataclass
+class EngineReport:
+    result: object  # the reshaped DuckDB result (None when the query failed)
+    equal: bool
+    message: str
+    sql_seconds: float
+    pandas_seconds: float
+
+    @property
+    def speedup(self):
+        """pandas time / DuckDB time (> 1 means DuckDB was faster)."""
+        return self.pandas_seconds / self.sql_seconds if self.sql_seconds else None
+
+
+def connect(tables, threads=1, memory_limit=MEMORY_LIMIT):
+    """An in-memory DuckDB connection with ``tables`` (name -> Arrow table or DataFrame) registered."""
+    con = duckdb.connect(database=":memory:", config={"threads": threads, "memory_limit": memory_limit})
+    for name, table in tables.items():
+        con.register(name, table)
+    return con
+
+
+def _cast_like(actual, expected):
+    """Widens numeric dtypes (INTEGER -> int64, ...) where that is lossless, so only real differences remain."""
+    a, e = actual.dtype, expected.dtype
+    if isinstance(a, np.dtype) and isinstance(e, np.dtype) and a != e and np.can_cast(a, e, "safe"):
+        return actual.astype(e)
+    return actual
+
+
+def reshape(table, expected, index=None):
+    """
+    ``(actual, expected)`` ready for ``compare_frames``: the Arrow ``table``
+    with ``index`` columns as its index (a Series if ``expected`` is one),
+    and ``expected`` itself, without its row labels when ``index`` is None.
+    """
+    frame = table.to_pandas()
+    if index:
+        frame = frame.set_index(index)
+    else:
+        expected = expected.reset_index(drop=True)
+    if isinstance(expected, pd.Series):
+        if frame.shape[1] != 1:
+            return frame, expected  # compare_frames reports the type mismatch
+        return _cast_like(frame.iloc[:, 0], expected), expected
+    columns = {c: _cast_like(frame[c], expected[c]) if c in expected.columns else frame[c] for c in frame.columns}
+    return pd.DataFrame(columns, index=frame.index), expected
+
+
+def _best_of(fn, repeat):
+    best, value = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = fn()
+        best = min(best, time.perf_counter() - start)
+    return value, best
+
+
+def run_pandas(solution, data, repeat=1):
+    """``(result, seconds)`` of the pandas ``solution`` on copy-on-write views of ``data``."""
+    def run():
+        namespace = {"pd": pd, "np": np, **views(data)}
+        exec(compile(solution, "<solution>", "exec"), namespace)
+        return namespace.get("result")
+    return _best_of(run, repeat)
+
+
+def run_sql(con, sql, repeat=1):
+    """``(Arrow table, seconds)`` of ``sql``, fetched in full."""
+    return _best_of(lambda: con.execute(sql).to_arrow_table(), repeat)
+
+
+@register_job_kind("duckdb")
+def _run_duckdb(job):
+    paths = job["fixtures"]
+    data = {name: read_fixture(path) for name, path in paths.items()}
+    expected, pandas_seconds = run_pandas(job["solution"], data)
+    con = connect({name: read_table(path) for name, path in paths.items()})
+    try:
+        table, sql_seconds = run_sql(con, job["code"])
+    except duckdb.Error as e:
+        return Verdict("ok", detail=EngineReport(None, False, f"{type(e).__name__}: {e}", 0.0, pandas_seconds))
+    finally:
+        con.close()
+    actual, expected = reshape(table, expected, job.get("sql_index"))
+    diff = compare_frames(actual, expected)
+    report = EngineReport(actual, diff.equal, diff.message, sql_seconds, pandas_seconds)
+    return Verdict("ok", seconds=sql_seconds + pandas_seconds, detail=report)
+
+
+def compare_engines(problem, sizes=SIZES, repeat=3, threads=1):
+    """
+    Best-of-``repeat`` time of the pandas ``solution`` and of the ``sql``
+    answer (mapping + registration + query + Arrow fetch) on the problem's
+    scale-mode datasets at every size; returns dict rows.
+    """
+    from core.scale import SEED, build_datasets
+
+    rows = []
+    for n in sizes:
+        data = build_datasets(problem.extra["scale"], problem.extra["datasets"], n)
+        expected, pandas_seconds = run_pandas(problem.extra["solution"], data, repeat)
+        paths = materialize(problem.extra["scale"], problem.extra["datasets"], n, SEED)
+        start = time.perf_counter()
+        # Registering the Arrow files rather than the DataFrames: pandas' `str` columns would be converted on every scan
+        con = connect({name: read_table(path) for name, path in paths.items()}, threads)
+        register = time.perf_counter() - start
+        table, sql_seconds = run_sql(con, problem.extra["sql"], repeat)
+        con.close()
+        actual, expected = reshape(table, expected, problem.extra.get("sql_index"))
+        rows.append(dict(problem=problem.slot, n=n, pandas=pandas_seconds, duckdb=register + sql_seconds,
+                         equal=compare_frames(actual, expected).equal))
+    return rows
+
+
+def main(argv=None):
+    from core.catalog import load_catalog
+
+    parser = argparse.ArgumentParser(description="pandas vs DuckDB on the scale-mode datasets of every pandas problem with an `sql` answer.")
+    parser.add_argument("--sizes", default=",".join(str(n) for n in SIZES))
+    parser.add_argument("--threads", type=int, default=1, help="DuckDB threads")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    sizes = [int(n) for n in args.sizes.split(",")]
+
+    print(f"{'problem':<8} {'rows':>12} {'pandas s':>10} {'duckdb s':>10} {'winner':>8} {'equal':>6}")
+    for problem in load_catalog("pandas").problems:
+        if not problem.extra.get("sql") or not problem.extra.get("scale"):
+            continue
+        for row in compare_engines(problem, sizes, args.repeat, args.threads):
+            winner = "duckdb" if row["duckdb"] < row["pandas"] else "pandas"
+            print(f"{row['problem']:<8} {row['n']:12,} {row['pandas']:10.4f} {row['duckdb']:10.4f} "
+                  f"{winner:>8} {str(row['equal']):>6}")
+
+
+if __name__ == "__main__":
+    main()
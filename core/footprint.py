@@ -0,0 +1,191 @@
+"""
+Memory footprint of pandas frames and a dtype optimizer.
+
+``footprint(frame)`` reports ``memory_usage(deep=True)`` per column next to
+the dtypes ``optimize`` would pick:
+
+- integers are downcast to the smallest *signed* type that holds them
+  (unsigned types would make ``a - b`` wrap around), if it is smaller than
+  the current one: an existing ``uint8`` stays as it is;
+- floats become ``float32`` only when every value survives the round trip;
+- strings with few distinct values (``city``, ``Category``) become
+  ``category``; other strings, including ``object`` columns that only hold
+  strings, become Arrow-backed ``str``.
+
+It also times one groupby and one filter on the original and on the
+optimized frame, so the savings come with their effect on speed.
+``python -m core.footprint`` runs the report on the scale-mode datasets.
+"""
+import argparse
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+from pandas.api import types
+
+# A string column becomes ``category`` when it has at most this many distinct values per row.
+CATEGORY_RATIO = 0.5
+SPEED_REPEAT = 3
+
+
+@dataclass
+class ColumnChange:
+    column: str
+    before: str
+    after: str
+    bytes_before: int
+    bytes_after: int
+
+
+@dataclass
+class FootprintReport:
+    name: str
+    rows: int
+    columns: list = field(default_factory=list)  # ColumnChange, the index first
+    timings: dict = field(default_factory=dict)  # operation -> (seconds before, seconds after)
+
+    @property
+    def bytes_before(self):
+        return sum(c.bytes_before for c in self.columns)
+
+    @property
+    def bytes_after(self):
+        return sum(c.bytes_after for c in self.columns)
+
+    @property
+    def saving(self):
+        """Fraction of the original bytes the optimized dtypes save."""
+        return 1 - self.bytes_after / self.bytes_before if self.bytes_before else 0.0
+
+    def to_frame(self):
+        return pd.DataFrame({
+            "kolom": [c.column for c in self.columns],
+            "dtype": [c.before for c in self.columns],
+            "byte": [c.bytes_before for c in self.columns],
+            "dtype optimal": [c.after for c in self.columns],
+            "byte optimal": [c.bytes_after for c in self.columns],
+        })
+
+
+def _smallest_int(col):
+    if col.empty:
+        return col
+    low, high = col.min(), col.max()
+    # Only strictly smaller types: uint8 -> int16 would grow the column
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.bits >= 8 * col.dtype.itemsize:
+            break
+        if info.min <= low and high <= info.max:
+            return col.astype(dtype)
+    return col
+
+
+def _float32_if_lossless(col):
+    if col.dtype.itemsize <= 4:
+        return col  # already float32 or float16
+    narrow = col.astype(np.float32)
+    if np.array_equal(narrow.to_numpy(np.float64), col.to_numpy(np.float64), equal_nan=True):
+        return narrow
+    return col
+
+
+def optimize_column(col, category_ratio=CATEGORY_RATIO):
+    """The same values in a smaller dtype (or ``col`` itself when nothing fits better)."""
+    dtype = col.dtype
+    if isinstance(dtype, pd.CategoricalDtype) or types.is_bool_dtype(dtype):
+        return col
+    if types.is_integer_dtype(dtype) and isinstance(dtype, np.dtype):
+        return _smallest_int(col)
+    if types.is_float_dtype(dtype) and isinstance(dtype, np.dtype):
+        return _float32_if_lossless(col)
+    if types.is_string_dtype(dtype) and (dtype != object or types.infer_dtype(col, skipna=True) == "string"):
+        if col.nunique(dropna=False) <= category_ratio * len(col):
+            return col.astype("category")
+        return col if dtype == "str" else col.astype("str")
+    return col
+
+
+def optimize(frame, category_ratio=CATEGORY_RATIO):
+    """A copy of ``frame`` with every column in the dtype ``optimize_column`` picks."""
+    if not frame.shape[1]:
+        return frame.copy()
+    # By position: a {label: column} dict would merge duplicate column names
+    after = pd.concat([optimize_column(frame.iloc[:, i], category_ratio) for i in range(frame.shape[1])], axis=1)
+    after.columns = frame.columns
+    return after
+
+
+def _best_of(fn, repeat=SPEED_REPEAT):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _operations(before, after):
+    """A groupby mean and an equality filter on the lowest-cardinality key column, if any."""
+    # Only uniquely named columns: f[label] of a duplicated name is a frame, not a column
+    unique = [c for c in before.columns if (before.columns == c).sum() == 1]
+    keys = [c for c in unique if isinstance(after[c].dtype, pd.CategoricalDtype)]
+    numbers = [c for c in unique if types.is_numeric_dtype(before[c].dtype)
+               and not types.is_bool_dtype(before[c].dtype)]
+    ops = {}
+    if keys and numbers:
+        key, value = keys[0], numbers[0]
+        ops["groupby"] = lambda f: f.groupby(key, observed=True)[value].mean()
+    if keys and len(before):
+        key = keys[0]
+        first = before[key].iloc[0]
+        ops["filter"] = lambda f: f[f[key] == first]
+    elif numbers and len(before):
+        value = numbers[0]
+        threshold = before[value].median()
+        ops["filter"] = lambda f: f[f[value] > threshold]
+    return ops
+
+
+def footprint(frame, name="", category_ratio=CATEGORY_RATIO, timed=True):
+    """Per-column ``memory_usage(deep=True)`` of ``frame`` and of its optimized copy."""
+    if isinstance(frame, pd.Series):
+        frame = frame.to_frame()
+    after = optimize(frame, category_ratio)
+    used_before, used_after = frame.memory_usage(deep=True), after.memory_usage(deep=True)
+    report = FootprintReport(name, len(frame))
+    report.columns.append(ColumnChange("(index)", str(frame.index.dtype), str(after.index.dtype),
+                                       int(used_before["Index"]), int(used_after["Index"])))
+    for i, column in enumerate(frame.columns):
+        report.columns.append(ColumnChange(str(column), str(frame.dtypes.iloc[i]), str(after.dtypes.iloc[i]),
+                                           int(used_before.iloc[i + 1]), int(used_after.iloc[i + 1])))
+    if timed:
+        for op, fn in _operations(frame, after).items():
+            report.timings[op] = (_best_of(lambda: fn(frame)), _best_of(lambda: fn(after)))
+    return report
+
+
+def main(argv=None):
+    from core.catalog import load_catalog
+    from core.scale import build_datasets
+
+    parser = argparse.ArgumentParser(description="Memory footprint of the scale-mode datasets, before/after dtype optimization.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    for problem in load_catalog("pandas").problems:
+        data = build_datasets(problem.extra["scale"], problem.extra["datasets"], args.rows)
+        for name, frame in data.items():
+            report = footprint(frame, name)
+            speed = "  ".join(f"{op} {b * 1e3:.1f} -> {a * 1e3:.1f} ms" for op, (b, a) in report.timings.items())
+            print(f"{problem.slot}/{name}: {report.bytes_before / 1e6:,.1f} MB -> "
+                  f"{report.bytes_after / 1e6:,.1f} MB ({report.saving:.0%} saved)  {speed}")
+            for c in report.columns:
+                if c.before != c.after:
+                    print(f"    {c.column:<12} {c.before:>10} -> {c.after:<10} "
+                          f"{c.bytes_before / 1e6:9.1f} -> {c.bytes_after / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Out-of-core ``groupby(key)[value]`` aggregation over CSV and Parquet files.
+
+``df2.groupby('Category')['Sales'].mean()`` needs the whole frame in
+memory. ``chunked_groupby`` reads the file ``chunk_rows`` rows at a time
+(``pd.read_csv(chunksize=...)`` or ``ParquetFile.iter_batches``), reduces
+each chunk to mergeable partial aggregates per key:
+
+    count, sum, sum of squares, min, max
+
+and folds them into a running table with one more groupby. Memory is
+bounded by the chunk plus one row per distinct key, whatever the file
+size. ``finalize`` turns the partials into the aggregates pandas would
+return (``count``, ``sum``, ``mean``, ``var``, ``std``, ``min``, ``max``)
+with the same index, name and dtypes, so ``compare_frames`` can check
+them against the in-memory groupby.
+
+Integer sums stay ``int64`` and are exact, so ``mean`` is identical to
+pandas for integer columns. ``var``/``std`` come from the sum of squares,
+which loses precision when the mean is large relative to the spread;
+they agree with pandas to within ``compare_frames``' float tolerance on
+the challenge data.
+
+``python -m core.groupby`` writes a ``df2``-shaped file of any size block
+by block, aggregates it chunk by chunk and reports the peak RSS of both
+paths.
+"""
+import argparse
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from core.frames import compare_frames
+from core.scale import SEED, peak_mb, reset_peak
+
+AGGS = ("count", "sum", "mean", "var", "std", "min", "max")
+CHUNK_ROWS = 1_000_000
+PARTIALS = ("count", "sum", "sumsq", "min", "max")
+# How partial columns of two chunks combine.
+MERGE = {"count": "sum", "sum": "sum", "sumsq": "sum", "min": "min", "max": "max"}
+
+
+@dataclass
+class GroupbyReport:
+    result: object  # Series for one aggregate, DataFrame for several
+    rows: int
+    chunks: int
+    groups: int
+    seconds: float
+    peak_mb: float  # growth of the resident set while aggregating; None where /proc is missing
+
+
+def iter_chunks(path, columns, chunk_rows=CHUNK_ROWS):
+    """DataFrames of at most ``chunk_rows`` rows with ``columns``, read from a .csv or .parquet file."""
+    if path.endswith(".parquet"):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=list(columns)):
+            yield batch.to_pandas()
+    elif path.endswith(".csv"):
+        yield from pd.read_csv(path, usecols=list(columns), chunksize=chunk_rows)
+    else:
+        raise ValueError(f"Format tidak didukung: {path} (gunakan .csv atau .parquet)")
+
+
+def partial(chunk, by, value):
+    """Per-key count/sum/sumsq/min/max of ``chunk[value]`` (NaNs are skipped, as pandas does)."""
+    values = chunk[value]
+    if values.dtype.kind in "iub":
+        values = values.astype(np.int64)
+    grouped = pd.DataFrame({by: chunk[by], "v": values, "sq": values.astype(np.float64) ** 2}).groupby(
+        by, sort=False, observed=True, dropna=True)
+    parts = grouped["v"].agg(["count", "sum", "min", "max"])
+    parts["sumsq"] = grouped["sq"].sum()
+    return parts[list(PARTIALS)]
+
+
+def combine(left, right):
+    """Merges two partial tables; a key present in only one of them keeps its values."""
+    if left is None:
+        return right
+    return pd.concat([left, right]).groupby(level=0, sort=False).agg(MERGE)
+
+
+def finalize(parts, value, aggs=AGGS, ddof=1):
+    """Aggregates from merged partials, sorted by key like ``groupby().agg(aggs)``."""
+    parts = parts.sort_index()
+    count = parts["count"]
+    columns = {}
+    for agg in aggs:
+        if agg in ("count", "sum", "min", "max"):
+            columns[agg] = parts[agg]
+        elif agg == "mean":
+            columns[agg] = parts["sum"] / count
+        elif agg in ("var", "std"):
+            total = parts["sum"].astype(np.float64)
+            var = (parts["sumsq"] - total * total / count) / (count - ddof)
+            var = var.clip(lower=0).where(count > ddof)  # rounding can dip just below zero
+            columns[agg] = np.sqrt(var) if agg == "std" else var
+        else:
+            raise ValueError(f"Agregasi tidak didukung: {agg!r} (pilih dari {', '.join(AGGS)})")
+    if len(aggs) == 1:
+        return columns[aggs[0]].rename(value)
+    frame = pd.DataFrame(columns)
+    frame.columns.name = None
+    return frame
+
+
+def chunked_groupby(path, by, value, aggs=AGGS, chunk_rows=CHUNK_ROWS):
+    """``pd.read_*(path).groupby(by)[value].agg(aggs)`` without loading the whole file."""
+    if isinstance(aggs, str):
+        aggs = (aggs,)
+    base = reset_peak()
+    start = time.perf_counter()
+    parts, rows, chunks = None, 0, 0
+    for chunk in iter_chunks(path, (by, value), chunk_rows):
+        parts = combine(parts, partial(chunk, by, value))
+        rows += len(chunk)
+        chunks += 1
+    if parts is None:
+        parts = pd.DataFrame({p: [] for p in PARTIALS}, index=pd.Index([], name=by))
+    result = finalize(parts, value, tuple(aggs))
+    seconds = time.perf_counter() - start
+    peak = peak_mb(base)
+    return GroupbyReport(result, rows, chunks, len(parts), seconds, peak)
+
+
+def in_memory_groupby(path, by, value, aggs=AGGS):
+    """The reference: read everything, then ``groupby``; returns (result, seconds, peak MB)."""
+    if isinstance(aggs, str):
+        aggs = (aggs,)
+    base = reset_peak()
+    start = time.perf_counter()
+    if path.endswith(".parquet"):
+        frame = pd.read_parquet(path, columns=[by, value])
+    else:
+        frame = pd.read_csv(path, usecols=[by, value])
+    grouped = frame.groupby(by)[value]
+    result = getattr(grouped, aggs[0])() if len(aggs) == 1 else grouped.agg(list(aggs))
+    seconds = time.perf_counter() - start
+    peak = peak_mb(base)
+    return result, seconds, peak
+
+
+CATEGORIES = ("Elektronik", "Pakaian", "Makanan", "Olahraga", "Buku")
+
+
+def write_sales(path, n, block_rows=CHUNK_ROWS, seed=SEED):
+    """
+    Writes ``n`` rows shaped like ``df2`` (Date, Category, Sales, Profit) to a
+    .csv or .parquet file, ``block_rows`` at a time, so ``n`` can exceed RAM.
+    """
+    rng = np.random.default_rng(seed)
+    categories = np.array(CATEGORIES, dtype=object)
+    start_date = np.datetime64("2023-01-01T00:00")
+    writer = None
+    try:
+        for offset in range(0, n, block_rows):
+            size = min(block_rows, n - offset)
+            block = pd.DataFrame({
+                "Date": start_date + np.arange(offset, offset + size).astype("timedelta64[m]"),
+                "Category": categories[rng.integers(0, len(categories), size)],
+                "Sales": rng.integers(100, 2000, size),
+                "Profit": rng.integers(10, 400, size),
+            })
+            if path.endswith(".parquet"):
+                table = pa.Table.from_pandas(block, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+            else:
+                block.to_csv(path, mode="w" if offset == 0 else "a", header=offset == 0, index=False)
+    finally:
+        if writer is not None:
+            writer.close()
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Out-of-core groupby vs in-memory groupby on a df2-shaped file.")
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--chunk", type=int, default=CHUNK_ROWS, help="rows per chunk")
+    parser.add_argument("--format", choices=("csv", "parquet"), default="parquet")
+    parser.add_argument("--aggs", default=",".join(AGGS))
+    parser.add_argument("--skip-in-memory", action="store_true", help="for files larger than RAM")
+    parser.add_argument("--dir", help="where to write the file (default: system temp dir)")
+    args = parser.parse_args(argv)
+    aggs = tuple(args.aggs.split(","))
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        path = write_sales(os.path.join(tmp, f"sales.{args.format}"), args.rows)
+        print(f"{args.rows:,} rows, {os.path.getsize(path) / 1e6:,.1f} MB {args.format}, chunk={args.chunk:,}")
+        report = chunked_groupby(path, "Category", "Sales", aggs, args.chunk)
+        print(f"{'engine':<12} {'seconds':>9} {'peak RSS MB':>12}")
+        print(f"{'chunked':<12} {report.seconds:9.2f} {report.peak_mb or 0:12.1f}  ({report.chunks} chunks)")
+        if not args.skip_in_memory:
+            expected, seconds, peak = in_memory_groupby(path, "Category", "Sales", aggs)
+            print(f"{'in-memory':<12} {seconds:9.2f} {peak or 0:12.1f}")
+            diff = compare_frames(report.result, expected)
+            print("matches in-memory groupby:", diff.equal, "" if diff.equal else diff.message)
+        print(report.result)
+
+
+if __name__ == "__main__":
+    main()
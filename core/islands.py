@@ -0,0 +1,224 @@
+"""
+Island counting for large grids.
+
+The reference BFS in ``core.solutions.numIslands`` keeps a Python set of
+tuples, which stops being usable past a few million cells. The engines
+here work on a boolean NumPy bitmap instead:
+
+- ``count_islands_label``: one ``scipy.ndimage.label`` call over the whole
+  grid. Fastest, but needs the grid (and an int32 label array) in memory.
+- ``StreamingIslandCounter``: labels blocks of rows independently and
+  merges components across block boundaries with an array-backed
+  union-find. After each block the components still open on its last row
+  are relabelled 1..k, so memory stays bounded by the block size (plus one
+  row of labels), however tall the grid. This is the path
+  for 10⁸-cell grids and for grids read from disk (``count_islands_file``).
+
+Run ``python -m core.islands`` to benchmark both against the BFS.
+"""
+import argparse
+import time
+
+import numpy as np
+from scipy import ndimage
+
+# 4-connectivity: up, down, left, right (no diagonals), as in LeetCode #200.
+FOUR = ndimage.generate_binary_structure(2, 1)
+
+
+def to_bitmap(grid):
+    """Converts a list-of-lists of "1"/"0" (or any array-like) to a bool array."""
+    arr = np.asarray(grid)
+    if arr.dtype.kind in "US":
+        return arr == arr.dtype.type("1")
+    return arr.astype(bool, copy=False)
+
+
+def count_islands_label(grid):
+    if not len(grid):
+        return 0
+    _, count = ndimage.label(to_bitmap(grid), structure=FOUR)
+    return int(count)
+
+
+class StreamingIslandCounter:
+    """
+    Counts islands over a grid fed in blocks of rows, top to bottom.
+
+    Each block is labelled on its own; every label gets a global id. When a
+    block's first row touches land in the previous block's last row, the two
+    ids are unioned and the island count drops by one per successful union.
+    Only the last row of labels is kept between blocks, and the union-find
+    is reset to the components that row still touches (closed islands are
+    already counted), so ids never outgrow one row plus one block.
+    """
+
+    def __init__(self):
+        self.islands = 0
+        self.rows = 0
+        self._parent = np.zeros(1024, dtype=np.int64)
+        self._next_id = 1  # 0 means water
+        self._prev = None
+
+    def _find(self, x):
+        parent = self._parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # path halving
+            x = parent[x]
+        return x
+
+    def _reserve(self, count):
+        needed = self._next_id + count
+        if needed > len(self._parent):
+            grown = np.zeros(max(needed, 2 * len(self._parent)), dtype=np.int64)
+            grown[:self._next_id] = self._parent[:self._next_id]
+            self._parent = grown
+        self._parent[self._next_id:needed] = np.arange(self._next_id, needed)
+
+    def feed(self, block):
+        block = to_bitmap(block)
+        if block.ndim == 1:
+            block = block[np.newaxis, :]
+        if not block.size:
+            return self.islands
+        labels, count = ndimage.label(block, structure=FOUR)
+        offset = self._next_id - 1
+        self._reserve(count)
+        self._next_id += count
+        self.islands += count
+
+        first = labels[0]
+        if self._prev is not None and count:
+            touching = (first > 0) & (self._prev > 0)
+            if touching.any():
+                pairs = np.unique(np.stack([self._prev[touching], first[touching] + offset], axis=1), axis=0)
+                for a, b in pairs:
+                    ra, rb = self._find(a), self._find(b)
+                    if ra != rb:
+                        self._parent[max(ra, rb)] = min(ra, rb)
+                        self.islands -= 1
+
+        last = labels[-1].astype(np.int64)
+        self._compact(np.where(last > 0, last + offset, 0))
+        self.rows += block.shape[0]
+        return self.islands
+
+    def _compact(self, last):
+        """Keeps only the components open on ``last`` (the block's last row), relabelled 1..k."""
+        land = last > 0
+        open_ids = np.unique(last[land])
+        roots = np.fromiter((self._find(x) for x in open_ids), dtype=np.int64, count=len(open_ids))
+        _, relabelled = np.unique(roots, return_inverse=True)
+        self._prev = np.zeros_like(last)
+        self._prev[land] = relabelled[np.searchsorted(open_ids, last[land])] + 1
+        self._next_id = int(relabelled.max()) + 2 if len(relabelled) else 1
+        self._parent[:self._next_id] = np.arange(self._next_id)
+
+
+def count_islands_streaming(grid, block_rows=1024):
+    if not isinstance(grid, np.ndarray):
+        grid = to_bitmap(grid)
+    counter = StreamingIslandCounter()
+    for start in range(0, len(grid), block_rows):
+        counter.feed(grid[start:start + block_rows])
+    return counter.islands
+
+
+def iter_file_blocks(path, block_rows=1024, cols=None):
+    """
+    Yields blocks of rows from a grid stored on disk.
+
+    - ``.npy``: memory-mapped; bool/uint8 cells, or rows packed with
+      ``np.packbits(axis=1)`` when ``cols`` (the unpacked width) is given.
+    - anything else: text, one row per line of ``0``/``1`` characters
+      (separators such as spaces or commas are ignored).
+    """
+    if str(path).endswith(".npy"):
+        data = np.load(path, mmap_mode="r")
+        for start in range(0, len(data), block_rows):
+            block = np.asarray(data[start:start + block_rows])
+            if cols is not None:
+                block = np.unpackbits(block, axis=1, count=cols)
+            yield block.astype(bool, copy=False)
+        return
+
+    rows = []
+    with open(path, "rb") as f:
+        for line in f:
+            raw = np.frombuffer(line, dtype=np.uint8)
+            cells = raw[(raw == ord("0")) | (raw == ord("1"))]
+            if not cells.size:
+                continue
+            rows.append(cells == ord("1"))
+            if len(rows) == block_rows:
+                yield np.vstack(rows)
+                rows = []
+    if rows:
+        yield np.vstack(rows)
+
+
+def count_islands_file(path, block_rows=1024, cols=None):
+    counter = StreamingIslandCounter()
+    for block in iter_file_blocks(path, block_rows, cols):
+        counter.feed(block)
+    return counter.islands
+
+
+def random_grid(rows, cols, density=0.5, seed=0):
+    return np.random.default_rng(seed).random((rows, cols), dtype=np.float32) < density
+
+
+def benchmark(sides=(500, 1000, 2000, 4000), stream_side=10_000, block_rows=1024, bfs_limit=4000):
+    """Times BFS vs label vs streaming on random grids; returns a list of dict rows."""
+    from core.solutions import numIslands
+
+    rows = []
+    for side in sides:
+        bitmap = random_grid(side, side, seed=side)
+        timings = {}
+        t0 = time.perf_counter()
+        expected = count_islands_label(bitmap)
+        timings["label"] = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        streamed = count_islands_streaming(bitmap, block_rows)
+        timings["stream"] = time.perf_counter() - t0
+        if side <= bfs_limit:
+            grid = np.where(bitmap, "1", "0").tolist()
+            t0 = time.perf_counter()
+            bfs = numIslands(grid)
+            timings["bfs"] = time.perf_counter() - t0
+            del grid
+        else:
+            bfs = None
+        if streamed != expected or bfs not in (None, expected):
+            raise AssertionError(f"engines disagree at {side}x{side}: {bfs}, {expected}, {streamed}")
+        rows.append(dict(cells=side * side, islands=expected, **timings))
+
+    if stream_side:
+        # Generated block by block so the full 10⁸-cell grid never exists in memory.
+        counter = StreamingIslandCounter()
+        t0 = time.perf_counter()
+        for start in range(0, stream_side, block_rows):
+            height = min(block_rows, stream_side - start)
+            counter.feed(random_grid(height, stream_side, seed=start))
+        rows.append(dict(cells=stream_side * stream_side, islands=counter.islands,
+                         stream=time.perf_counter() - t0))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark island counting engines.")
+    parser.add_argument("--sides", default="500,1000,2000,4000", help="square grid sides to compare")
+    parser.add_argument("--stream-side", type=int, default=10_000, help="side of the streamed-only grid (0 to skip)")
+    parser.add_argument("--block-rows", type=int, default=1024)
+    args = parser.parse_args(argv)
+
+    sides = [int(s) for s in args.sides.split(",") if s]
+    print(f"{'cells':>12} {'islands':>10} {'bfs (s)':>10} {'label (s)':>10} {'stream (s)':>10}")
+    for row in benchmark(sides, args.stream_side, args.block_rows):
+        cols = [f"{row[k]:10.3f}" if k in row else f"{'-':>10}" for k in ("bfs", "label", "stream")]
+        print(f"{row['cells']:>12,} {row['islands']:>10,} " + " ".join(cols))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Asynchronous grading queue in front of a ``WorkerPool``.
+
+Pages used to block the Streamlit script on ``pool.run(...)`` until the
+verdict came back, so one slow submission froze the candidate's page and a
+burst of clicks piled up invisibly. ``GradingQueue`` accepts a submission,
+returns a job id immediately and grades it on an asyncio event loop running
+in a background thread; the page polls ``get(job_id)`` for progress and may
+``cancel`` it. ``stats()`` exposes queue depth and wait/run time percentiles.
+"""
+import asyncio
+import collections
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from core.sandbox import Verdict
+
+# queued -> running -> done, or cancelled at any point before done.
+QUEUED, RUNNING, DONE, CANCELLED = "queued", "running", "done", "cancelled"
+
+
+@dataclass
+class Job:
+    id: str
+    label: str
+    payload: dict
+    status: str = QUEUED
+    enqueued_at: float = field(default_factory=time.monotonic)
+    started_at: float = None
+    finished_at: float = None
+    verdict: Verdict = None
+
+    @property
+    def finished(self):
+        return self.status in (DONE, CANCELLED)
+
+    @property
+    def wait(self):
+        """Seconds spent in the queue (so far, if still queued)."""
+        return (self.started_at or self.finished_at or time.monotonic()) - self.enqueued_at
+
+    @property
+    def run(self):
+        """Seconds spent on a worker (so far, if still running)."""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class GradingQueue:
+    """
+    FIFO of grading jobs drained by ``concurrency`` consumers (default: one
+    per pool worker). ``submit`` takes the same keyword arguments as
+    ``WorkerPool.submit``. Finished jobs are kept for ``history`` entries so
+    late polls still find their verdict.
+    """
+
+    def __init__(self, pool, concurrency=None, history=500):
+        self.pool = pool
+        self.concurrency = concurrency or pool.size
+        self._jobs = collections.OrderedDict()
+        self._recent = collections.deque(maxlen=history)
+        self._history = history
+        self._lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, name="grading-queue", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        for _ in range(self.concurrency):
+            self._loop.create_task(self._consume())
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _consume(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                with self._lock:
+                    if job.status != QUEUED:
+                        continue
+                    job.status = RUNNING
+                    job.started_at = time.monotonic()
+                future = self.pool.submit(job_id=job.id, **job.payload)
+                try:
+                    verdict = await asyncio.wrap_future(future)
+                except Exception as e:
+                    verdict = Verdict("error", message=f"{type(e).__name__}: {e}")
+                self._finish(job, verdict)
+            finally:
+                self._queue.task_done()
+
+    def _finish(self, job, verdict):
+        with self._lock:
+            job.verdict = verdict
+            job.finished_at = time.monotonic()
+            job.status = CANCELLED if verdict.status == "cancelled" else DONE
+            self._recent.append(job)
+            while len(self._jobs) > self._history and next(iter(self._jobs.values())).finished:
+                self._jobs.popitem(last=False)
+
+    def submit(self, label="", **payload):
+        job = Job(id=uuid.uuid4().hex[:12], label=label, payload=payload)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, job)
+        return job.id
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """Cancels a queued or running job. Returns False if it already finished."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return False
+            if job.status == QUEUED:
+                job.status = CANCELLED
+                job.finished_at = time.monotonic()
+                job.verdict = Verdict("cancelled", message="Dibatalkan sebelum dijalankan.")
+                self._recent.append(job)
+                return True
+        self.pool.cancel(job_id)  # the consumer records the "cancelled" verdict
+        return True
+
+    def position(self, job_id):
+        """1-based place in line for a queued job, 0 once it is running or done."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                return 0
+            return 1 + sum(1 for j in self._jobs.values()
+                           if j.status == QUEUED and j.enqueued_at < job.enqueued_at)
+
+    def stats(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+            recent = list(self._recent)
+        waits = [j.wait for j in recent if j.started_at is not None]
+        runs = [j.run for j in recent if j.status == DONE]
+        return {
+            "queued": sum(j.status == QUEUED for j in jobs),
+            "running": sum(j.status == RUNNING for j in jobs),
+            "done": sum(j.status == DONE for j in recent),
+            "cancelled": sum(j.status == CANCELLED for j in recent),
+            "wait_p50": _percentile(waits, 0.5),
+            "wait_p95": _percentile(waits, 0.95),
+            "run_p50": _percentile(runs, 0.5),
+            "run_p95": _percentile(runs, 0.95),
+        }
+
+    def shutdown(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
@@ -0,0 +1,124 @@
+"""
+Streamlit glue for ``core.jobs``: submit a snippet to the shared grading
+queue, poll it while the page stays responsive, and render the result.
+
+Used by the Pandas and Machine Learning pages::
+
+    if st.button("Jalankan Kode"):
+        submit_script("pandas/beg_1", code, SUITE_VERSION, env={"df": df})
+    show_job("pandas/beg_1", render)  # render(value, first_time)
+
+``render`` runs on every rerun once the job is done, so the result stays on
+screen; ``first_time`` is True only on the rerun right after grading (for
+``st.balloons()``). Successful results go to ``VERDICTS`` as before.
+"""
+import streamlit as st
+
+from core.jobs import CANCELLED, QUEUED, GradingQueue
+from core.sandbox import Limits, WorkerPool
+from core.verdicts import VERDICTS, submission_key
+
+# Snippets build whole DataFrames or fit estimators, so they get more room
+# than the algorithm cases.
+SCRIPT_LIMITS = Limits(cpu_seconds=10, wall_seconds=20, memory_mb=1024)
+DEFAULT_MODULES = {"pd": "pandas", "np": "numpy"}
+_MISSING = object()
+
+
+@st.cache_resource
+def get_queue():
+    return GradingQueue(WorkerPool(size=4, limits=SCRIPT_LIMITS))
+
+
+def _state_key(problem_id):
+    return f"job::{problem_id}"
+
+
+def submit_script(problem_id, code, suite_version, env=None, modules=DEFAULT_MODULES,
+                  then=None, entry="result", kind="script", limits=None, **extra):
+    """
+    Queues ``code`` for grading (see the "script" job kind in ``core.sandbox``)
+    unless an identical submission is already in the verdict cache. Other job
+    kinds (e.g. "scale" from ``core.scale``) take their fields as ``extra``.
+    """
+    key = submission_key(code, problem_id, suite_version)
+    previous = st.session_state.get(_state_key(problem_id))
+    if previous and previous.get("job_id"):
+        get_queue().cancel(previous["job_id"])  # superseded by this submission
+
+    value = VERDICTS.get(key, _MISSING)
+    if value is not _MISSING:
+        st.session_state[_state_key(problem_id)] = {"key": key, "value": value, "cached": True, "first": True}
+        return
+    job_id = get_queue().submit(label=problem_id, kind=kind, code=code, entry=entry, limits=limits,
+                                env=env or {}, modules=modules, then=then, **extra)
+    st.session_state[_state_key(problem_id)] = {"key": key, "job_id": job_id, "cached": False, "first": True}
+
+
+@st.fragment(run_every=0.5)
+def _poll(problem_id, job_id):
+    queue = get_queue()
+    job = queue.get(job_id)
+    if job is None or job.finished:
+        st.rerun()
+    if job.status == QUEUED:
+        st.info(f"⏳ Menunggu di antrean penilaian (posisi {queue.position(job_id)})...")
+    else:
+        limit = (job.payload.get("limits") or SCRIPT_LIMITS).wall_seconds
+        st.progress(min(job.run / limit, 1.0),
+                    text=f"⚙️ Sedang dinilai... {job.run:.1f} / {limit:g} detik")
+    if st.button("⛔ Batalkan", key=f"cancel::{problem_id}"):
+        queue.cancel(job_id)
+
+
+def show_job(problem_id, render):
+    """Shows progress, the error, or ``render(value, first_time)`` for the latest submission."""
+    state = st.session_state.get(_state_key(problem_id))
+    if state is None:
+        return
+
+    if state.get("job_id"):
+        job = get_queue().get(state["job_id"])
+        if job is None:
+            del st.session_state[_state_key(problem_id)]
+            return
+        if not job.finished:
+            _poll(problem_id, job.id)
+            return
+        verdict = job.verdict
+        state["job_id"] = None
+        if verdict.status == "ok":
+            VERDICTS.put(state["key"], verdict.detail)
+            state["value"] = verdict.detail
+            state["seconds"] = job.run
+        else:
+            state["verdict"] = verdict
+
+    verdict = state.get("verdict")
+    if verdict is not None:
+        if verdict.status == CANCELLED:
+            st.warning(f"⛔ {verdict.message}")
+        elif verdict.status == "error":
+            st.error(f"⚠️ Error Eksekusi: {verdict.message}")
+        else:
+            st.error(f"⏱️ {verdict.message}")
+        return
+
+    if state["cached"]:
+        st.caption("⚡ Kode identik dengan submisi sebelumnya — hasil diambil dari cache.")
+    elif "seconds" in state:
+        st.caption(f"Dinilai di sandbox dalam {state['seconds']:.2f} detik.")
+    first, state["first"] = state["first"], False
+    try:
+        render(state["value"], first)
+    except Exception as e:
+        st.error(f"⚠️ Error: {e}")
+
+
+def show_queue_stats():
+    stats = get_queue().stats()
+    st.caption(
+        f"📥 Antrean penilaian: {stats['queued']} menunggu, {stats['running']} berjalan · "
+        f"tunggu p50 {stats['wait_p50']:.2f}s / p95 {stats['wait_p95']:.2f}s · "
+        f"eksekusi p50 {stats['run_p50']:.2f}s / p95 {stats['run_p95']:.2f}s"
+    )
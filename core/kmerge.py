@@ -0,0 +1,249 @@
+"""
+External k-way merge of sorted files.
+
+``core.solutions.mergeKLists`` pushes every ``ListNode`` through a heap,
+which is fine for the interview sizes but not for merging k sorted shard
+files that do not fit in memory. The engines here read binary runs of
+fixed-width integers (raw little-endian ``int64`` by default, as written by
+``ndarray.tofile``) through buffered readers and write the output in
+blocks:
+
+- ``merge_files``: block-wise merge. Every round takes, from each run's
+  current block, the prefix that is <= the smallest block tail among all
+  runs; those values can all be emitted now. The prefixes are merged with
+  one ``np.sort`` call, and the exhausted block is refilled. Python does
+  O(k) work per block instead of O(log k) per element.
+- ``merge_files_heapq``: the same buffered I/O feeding ``heapq.merge``,
+  i.e. the reference algorithm on disk, as a baseline.
+
+Both return a ``MergeStats`` with the throughput in MB/s. Run
+``python -m core.kmerge`` to benchmark them against the linked-list heap
+and ``heapq.merge`` on in-memory lists.
+"""
+import argparse
+import heapq
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+DTYPE = np.dtype("<i8")
+BLOCK_ITEMS = 1 << 16  # per-run read block: 512 KiB of int64
+OUT_ITEMS = 1 << 20  # output is flushed in 8 MiB blocks
+
+
+@dataclass
+class MergeStats:
+    runs: int
+    items: int
+    bytes_read: int
+    seconds: float
+
+    @property
+    def mb_per_s(self):
+        return self.bytes_read / 1e6 / self.seconds if self.seconds else float("inf")
+
+
+class _Run:
+    """One sorted input file, read a block at a time into a reused buffer."""
+
+    def __init__(self, path, dtype, block_items):
+        self.file = open(path, "rb", buffering=0)
+        self.buffer = np.empty(block_items, dtype=dtype)
+        self.block = self.buffer[:0]
+        self.bytes_read = 0
+
+    def refill(self):
+        """Loads the next block; returns False at end of file."""
+        view = memoryview(self.buffer).cast("B")
+        filled = 0
+        while filled < len(view):
+            n = self.file.readinto(view[filled:])
+            if not n:
+                break
+            filled += n
+        if filled % self.buffer.itemsize:
+            raise ValueError(f"{self.file.name}: size is not a multiple of {self.buffer.itemsize} bytes")
+        self.bytes_read += filled
+        self.block = self.buffer[:filled // self.buffer.itemsize]
+        return len(self.block) > 0
+
+    def close(self):
+        self.file.close()
+
+
+class _BlockWriter:
+    """Collects merged chunks and writes them out ``out_items`` values at a time."""
+
+    def __init__(self, path, dtype, out_items):
+        self.file = open(path, "wb") if path is not None else None
+        self.buffer = np.empty(out_items, dtype=dtype)
+        self.used = 0
+        self.items = 0
+
+    def write(self, values):
+        self.items += len(values)
+        while len(values):
+            take = min(len(values), len(self.buffer) - self.used)
+            self.buffer[self.used:self.used + take] = values[:take]
+            self.used += take
+            values = values[take:]
+            if self.used == len(self.buffer):
+                self.flush()
+
+    def flush(self):
+        if self.file is not None and self.used:
+            self.file.write(memoryview(self.buffer[:self.used]).cast("B"))
+        self.used = 0
+
+    def close(self):
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+
+
+def merge_files(paths, out_path, dtype=DTYPE, block_items=BLOCK_ITEMS, out_items=OUT_ITEMS):
+    """Merges sorted binary runs into ``out_path`` (None: merge and discard)."""
+    dtype = np.dtype(dtype)
+    runs = [_Run(p, dtype, block_items) for p in paths]
+    out = _BlockWriter(out_path, dtype, out_items)
+    start = time.perf_counter()
+    try:
+        active = [r for r in runs if r.refill()]
+        while active:
+            if len(active) == 1:
+                run = active[0]
+                out.write(run.block)
+                while run.refill():
+                    out.write(run.block)
+                break
+            # Everything <= the smallest block tail is final: no later block can undercut it.
+            cutoff = min(r.block[-1] for r in active)
+            parts = []
+            for r in active:
+                cut = int(np.searchsorted(r.block, cutoff, side="right"))
+                if cut:
+                    parts.append(r.block[:cut])
+                    r.block = r.block[cut:]
+            # Concatenated sorted runs: the stable sort (timsort/radix) merges them cheaply.
+            out.write(np.sort(np.concatenate(parts), kind="stable"))
+            active = [r for r in active if len(r.block) or r.refill()]
+    finally:
+        out.close()
+        for r in runs:
+            r.close()
+    return MergeStats(len(runs), out.items, sum(r.bytes_read for r in runs), time.perf_counter() - start)
+
+
+def _iter_run(run):
+    while run.refill():
+        yield from run.block.tolist()
+
+
+def merge_files_heapq(paths, out_path, dtype=DTYPE, block_items=BLOCK_ITEMS, out_items=OUT_ITEMS):
+    """Baseline: per-element ``heapq.merge`` over the same buffered readers."""
+    dtype = np.dtype(dtype)
+    runs = [_Run(p, dtype, block_items) for p in paths]
+    out = _BlockWriter(out_path, dtype, out_items)
+    start = time.perf_counter()
+    try:
+        chunk = []
+        for value in heapq.merge(*(_iter_run(r) for r in runs)):
+            chunk.append(value)
+            if len(chunk) == out_items:
+                out.write(np.array(chunk, dtype=dtype))
+                chunk = []
+        out.write(np.array(chunk, dtype=dtype))
+    finally:
+        out.close()
+        for r in runs:
+            r.close()
+    return MergeStats(len(runs), out.items, sum(r.bytes_read for r in runs), time.perf_counter() - start)
+
+
+def write_sorted_runs(directory, k, n, seed=0, dtype=DTYPE, block_items=1 << 20):
+    """
+    Writes ``k`` files of ``n`` sorted random values each; returns their paths.
+    Values are generated as cumulative sums block by block, so a run never
+    has to exist in memory as a whole.
+    """
+    rng = np.random.default_rng(seed)
+    paths = []
+    for i in range(k):
+        path = os.path.join(directory, f"run_{i:05d}.bin")
+        last = int(rng.integers(0, 1000))
+        with open(path, "wb") as f:
+            for start in range(0, n, block_items):
+                steps = rng.integers(0, 1000, size=min(block_items, n - start), dtype=dtype)
+                block = np.cumsum(steps, dtype=dtype) + last
+                last = int(block[-1])
+                block.tofile(f)
+        paths.append(path)
+    return paths
+
+
+def is_sorted_file(path, dtype=DTYPE, block_items=OUT_ITEMS):
+    data = np.memmap(path, dtype=dtype, mode="r")
+    for start in range(0, len(data), block_items):
+        block = data[max(0, start - 1):start + block_items]
+        if np.any(block[1:] < block[:-1]):
+            return False
+    return True
+
+
+def benchmark(k=64, n=25_000, memory_limit=2_000_000, directory=None):
+    """
+    Times the in-memory references (linked-list heap, ``heapq.merge``) and
+    the two file engines on the same data; returns a list of dict rows.
+    The in-memory ones are skipped above ``memory_limit`` total items.
+    """
+    from core.solutions import build_linked, mergeKLists
+
+    rows = []
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        paths = write_sorted_runs(tmp, k, n)
+        nbytes = k * n * DTYPE.itemsize
+
+        if k * n <= memory_limit:
+            lists = [np.fromfile(p, dtype=DTYPE).tolist() for p in paths]
+            heads = [build_linked(values) for values in lists]
+            t0 = time.perf_counter()
+            mergeKLists(heads)
+            rows.append(dict(engine="mergeKLists (ListNode heap)", seconds=time.perf_counter() - t0))
+            del heads
+            t0 = time.perf_counter()
+            merged = list(heapq.merge(*lists))
+            rows.append(dict(engine="heapq.merge (lists)", seconds=time.perf_counter() - t0))
+            del lists, merged
+
+        out_path = os.path.join(tmp, "merged.bin")
+        for name, engine in (("merge_files_heapq", merge_files_heapq), ("merge_files", merge_files)):
+            stats = engine(paths, out_path)
+            if stats.items != k * n or not is_sorted_file(out_path):
+                raise AssertionError(f"{name} produced a wrong merge")
+            rows.append(dict(engine=name, seconds=stats.seconds))
+
+    for row in rows:
+        row["mb_per_s"] = nbytes / 1e6 / row["seconds"]
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark external k-way merge engines.")
+    parser.add_argument("--k", type=int, default=64, help="number of sorted runs")
+    parser.add_argument("--n", type=int, default=25_000, help="int64 values per run")
+    parser.add_argument("--memory-limit", type=int, default=2_000_000,
+                        help="skip the in-memory engines above this many total values")
+    parser.add_argument("--dir", help="where to write the runs (default: system temp dir)")
+    args = parser.parse_args(argv)
+
+    print(f"k={args.k} runs x n={args.n:,} values ({args.k * args.n * DTYPE.itemsize / 1e6:,.1f} MB)")
+    print(f"{'engine':<30} {'seconds':>10} {'MB/s':>10}")
+    for row in benchmark(args.k, args.n, args.memory_limit, args.dir):
+        print(f"{row['engine']:<30} {row['seconds']:10.3f} {row['mb_per_s']:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
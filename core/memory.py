@@ -0,0 +1,96 @@
+"""
+Peak-memory measurement for algorithm submissions.
+
+Uses ``tracemalloc`` to record the peak allocation of a single call at a
+few input sizes. Inputs are generated before tracing starts, so only what
+the solution itself allocates is counted; that makes bytes per input
+element directly comparable with the reference solution.
+"""
+import copy
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+
+from core import solutions
+from core.complexity import PROBLEMS, fit_complexity
+from core.sandbox import Verdict, load_submission, register_job_kind
+from core.solutions import ADAPTERS
+
+DEFAULT_SIZES = (1_000, 4_000, 16_000, 64_000)
+# Headroom over the reference before a submission is flagged; copying the
+# input or building throwaway lists on an O(1)-space problem goes far past it.
+FLAG_RATIO = 1.25
+
+
+@dataclass
+class MemoryPoint:
+    n: int
+    peak_bytes: int
+    blocks: int  # traced blocks still alive when the call returns (incl. the result)
+    seconds: float
+
+    @property
+    def bytes_per_element(self):
+        return self.peak_bytes / self.n
+
+
+@dataclass
+class MemoryProfile:
+    problem: str
+    points: list = field(default_factory=list)
+    label: str = ""
+
+
+def measure(fn, problem, sizes=DEFAULT_SIZES, call_budget=1.0, seed=0):
+    """
+    Records peak traced memory of ``fn`` for every size. Stops early once a
+    call takes longer than ``call_budget`` seconds, since tracing slows
+    quadratic solutions down even further.
+    """
+    spec = PROBLEMS[problem]
+    adapt_in, _ = ADAPTERS.get(spec.adapter, (list, None))
+    result = MemoryProfile(problem)
+    for n in sizes:
+        args = adapt_in(copy.deepcopy(spec.generator(n, random.Random(seed + n))))
+        tracemalloc.start()
+        try:
+            t0 = time.perf_counter()
+            out = fn(*args)
+            seconds = time.perf_counter() - t0
+            _, peak = tracemalloc.get_traced_memory()
+            blocks = len(tracemalloc.take_snapshot().traces)
+        finally:
+            tracemalloc.stop()
+        del out
+        result.points.append(MemoryPoint(n, peak, blocks, seconds))
+        if seconds > call_budget:
+            break
+
+    if len(result.points) >= 3:
+        result.label, _ = fit_complexity([p.n for p in result.points],
+                                         [max(p.peak_bytes, 1) for p in result.points])
+    return result
+
+
+def excess_ratio(candidate, reference):
+    """Candidate / reference bytes per element at the largest size both reached."""
+    common = min(len(candidate.points), len(reference.points))
+    if not common:
+        return None
+    ours = candidate.points[common - 1].peak_bytes
+    ref = reference.points[common - 1].peak_bytes
+    # Allow a small fixed overhead so O(1) solutions are not flagged over a few frames.
+    return (ours + 1024) / (ref + 1024)
+
+
+@register_job_kind("memory")
+def _run_memory(job):
+    if job["code"] is None:
+        fn = getattr(solutions, job["entry"])
+    else:
+        fn = load_submission(job["code"], job["entry"])
+        if fn is None:
+            return Verdict("error", message=f"Fungsi `{job['entry']}` tidak ditemukan.")
+    result = measure(fn, job["entry"], **job.get("options", {}))
+    return Verdict("ok", seconds=sum(p.seconds for p in result.points), detail=result)
@@ -0,0 +1,230 @@
+"""
+Multi-core ``apply`` and ``groupby().apply`` over a process pool.
+
+A Python-level ``apply`` holds the GIL, so it runs on one core no matter
+how big the machine is. The executors here split the frame into
+partitions, run the same pandas call on each partition in a worker
+process and concatenate the partial results in partition order:
+
+- ``parallel_apply(frame, func)``: ``frame.apply(func, axis=1)`` on
+  contiguous row ranges;
+- ``parallel_groupby_apply(frame, by, func)``: the frame is stably sorted
+  by ``by`` and cut only at key boundaries, so every group lives in exactly
+  one partition and keeps its row order; the concatenation comes out in key
+  order, like ``frame.groupby(by).apply(func)``.
+
+The data never goes through pickle. The parent writes the frame once as an
+Arrow IPC file to ``/dev/shm`` (shared memory; the temp dir elsewhere) and
+every worker maps it with ``core.fixtures.read_fixture``, so a worker only
+pays for the pages of its own partition. Tasks are just ``(start, stop)``
+row offsets; only the (usually much smaller) partial results are pickled
+back. The pool uses the ``fork`` start method, so ``func`` may be a lambda
+or a function defined in a candidate's submission: it is inherited, not
+pickled.
+
+Arrow does not round-trip every frame: it refuses duplicate column names,
+complex or sparse columns and ``object`` columns mixing types, and it reads
+``object`` strings back as ``str`` and lists as NumPy arrays. A frame with
+an ``object`` column or index, one Arrow cannot write, or one whose dtypes
+change on the way back is instead inherited by the forked workers as-is
+(copy-on-write pages, still no pickle).
+
+Candidates get both executors as ``parallel_apply`` and
+``parallel_groupby_apply`` (``HELPERS``) in the pandas grading and
+scale-mode jobs. There the pool is forked by the sandboxed child, a
+single-threaded process, and its workers are killed with it when it is
+killed at its deadline. Called from a process running other Python threads
+(such as the Streamlit server), ``run_partitions`` runs serially instead:
+a forked copy of a multithreaded process can deadlock on a lock another
+thread held.
+
+``python -m core.parallel`` reports the scaling from 1 to N workers on the
+scale-mode ``df2`` dataset.
+"""
+import argparse
+import ctypes
+import multiprocessing as mp
+import os
+import shutil
+import signal
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from core.fixtures import read_fixture, read_table, write_fixture
+
+SHM_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+# Partitions per worker: a few small ones balance uneven groups better than one big one each.
+PARTITIONS_PER_WORKER = 4
+PR_SET_PDEATHSIG = 1  # linux/prctl.h
+
+_TASK = None  # set in each worker by _init: (Arrow file path or the frame itself, call)
+
+
+def default_workers():
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+
+def row_ranges(n, partitions):
+    """``partitions`` contiguous (start, stop) ranges covering ``range(n)`` (empty ones dropped)."""
+    bounds = np.linspace(0, n, partitions + 1).round().astype(int)
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def key_ranges(keys, partitions):
+    """Like ``row_ranges`` for a sorted key column, but never splitting a run of equal keys."""
+    n = len(keys)
+    if n == 0:
+        return []
+    codes = pd.factorize(keys, use_na_sentinel=False)[0]
+    starts = np.flatnonzero(np.diff(codes)) + 1  # first row of every key after the first
+    targets = np.linspace(0, n, partitions + 1)[1:-1]
+    cuts = np.unique(starts[np.minimum(np.searchsorted(starts, targets), len(starts) - 1)]) if len(starts) else []
+    bounds = [0, *map(int, cuts), n]
+    return [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def _die_with_parent(parent):
+    """Linux: SIGKILL this worker when ``parent`` dies, so a killed candidate leaves no workers behind."""
+    try:
+        ctypes.CDLL(None, use_errno=True).prctl(PR_SET_PDEATHSIG, signal.SIGKILL)
+    except (OSError, AttributeError):
+        return
+    if os.getppid() != parent:  # it died before prctl took effect
+        os._exit(1)
+
+
+def _init(source, call, parent):
+    global _TASK
+    _die_with_parent(parent)
+    _TASK = (source, call)
+
+
+def _run_partition(bounds):
+    source, call = _TASK
+    frame = read_fixture(source) if isinstance(source, str) else source
+    start, stop = bounds
+    return call(frame.iloc[start:stop])
+
+
+def _arrow_copy(frame, path):
+    """Writes ``frame`` to ``path``; False if Arrow cannot hold it with the same columns and dtypes."""
+    if any(dtype == object for dtype in (*frame.dtypes, frame.index.dtype)):
+        return False  # element types may change (strings, lists) even when the dtype does not
+    try:
+        write_fixture(frame, path)
+    except (pa.ArrowException, ValueError, TypeError):
+        return False
+    copy = read_table(path).schema.empty_table().to_pandas()  # not read_fixture: its cache would keep the file mapped
+    return (copy.columns.equals(frame.columns) and copy.dtypes.equals(frame.dtypes)
+            and copy.index.dtype == frame.index.dtype)
+
+
+def run_partitions(frame, call, ranges, workers=None):
+    """
+    ``[call(frame.iloc[a:b]) for a, b in ranges]``, computed by ``workers``
+    processes that map ``frame`` from shared memory (or inherit it when
+    Arrow would change it). One worker (or one range) runs in-process, and
+    so does everything in a process with other Python threads.
+    """
+    workers = workers or default_workers()
+    if workers == 1 or len(ranges) <= 1 or threading.active_count() > 1:
+        return [call(frame.iloc[a:b]) for a, b in ranges]
+    directory = tempfile.mkdtemp(prefix="parallel-", dir=SHM_DIR)
+    try:
+        path = os.path.join(directory, "frame.arrow")
+        source = path if _arrow_copy(frame, path) else frame
+        with mp.get_context("fork").Pool(min(workers, len(ranges)), _init, (source, call, os.getpid())) as pool:
+            return pool.map(_run_partition, ranges, chunksize=1)  # results come back in task order
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _concat(parts, like):
+    parts = [p for p in parts if len(p)] or parts[:1]
+    return pd.concat(parts) if parts else like
+
+
+def parallel_apply(frame, func, workers=None, partitions=None, **kwargs):
+    """``frame.apply(func, axis=1, **kwargs)`` on ``workers`` processes."""
+    workers = workers or default_workers()
+    ranges = row_ranges(len(frame), partitions or workers * PARTITIONS_PER_WORKER)
+    parts = run_partitions(frame, lambda part: part.apply(func, axis=1, **kwargs), ranges, workers)
+    return _concat(parts, frame.iloc[:0].apply(func, axis=1, **kwargs))
+
+
+def parallel_groupby_apply(frame, by, func, workers=None, partitions=None, **kwargs):
+    """``frame.groupby(by).apply(func, **kwargs)`` on ``workers`` processes (``by``: one column)."""
+    workers = workers or default_workers()
+    ordered = frame.sort_values(by, kind="stable", na_position="last")
+    ranges = key_ranges(ordered[by], partitions or workers * PARTITIONS_PER_WORKER)
+    parts = run_partitions(ordered, lambda part: part.groupby(by).apply(func, **kwargs), ranges, workers)
+    return _concat(parts, frame.iloc[:0].groupby(by).apply(func, **kwargs))
+
+
+# What the sandboxed pandas jobs put in a candidate's namespace
+HELPERS = {"parallel_apply": parallel_apply, "parallel_groupby_apply": parallel_groupby_apply}
+
+
+def _adjusted_sales(row):
+    return row["Sales"] * 1.1 if row["Category"] == "Elektronik" else row["Sales"] - row["Profit"]
+
+
+def _top3_sales(group):
+    return group["Sales"].nlargest(3).sum()
+
+
+def scaling(rows=1_000_000, workers=None):
+    """
+    Times a row-wise ``apply`` and a ``groupby().apply`` on the scale-mode
+    ``df2`` for every worker count in ``workers`` (default: 1, 2, 4, ... up
+    to the available cores); returns dict rows with speedup vs 1 worker.
+    """
+    from core.catalog import load_catalog
+    from core.frames import compare_frames
+    from core.scale import build_datasets
+
+    problem = next(p for p in load_catalog("pandas").problems if "df2" in p.extra.get("datasets", []))
+    df2 = build_datasets(problem.extra["scale"], ["df2"], rows)["df2"]
+    cores = default_workers()
+    workers = workers or sorted({1, cores, *(2 ** i for i in range(1, cores.bit_length()) if 2 ** i < cores)})
+    tasks = {
+        "apply(axis=1)": (lambda: df2.apply(_adjusted_sales, axis=1),
+                          lambda w: parallel_apply(df2, _adjusted_sales, workers=w)),
+        "groupby.apply": (lambda: df2.groupby("Category").apply(_top3_sales),
+                          lambda w: parallel_groupby_apply(df2, "Category", _top3_sales, workers=w)),
+    }
+    report = []
+    for task, (serial, parallel) in tasks.items():
+        expected = serial()
+        base = None
+        for w in workers:
+            start = time.perf_counter()
+            result = parallel(w)
+            seconds = time.perf_counter() - start
+            base = base or seconds
+            report.append(dict(task=task, workers=w, seconds=seconds, speedup=base / seconds,
+                               efficiency=base / seconds / w, equal=compare_frames(result, expected).equal))
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scaling of the parallel apply/groupby executors from 1 to N cores.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", help="comma-separated worker counts (default: 1, 2, 4, ... cores)")
+    args = parser.parse_args(argv)
+    workers = [int(w) for w in args.workers.split(",")] if args.workers else None
+
+    print(f"df2 with {args.rows:,} rows, {default_workers()} cores available")
+    print(f"{'task':<16} {'workers':>7} {'seconds':>9} {'speedup':>8} {'efficiency':>10} {'equal':>6}")
+    for row in scaling(args.rows, workers):
+        print(f"{row['task']:<16} {row['workers']:7d} {row['seconds']:9.2f} {row['speedup']:7.2f}x "
+              f"{row['efficiency']:10.0%} {str(row['equal']):>6}")
+
+
+if __name__ == "__main__":
+    main()
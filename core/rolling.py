@@ -0,0 +1,292 @@
+"""
+Streaming rolling-window statistics that reproduce pandas' ``rolling``.
+
+``df3['Price'].rolling(window=3).mean()`` needs the whole column in memory.
+``RollingStats`` consumes the prices chunk by chunk (or from an unbounded
+iterator via ``stream``) and keeps its state across chunk boundaries:
+
+- a ring buffer of the last ``window`` values, to know which one leaves;
+- a Kahan-compensated running sum for ``sum`` and ``mean``;
+- Welford's running mean / sum of squared deviations for ``var`` and ``std``;
+- monotonic deques of (position, value) for ``min`` and ``max``.
+
+Every row costs O(1) amortized. The sum/mean/min/max update rules follow
+pandas' own window kernels step by step (separate compensation terms for
+adding and removing, the "all values identical" and sign corrections), so
+those outputs have the same bits as ``Series.rolling(window, min_periods)``
+on the concatenated data. ``var``/``std`` agree with pandas to within
+``VAR_RTOL`` rather than bit for bit: pandas 3 no longer uses the textbook
+Welford update, and a run of identical values gives exactly 0 here where
+pandas can leave a tiny positive residue.
+
+``python -m core.rolling`` validates the engine against pandas and compares
+its throughput with re-running ``rolling`` on the concatenated history
+after every chunk.
+"""
+import argparse
+import math
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+STATS = ("sum", "mean", "var", "std", "min", "max")
+EXACT = ("sum", "mean", "min", "max")
+# var/std are compared with this relative tolerance (scaled by the data's magnitude squared).
+VAR_RTOL = 1e-9
+
+
+class RollingStats:
+    """Fixed-size rolling window over a float64 stream; ``update(chunk)`` returns one row per value."""
+
+    def __init__(self, window, min_periods=None, ddof=1, stats=STATS):
+        if window < 1:
+            raise ValueError("window harus >= 1")
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.ddof = ddof
+        self.stats = tuple(stats)
+        self.position = 0  # values seen so far
+        self._ring = [math.nan] * window
+        self._min, self._max = deque(), deque()  # (position, value), values monotonic
+        self._reset()
+
+    def _reset(self):
+        # running sum (sum/mean): observations, Kahan sum, negatives, identical-run length, last value
+        self._nobs = self._neg = self._same = 0
+        self._sum = self._sum_add = self._sum_remove = 0.0
+        self._prev = None
+        # Welford (var/std)
+        self._mean = self._ssqdm = self._var_add = self._var_remove = 0.0
+
+    def update(self, chunk):
+        """Feeds the next values; returns ``{stat: float64 array}`` aligned with ``chunk``."""
+        values = np.asarray(chunk, dtype=np.float64)
+        values = np.where(np.isinf(values), np.nan, values).tolist()  # as pandas does before rolling
+        out = {stat: [] for stat in self.stats}
+        window, minp, ddof, ring = self.window, self.min_periods, self.ddof, self._ring
+        want_sum, want_mean = "sum" in out, "mean" in out
+        want_var, want_std = "var" in out, "std" in out
+        want_min, want_max = "min" in out, "max" in out
+        nobs, neg, same, prev = self._nobs, self._neg, self._same, self._prev
+        sum_x, comp_add, comp_remove = self._sum, self._sum_add, self._sum_remove
+        mean_x, ssqdm, var_add, var_remove = self._mean, self._ssqdm, self._var_add, self._var_remove
+        lows, highs = self._min, self._max
+        i = self.position
+
+        for val in values:
+            slot = i % window
+            if window == 1 or i == 0:
+                # pandas restarts the accumulators whenever a window shares nothing with the previous one
+                nobs = neg = same = 0
+                sum_x = comp_add = comp_remove = 0.0
+                mean_x = ssqdm = var_add = var_remove = 0.0
+                prev = val
+            elif i >= window:
+                old = ring[slot]
+                if old == old:  # not NaN: take it out of the running sums
+                    nobs -= 1
+                    y = -old - comp_remove
+                    t = sum_x + y
+                    comp_remove = t - sum_x - y
+                    sum_x = t
+                    if math.copysign(1.0, old) < 0:
+                        neg -= 1
+                    if nobs:
+                        prev_mean = mean_x - var_remove
+                        y = old - var_remove
+                        t = y - mean_x
+                        var_remove = t + mean_x - y
+                        mean_x = mean_x - t / nobs
+                        ssqdm = ssqdm - (old - prev_mean) * (old - mean_x)
+                    else:
+                        mean_x = ssqdm = 0.0
+            ring[slot] = val
+
+            if val == val:
+                nobs += 1
+                y = val - comp_add
+                t = sum_x + y
+                comp_add = t - sum_x - y
+                sum_x = t
+                if math.copysign(1.0, val) < 0:
+                    neg += 1
+                same = same + 1 if val == prev else 1
+                prev = val
+                prev_mean = mean_x - var_add
+                y = val - var_add
+                t = y - mean_x
+                var_add = t + mean_x - y
+                mean_x = mean_x + t / nobs
+                ssqdm = ssqdm + (val - prev_mean) * (val - mean_x)
+                if want_min:
+                    while lows and lows[-1][1] >= val:
+                        lows.pop()
+                    lows.append((i, val))
+                if want_max:
+                    while highs and highs[-1][1] <= val:
+                        highs.pop()
+                    highs.append((i, val))
+            if want_min:
+                while lows and lows[0][0] <= i - window:
+                    lows.popleft()
+            if want_max:
+                while highs and highs[0][0] <= i - window:
+                    highs.popleft()
+
+            enough = nobs >= minp
+            if want_sum:
+                if nobs == 0 == minp:
+                    out["sum"].append(0.0)
+                elif enough:
+                    out["sum"].append(prev * nobs if same >= nobs else sum_x)
+                else:
+                    out["sum"].append(math.nan)
+            if want_mean:
+                if enough and nobs > 0:
+                    result = sum_x / nobs
+                    if same >= nobs:
+                        result = prev
+                    elif (neg == 0 and result < 0) or (neg == nobs and result > 0):
+                        result = 0.0
+                    out["mean"].append(result)
+                else:
+                    out["mean"].append(math.nan)
+            if want_var or want_std:
+                if enough and nobs > ddof:
+                    var = 0.0 if nobs == 1 or same >= nobs else ssqdm / (nobs - ddof)
+                else:
+                    var = math.nan
+                if want_var:
+                    out["var"].append(var)
+                if want_std:
+                    out["std"].append(math.sqrt(var) if var >= 0 else (0.0 if var == var else math.nan))
+            if want_min:
+                out["min"].append(lows[0][1] if enough and lows else math.nan)
+            if want_max:
+                out["max"].append(highs[0][1] if enough and highs else math.nan)
+            i += 1
+
+        self._nobs, self._neg, self._same, self._prev = nobs, neg, same, prev
+        self._sum, self._sum_add, self._sum_remove = sum_x, comp_add, comp_remove
+        self._mean, self._ssqdm, self._var_add, self._var_remove = mean_x, ssqdm, var_add, var_remove
+        self.position = i
+        return {stat: np.array(column, dtype=np.float64) for stat, column in out.items()}
+
+
+def stream(chunks, window, min_periods=None, stats=STATS):
+    """Yields ``{stat: array}`` per chunk of an (unbounded) iterable of value chunks."""
+    engine = RollingStats(window, min_periods, stats=stats)
+    for chunk in chunks:
+        yield engine.update(chunk)
+
+
+def pandas_rolling(values, window, min_periods=None, stats=STATS):
+    rolling = pd.Series(values, dtype=np.float64).rolling(window, min_periods=min_periods)
+    return {stat: getattr(rolling, stat)().to_numpy() for stat in stats}
+
+
+def same_bits(a, b):
+    """True when both arrays are identical bit for bit (any NaN equals any NaN)."""
+    a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    both_nan = np.isnan(a) & np.isnan(b)
+    return a.shape == b.shape and bool(np.all(both_nan | (a.view(np.int64) == b.view(np.int64))))
+
+
+def matches(stat, actual, expected, values):
+    """``same_bits`` for the EXACT stats; ``VAR_RTOL`` for var/std."""
+    if stat in EXACT:
+        return same_bits(actual, expected)
+    actual, expected = np.asarray(actual, dtype=np.float64), np.asarray(expected, dtype=np.float64)
+    finite = np.asarray(values, dtype=np.float64)
+    finite = finite[np.isfinite(finite)]
+    scale = float(np.max(np.abs(finite))) if finite.size else 1.0
+    if stat == "std":  # sqrt blows pandas' ~1e-14 residues up to ~1e-7: compare the squares
+        actual, expected = actual * actual, expected * expected
+    atol = VAR_RTOL * scale * scale
+    return actual.shape == expected.shape and bool(np.all(
+        np.isclose(actual, expected, rtol=VAR_RTOL, atol=atol, equal_nan=True)))
+
+
+def validate(values, window, chunk_size, min_periods=None, stats=STATS):
+    """Streams ``values`` in chunks; returns ``{stat: matches pandas?}`` (see ``matches``)."""
+    values = np.asarray(values, dtype=np.float64)
+    chunks = (values[i:i + chunk_size] for i in range(0, len(values), chunk_size))
+    parts = list(stream(chunks, window, min_periods, stats))
+    expected = pandas_rolling(values, window, min_periods, stats)
+    return {stat: matches(stat, np.concatenate([p[stat] for p in parts]) if parts else [],
+                          expected[stat], values)
+            for stat in stats}
+
+
+def prices(n, seed=0):
+    """A random-walk price series with runs of repeated values, like tick data."""
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0, 1, n) * (rng.random(n) < 0.7)  # ~30% of ticks repeat the last price
+    return np.round(100 + np.cumsum(steps), 2)
+
+
+def benchmark(n=1_000_000, chunk_size=10_000, window=3, stats=STATS):
+    """
+    Rows/s of the streaming engine vs two pandas baselines: re-running
+    ``rolling`` on the whole concatenated history after every chunk, and on
+    the last ``window - 1`` rows plus the chunk (fast, but it restarts the
+    compensated sums, so its bits drift from the one-shot result).
+    ``exact`` is ``matches`` against one-shot pandas for every stat.
+    """
+    values = prices(n)
+    chunks = [values[i:i + chunk_size] for i in range(0, n, chunk_size)]
+    expected = pandas_rolling(values, window, stats=stats)
+    rows = []
+
+    start = time.perf_counter()
+    engine = RollingStats(window, stats=stats)
+    parts = [engine.update(c) for c in chunks]
+    rows.append(("RollingStats (streaming)", time.perf_counter() - start,
+                 {s: np.concatenate([p[s] for p in parts]) for s in stats}))
+
+    start = time.perf_counter()
+    history, parts = np.empty(0), []
+    for c in chunks:
+        history = np.concatenate([history, c])
+        full = pandas_rolling(history, window, stats=stats)
+        parts.append({s: full[s][-len(c):] for s in stats})
+    rows.append(("pandas rolling (history)", time.perf_counter() - start,
+                 {s: np.concatenate([p[s] for p in parts]) for s in stats}))
+
+    start = time.perf_counter()
+    tail, parts = np.empty(0), []
+    for c in chunks:
+        joined = np.concatenate([tail, c])
+        part = pandas_rolling(joined, window, stats=stats)
+        if len(tail) < window - 1:
+            parts.append({s: part[s][len(tail):] for s in stats})
+        else:
+            parts.append({s: part[s][window - 1:] for s in stats})
+        tail = joined[-(window - 1):] if window > 1 else np.empty(0)
+    rows.append(("pandas rolling (tail + chunk)", time.perf_counter() - start,
+                 {s: np.concatenate([p[s] for p in parts]) for s in stats}))
+
+    return [dict(engine=name, seconds=seconds, rows_per_s=n / seconds,
+                 exact=all(matches(s, out[s], expected[s], values) for s in stats))
+            for name, seconds, out in rows]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate and benchmark the streaming rolling engine.")
+    parser.add_argument("--n", type=int, default=1_000_000)
+    parser.add_argument("--chunk", type=int, default=10_000)
+    parser.add_argument("--window", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    checks = validate(prices(200_000, seed=1), args.window, 997)
+    print("vs pandas (var/std within VAR_RTOL):", ", ".join(f"{s}={'ok' if ok else 'BEDA'}" for s, ok in checks.items()))
+    print(f"n={args.n:,} chunk={args.chunk:,} window={args.window}")
+    print(f"{'engine':<32} {'seconds':>9} {'rows/s':>12} {'matches':>10}")
+    for row in benchmark(args.n, args.chunk, args.window):
+        print(f"{row['engine']:<32} {row['seconds']:9.2f} {row['rows_per_s']:12,.0f} {str(row['exact']):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+"""
+Sandboxed execution backend for candidate submissions.
+
+A ``WorkerPool`` keeps a few long-lived worker processes around. Workers are
+started from a forkserver that has already imported the scientific stack, so
+spinning one up costs a ``fork()`` instead of a fresh interpreter. For every
+submission the worker forks once more: the short-lived child applies the
+CPU-time and memory limits, runs the code against its test cases and sends
+the verdict back over a pipe. A runaway submission only ever kills that
+child, never the worker or the Streamlit server.
+"""
+import concurrent.futures
+import copy
+import multiprocessing as mp
+import os
+import pickle
+import queue
+import select
+import signal
+import sys
+import threading
+import time
+import importlib
+import traceback
+import types
+import uuid
+from dataclasses import dataclass, field
+
+from core.fixtures import read_fixture
+from core.solutions import ADAPTERS, ListNode
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, wall-clock limit still applies
+    resource = None
+
+# Imported once in the forkserver so every worker starts warm.
+PRELOAD = ["numpy", "pandas", "collections", "heapq", "core.sandbox", "core.complexity", "core.memory",
+           "core.scale", "core.antipatterns", "core.engines"]
+
+REPR_LIMIT = 300
+
+
+@dataclass
+class Limits:
+    cpu_seconds: float = 2.0
+    wall_seconds: float = 5.0
+    memory_mb: int = 256
+
+
+@dataclass
+class CaseResult:
+    args: str
+    expected: str
+    actual: str
+    passed: bool
+    seconds: float
+    error: str = ""
+
+
+@dataclass
+class Verdict:
+    status: str  # ok | wrong | error | timeout | cpu | memory | cancelled
+    cases: list = field(default_factory=list)
+    seconds: float = 0.0
+    message: str = ""
+    detail: object = None  # extra payload from non-"function" job kinds
+
+    @property
+    def passed(self):
+        return self.status == "ok"
+
+
+def _short(value):
+    text = repr(value)
+    return text if len(text) <= REPR_LIMIT else text[:REPR_LIMIT] + "..."
+
+
+def _matches(actual, expected, compare):
+    if compare == "sorted":
+        try:
+            return sorted(actual) == sorted(expected)
+        except TypeError:
+            return False
+    if compare == "close":
+        return abs(actual - expected) <= 1e-9 * max(1.0, abs(expected))
+    return actual == expected
+
+
+def load_submission(code, entry):
+    """Executes submitted source and returns its ``entry`` function (or None)."""
+    namespace = {"__name__": "__submission__", "ListNode": ListNode}
+    exec(compile(code, "<submission>", "exec"), namespace)
+    fn = namespace.get(entry)
+    return fn if callable(fn) else None
+
+
+def _run_function(job):
+    """Executes ``job['code']`` and calls ``job['entry']`` for every test case."""
+    fn = load_submission(job["code"], job["entry"])
+    if fn is None:
+        return Verdict("error", message=f"Fungsi `{job['entry']}` tidak ditemukan.")
+    adapt_in, adapt_out = ADAPTERS.get(job.get("adapter"), (list, None))
+
+    results = []
+    for case in job["cases"]:
+        args = adapt_in(copy.deepcopy(case["args"]))
+        start = time.perf_counter()
+        try:
+            actual = fn(*args)
+            if adapt_out:
+                actual = adapt_out(actual)
+            error = ""
+        except MemoryError:
+            raise
+        except Exception as e:
+            actual, error = None, f"{type(e).__name__}: {e}"
+        seconds = time.perf_counter() - start
+        passed = not error and _matches(actual, case["expected"], job.get("compare", "exact"))
+        results.append(CaseResult(_short(case["args"]), _short(case["expected"]),
+                                  _short(actual), passed, seconds, error))
+
+    status = "ok" if all(r.passed for r in results) else "wrong"
+    if any(r.error for r in results):
+        status = "error"
+    return Verdict(status, results, sum(r.seconds for r in results))
+
+
+def _run_script(job):
+    """
+    Executes ``job['code']`` with ``job['env']`` (plus modules imported under
+    ``job['modules']`` aliases, and copy-on-write views of the Arrow files in
+    ``job['fixtures']``) as globals, then returns the value of ``job['then']``
+    if given, otherwise the variable named ``job['entry']``.
+    """
+    namespace = {"__name__": "__submission__"}
+    for alias, module in (job.get("modules") or {}).items():
+        namespace[alias] = importlib.import_module(module)
+    namespace.update(job.get("env") or {})
+    for name, path in (job.get("fixtures") or {}).items():
+        namespace[name] = read_fixture(path).copy(deep=False)
+    start = time.perf_counter()
+    exec(compile(job["code"], "<submission>", "exec"), namespace)
+    value = eval(job["then"], namespace) if job.get("then") else namespace.get(job["entry"])
+    return Verdict("ok", seconds=time.perf_counter() - start, detail=value)
+
+
+JOB_KINDS = {"function": _run_function, "script": _run_script}
+
+
+def register_job_kind(name):
+    """Registers a handler for ``job['kind'] == name``; it runs inside the sandbox."""
+    def decorator(fn):
+        JOB_KINDS[name] = fn
+        return fn
+    return decorator
+
+
+def _apply_limits(limits):
+    if resource is None:
+        return
+    cpu = max(1, int(limits.cpu_seconds + 0.999))
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+    # RLIMIT_AS counts the already-mapped interpreter too, so budget on top of it.
+    with open("/proc/self/statm") as f:
+        mapped = int(f.read().split()[0]) * resource.getpagesize()
+    budget = mapped + limits.memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (budget, budget))
+
+
+def _execute(job):
+    try:
+        return JOB_KINDS[job["kind"]](job)
+    except MemoryError:
+        return Verdict("memory", message=f"Melebihi batas memori {job['limits'].memory_mb} MB.")
+    except SyntaxError as e:
+        return Verdict("error", message=f"SyntaxError baris {e.lineno}: {e.msg}")
+    except Exception as e:
+        tb = traceback.format_exc(limit=-1)
+        return Verdict("error", message=f"{type(e).__name__}: {e}\n{tb}")
+
+
+_CANCELLED = object()
+
+
+def _read_all(fd, deadline, control=None, job_id=None):
+    """
+    Reads the child's payload until EOF. Returns None on timeout, or
+    ``_CANCELLED`` when the pool sends ``("cancel", job_id)`` meanwhile.
+    """
+    chunks = []
+    watched = [fd] if control is None else [fd, control]
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        ready, _, _ = select.select(watched, [], [], remaining)
+        if not ready:
+            return None
+        if control is not None and control in ready:
+            if control.recv() == ("cancel", job_id):
+                return _CANCELLED
+            continue
+        chunk = os.read(fd, 1 << 16)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+def _run_forked(job, control=None):
+    """Runs a job in a throwaway child of the worker and enforces all limits."""
+    limits = job["limits"]
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        # A bare fork of a daemonic worker: without this, multiprocessing refuses to
+        # start the pools of core.parallel (they are killed with this child anyway)
+        mp.current_process().daemon = False
+        try:
+            signal.signal(signal.SIGXCPU, signal.SIG_DFL)
+            _apply_limits(limits)
+            payload = pickle.dumps(_execute(job))
+        except BaseException as e:
+            payload = pickle.dumps(Verdict("error", message=f"{type(e).__name__}: {e}"))
+        with os.fdopen(write_fd, "wb") as out:
+            out.write(payload)
+        os._exit(0)
+
+    os.close(write_fd)
+    start = time.monotonic()
+    try:
+        data = _read_all(read_fd, start + limits.wall_seconds, control, job.get("id"))
+    finally:
+        os.close(read_fd)
+    if data is None or data is _CANCELLED:
+        os.kill(pid, signal.SIGKILL)
+    _, status, usage = os.wait4(pid, 0)
+    elapsed = time.monotonic() - start
+
+    if data is _CANCELLED:
+        return Verdict("cancelled", seconds=elapsed, message="Dibatalkan oleh pengguna.")
+    if data is None:
+        return Verdict("timeout", seconds=elapsed,
+                       message=f"Melebihi batas waktu {limits.wall_seconds:g} detik.")
+    if os.WIFSIGNALED(status):
+        return _killed(os.WTERMSIG(status), usage.ru_utime + usage.ru_stime, limits, elapsed)
+    if not data:
+        code = os.WEXITSTATUS(status)
+        return Verdict("error", seconds=elapsed, message=f"Proses berhenti tanpa hasil (kode keluar {code}).")
+    return pickle.loads(data)
+
+
+def _killed(signum, cpu_seconds, limits, elapsed):
+    """
+    Verdict for a child killed by ``signum``. SIGXCPU (soft limit) and
+    SIGKILL (hard limit, one second later) both come from RLIMIT_CPU, but
+    the OOM killer also sends SIGKILL: the child's CPU time tells them apart.
+    """
+    if signum == signal.SIGXCPU or (signum == signal.SIGKILL and cpu_seconds >= limits.cpu_seconds):
+        return Verdict("cpu", seconds=elapsed, message=f"Melebihi batas CPU {limits.cpu_seconds:g} detik.")
+    if signum == signal.SIGKILL:
+        return Verdict("memory", seconds=elapsed,
+                       message="Proses dihentikan sistem (kemungkinan kehabisan memori).")
+    return Verdict("error", seconds=elapsed, message=f"Proses berhenti karena sinyal {signal.Signals(signum).name}.")
+
+
+def _worker_main(conn, preload):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # No-op under forkserver; under spawn this is where the imports happen.
+    for name in preload:
+        importlib.import_module(name)
+    if "pyarrow" in sys.modules:
+        # Arrow reserves ~1 GiB of address space for its allocator on first use.
+        # Doing it here means forked children inherit the reservation, and
+        # RLIMIT_AS (budgeted on top of the mapped size) does not trip on it.
+        sys.modules["pyarrow"].array(["warm-up"])
+    forked = hasattr(os, "fork")
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        if isinstance(job, tuple):
+            continue  # late cancel for a job that already finished
+        conn.send(_run_forked(job, conn) if forked else _execute(job))
+
+
+class _Worker:
+    def __init__(self, ctx, preload):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, preload), daemon=True)
+        # Streamlit runs each page as ``__main__``; multiprocessing would re-execute
+        # that script in every new worker, so hide it while starting the process.
+        main = sys.modules.get("__main__")
+        sys.modules["__main__"] = types.ModuleType("__main__")
+        try:
+            self.process.start()
+        finally:
+            sys.modules["__main__"] = main
+        child_conn.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join(1)
+        self.conn.close()
+
+
+class WorkerPool:
+    """
+    Fixed-size pool of warm worker processes.
+
+    ``submit`` returns a ``concurrent.futures.Future`` so callers can wait
+    without holding the GIL; ``run`` is the blocking shortcut.
+    """
+
+    def __init__(self, size=4, limits=None, preload=PRELOAD):
+        if "forkserver" in mp.get_all_start_methods():
+            self._ctx = mp.get_context("forkserver")
+            self._ctx.set_forkserver_preload(preload)
+        else:
+            self._ctx = mp.get_context("spawn")
+        self.size = size
+        self.preload = list(preload)
+        self.limits = limits or Limits()
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._running = {}  # job id -> worker
+        self._cancelled = set()  # ids cancelled before a worker picked them up
+        self._closed = False
+        for _ in range(size):
+            self._idle.put(_Worker(self._ctx, self.preload))
+        self._dispatch = concurrent.futures.ThreadPoolExecutor(size, thread_name_prefix="sandbox")
+
+    def submit(self, code, entry, cases=(), compare="exact", limits=None, kind="function",
+               job_id=None, **extra):
+        if self._closed:
+            raise RuntimeError("WorkerPool sudah ditutup.")
+        job = dict(extra, kind=kind, code=code, entry=entry, cases=cases, compare=compare,
+                   limits=limits or self.limits, id=job_id or uuid.uuid4().hex)
+        return self._dispatch.submit(self._dispatch_job, job)
+
+    def run(self, *args, **kwargs):
+        return self.submit(*args, **kwargs).result()
+
+    def cancel(self, job_id):
+        """Stops a queued or running job; its future resolves to a "cancelled" verdict."""
+        with self._lock:
+            worker = self._running.get(job_id)
+            if worker is None:
+                self._cancelled.add(job_id)
+                return
+            try:
+                worker.conn.send(("cancel", job_id))
+            except OSError:
+                pass
+
+    def _dispatch_job(self, job):
+        worker = self._idle.get()
+        try:
+            with self._lock:
+                if job["id"] in self._cancelled:
+                    self._cancelled.discard(job["id"])
+                    return Verdict("cancelled", message="Dibatalkan sebelum dijalankan.")
+                worker.conn.send(job)
+                self._running[job["id"]] = worker
+            # The worker enforces the wall-clock limit itself; this is the safety net.
+            if worker.conn.poll(job["limits"].wall_seconds + 5):
+                return worker.conn.recv()
+            raise TimeoutError
+        except (TimeoutError, EOFError, OSError):
+            worker.kill()
+            worker = _Worker(self._ctx, self.preload)
+            return Verdict("timeout", message="Worker tidak merespons dan telah diganti.")
+        finally:
+            with self._lock:
+                self._running.pop(job["id"], None)
+            self._idle.put(worker)
+
+    def shutdown(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._dispatch.shutdown(wait=True)
+        while not self._idle.empty():
+            worker = self._idle.get_nowait()
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+            worker.process.join(1)
+            if worker.process.is_alive():
+                worker.kill()
+
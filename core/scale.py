@@ -0,0 +1,178 @@
+"""
+Scale mode for the pandas challenges.
+
+The catalog datasets have five or six rows, so a row-wise ``apply`` passes
+just as well as a vectorized answer. A problem's ``scale`` code (see
+``catalog/pandas.toml``) rebuilds the same datasets with ``n`` rows from a
+seeded ``rng``; the "scale" job kind then, inside the sandbox:
+
+1. builds the datasets, or maps them from the ``core.fixtures`` cache;
+2. runs the reference ``solution`` and records its time and peak memory;
+3. forks the candidate into its own process with a deadline of
+   ``max(BUDGET_RATIO * reference, BUDGET_FLOOR)`` seconds, records the
+   same numbers there and checks ``result`` with ``compare_frames``. The
+   candidate may use the multi-core ``parallel_apply`` and
+   ``parallel_groupby_apply`` from ``core.parallel``.
+
+Peak memory is the growth of the process's resident set (``VmHWM`` after
+resetting it through ``/proc/self/clear_refs``), so NumPy and Arrow buffers
+count as well as Python objects. Each side gets copy-on-write views of
+the datasets, so writing to them never touches the other side's data.
+"""
+import os
+import pickle
+import select
+import signal
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from core.fixtures import load_fixtures, views
+from core.frames import compare_frames
+from core.parallel import HELPERS
+from core.sandbox import Limits, Verdict, register_job_kind
+
+SIZES = (1_000_000, 10_000_000, 100_000_000)
+SEED = 2024
+# The candidate may be this many times slower than the reference...
+BUDGET_RATIO = 5.0
+# ...but always gets at least this many seconds, so fast references are not too strict.
+BUDGET_FLOOR = 1.0
+
+
+def limits_for(n):
+    """Sandbox limits for a scale job with ``n`` rows (the candidate's deadline is separate)."""
+    wall = 60 + n / 1_000_000 * 6
+    return Limits(cpu_seconds=wall, wall_seconds=wall, memory_mb=1024 + n * 160 // 1_000_000)
+
+
+@dataclass
+class RunStats:
+    seconds: float
+    peak_mb: float  # growth of the resident set while running; None where /proc is missing
+
+
+@dataclass
+class ScaleReport:
+    n: int
+    budget: float
+    reference: RunStats
+    candidate: RunStats = None  # None when the candidate ran out of budget or failed
+    equal: bool = False
+    message: str = ""
+
+    @property
+    def ratio(self):
+        """Candidate time / reference time (> 1 means slower than the reference)."""
+        if self.candidate is None or not self.reference.seconds:
+            return None
+        return self.candidate.seconds / self.reference.seconds
+
+    @property
+    def passed(self):
+        return self.equal and self.candidate is not None and self.candidate.seconds <= self.budget
+
+
+def build_datasets(scale_code, names, n, seed=SEED):
+    """
+    The named datasets of a problem's ``scale`` code with ``n`` rows, from the
+    fixture cache. They are read into memory rather than mapped: page faults
+    on a mapped file would show up in the peak RSS of whoever touches it first.
+    """
+    return load_fixtures(scale_code, names, n, seed, mapped=False)
+
+
+def _status_kb(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+
+def reset_peak():
+    """Resets VmHWM to the current RSS; returns the RSS in KiB (None without /proc)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return _status_kb("VmRSS")
+    except OSError:
+        return None
+
+
+def peak_mb(base):
+    """Peak RSS growth in MB since ``base = reset_peak()`` (None when ``base`` is)."""
+    return (_status_kb("VmHWM") - base) / 1024 if base is not None else None
+
+
+def _timed(code, data, env=None):
+    """Runs ``code`` on copy-on-write views of ``data`` (plus ``env``); returns (``result``, RunStats)."""
+    namespace = {"__name__": "__submission__", "pd": pd, "np": np, **(env or {})}
+    namespace.update(views(data))
+    base = reset_peak()
+    start = time.perf_counter()
+    exec(compile(code, "<submission>", "exec"), namespace)
+    seconds = time.perf_counter() - start
+    peak = peak_mb(base)
+    return namespace.get("result"), RunStats(seconds, peak)
+
+
+def _run_candidate(code, data, expected, budget):
+    """Times the candidate in a forked child, killed after ``budget`` seconds."""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            result, stats = _timed(code, data, HELPERS)
+            if result is None:
+                outcome = (stats, False, "Variabel `result` tidak ditemukan.")
+            else:
+                diff = compare_frames(result, expected)
+                outcome = (stats, diff.equal, diff.message)
+        except MemoryError:
+            outcome = (None, False, "Kehabisan memori.")
+        except BaseException as e:
+            outcome = (None, False, f"{type(e).__name__}: {e}")
+        with os.fdopen(write_fd, "wb") as out:
+            out.write(pickle.dumps(outcome))
+        os._exit(0)
+
+    os.close(write_fd)
+    deadline = time.monotonic() + budget + 5  # the comparison runs after the timed part
+    chunks = []
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([read_fd], [], [], remaining)[0]:
+                os.kill(pid, signal.SIGKILL)
+                chunks = None
+                break
+            chunk = os.read(read_fd, 1 << 16)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+    if chunks is None:
+        return None, False, f"Melebihi anggaran waktu {budget:.1f} detik."
+    if not chunks:
+        return None, False, "Proses berhenti tanpa hasil (kemungkinan kehabisan memori)."
+    return pickle.loads(b"".join(chunks))
+
+
+@register_job_kind("scale")
+def _run_scale(job):
+    n = job["n"]
+    data = build_datasets(job["scale"], job["datasets"], n, job.get("seed", SEED))
+    expected, reference = _timed(job["solution"], data)
+    budget = max(job.get("budget_ratio", BUDGET_RATIO) * reference.seconds, BUDGET_FLOOR)
+    candidate, equal, message = _run_candidate(job["code"], data, expected, budget)
+    if candidate is not None and candidate.seconds > budget:
+        message = f"Melebihi anggaran waktu {budget:.1f} detik."
+    report = ScaleReport(n, budget, reference, candidate, equal, message)
+    return Verdict("ok", seconds=reference.seconds + (candidate.seconds if candidate else budget),
+                   detail=report)
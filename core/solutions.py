@@ -0,0 +1,209 @@
+"""
+Reference solutions for the Python Algorithms page.
+
+These are the same answers shown in the "Lihat Penjelasan & Jawaban"
+expanders, kept here so they can be imported, profiled and timed.
+"""
+import collections
+import heapq
+import inspect
+
+
+class ListNode:
+    def __init__(self, val=0, next=None):
+        self.val = val
+        self.next = next
+
+
+def build_linked(values):
+    dummy = ListNode(0)
+    curr = dummy
+    for v in values:
+        curr.next = ListNode(v)
+        curr = curr.next
+    return dummy.next
+
+
+def linked_to_list(node):
+    out = []
+    while node:
+        out.append(node.val)
+        node = node.next
+    return out
+
+
+# Converts plain test-case data to the shapes a problem expects and back.
+ADAPTERS = {
+    "linked_lists": (
+        lambda args: [[build_linked(values) for values in args[0]]],
+        linked_to_list,
+    ),
+}
+
+
+def twoSum(nums, target):
+    prevMap = {}  # val : index
+
+    for i, n in enumerate(nums):
+        diff = target - n
+        if diff in prevMap:
+            return [prevMap[diff], i]
+        prevMap[n] = i
+    return []
+
+
+def isAnagram(s, t):
+    if len(s) != len(t):
+        return False
+
+    countS, countT = {}, {}
+
+    for i in range(len(s)):
+        countS[s[i]] = countS.get(s[i], 0) + 1
+        countT[t[i]] = countT.get(t[i], 0) + 1
+
+    return countS == countT
+
+
+def containsDuplicate(nums):
+    hashset = set()
+    for n in nums:
+        if n in hashset:
+            return True
+        hashset.add(n)
+    return False
+
+
+def isValid(s):
+    stack = []
+    map = {")": "(", "]": "[", "}": "{"}
+
+    for c in s:
+        if c in map:
+            if stack and stack[-1] == map[c]:
+                stack.pop()
+            else:
+                return False
+        else:
+            stack.append(c)
+    return True if not stack else False
+
+
+def maxArea(height):
+    l, r = 0, len(height) - 1
+    res = 0
+
+    while l < r:
+        area = (r - l) * min(height[l], height[r])
+        res = max(res, area)
+
+        if height[l] < height[r]:
+            l += 1
+        else:
+            r -= 1
+
+    return res
+
+
+def lengthOfLongestSubstring(s):
+    charSet = set()
+    l = 0
+    res = 0
+
+    for r in range(len(s)):
+        while s[r] in charSet:
+            charSet.remove(s[l])
+            l += 1
+        charSet.add(s[r])
+        res = max(res, r - l + 1)
+    return res
+
+
+def numIslands(grid):
+    if not grid: return 0
+
+    rows, cols = len(grid), len(grid[0])
+    visit = set()
+    islands = 0
+
+    def bfs(r, c):
+        q = collections.deque()
+        visit.add((r, c))
+        q.append((r, c))
+
+        while q:
+            row, col = q.popleft()
+            directions = [[1, 0], [-1, 0], [0, 1], [0, -1]]
+
+            for dr, dc in directions:
+                r_new, c_new = row + dr, col + dc
+                if (r_new in range(rows) and
+                    c_new in range(cols) and
+                    grid[r_new][c_new] == "1" and
+                    (r_new, c_new) not in visit):
+                    q.append((r_new, c_new))
+                    visit.add((r_new, c_new))
+
+    for r in range(rows):
+        for c in range(cols):
+            if grid[r][c] == "1" and (r, c) not in visit:
+                bfs(r, c)
+                islands += 1
+    return islands
+
+
+def climbStairs(n):
+    one, two = 1, 1
+    for i in range(n - 1):
+        temp = one
+        one = one + two
+        two = temp
+    return one
+
+
+def mergeKLists(lists):
+    minHeap = []
+
+    # Add first node of each list to heap
+    for i, l in enumerate(lists):
+        if l:
+            minHeap.append((l.val, i, l))
+    heapq.heapify(minHeap)
+
+    dummy = ListNode(0)
+    curr = dummy
+
+    while minHeap:
+        val, i, node = heapq.heappop(minHeap)
+        curr.next = node
+        curr = node
+
+        if node.next:
+            heapq.heappush(minHeap, (node.next.val, i, node.next))
+
+    return dummy.next
+
+
+# Module-level imports a solution needs, shown above it on the page.
+_SOURCE_HEADERS = {
+    "numIslands": "import collections\n\n",
+    "mergeKLists": (
+        "# Definition for singly-linked list.\n"
+        "# class ListNode:\n"
+        "#     def __init__(self, val=0, next=None):\n"
+        "#         self.val = val\n"
+        "#         self.next = next\n\n"
+        "import heapq\n\n"
+    ),
+}
+
+REFERENCES = {
+    name: globals()[name]
+    for name in ["twoSum", "isAnagram", "containsDuplicate", "isValid", "maxArea",
+                 "lengthOfLongestSubstring", "numIslands", "climbStairs", "mergeKLists"]
+}
+
+
+def reference_source(name):
+    """Source of a reference solution, as displayed in the answer expander."""
+    return _SOURCE_HEADERS.get(name, "") + inspect.getsource(REFERENCES[name])
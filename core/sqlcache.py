@@ -0,0 +1,194 @@
+"""
+Result cache for the SQL page, shared by every session.
+
+Candidates and reviewers rerun the same queries over and over; at scale
+factor 100 each rerun can cost seconds. ``ResultCache.run(con, query,
+dataset)`` answers a repeated ``SELECT`` from memory instead:
+
+- the key is the query after ``normalize`` (comments dropped, whitespace
+  collapsed, lower case outside string literals and quoted identifiers),
+  the dataset file, and a data-version stamp;
+- the stamp is shared as long as a connection has only read the read-only
+  base. Any other statement it runs (``CREATE TEMP TABLE``, ``INSERT``,
+  ``SET``, ...) gives that connection a fresh private stamp, so results
+  computed over its temp tables never reach other sessions. When the
+  connections are cursors of one DuckDB instance, the write also moves the
+  shared epoch on: the in-memory catalog next to the base is visible to
+  every cursor, so no result cached before it is served again. With
+  ``isolated=True`` (a ``ConnectionPool`` with per-session instances) a
+  write can only change that connection's own catalog, so the shared
+  entries stay and only the connection's previous private ones go.
+  The private stamps are held weakly per connection: when the pool closes
+  one, its stamp goes with it;
+- results are stored as Arrow tables and evicted least recently used first
+  once their ``nbytes`` exceed ``max_bytes``. Queries calling ``random()``,
+  ``now()`` and the like are never cached.
+
+``stats()`` reports the hit rate and the execution time the hits saved.
+``lookup`` and ``store`` are the two halves of ``run`` for callers that
+fetch the rows themselves (``core.sqlstream``).
+"""
+import itertools
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+import duckdb
+
+MAX_BYTES = 256 * 2**20
+
+_TOKENS = re.compile(r"""(?P<quoted>'(?:[^']|'')*'|"(?:[^"]|"")*")|(?P<comment>--[^\n]*|/\*.*?\*/)|(?P<space>\s+)""",
+                     re.S)
+_VOLATILE = re.compile(r"\b(random|uuid|gen_random_uuid|setseed|nextval|currval|now|today|current_date|"
+                       r"current_time|current_timestamp|get_current_time|get_current_timestamp)\b")
+# Statements that neither read cacheable rows nor change what later queries see
+_PASSIVE = {duckdb.StatementType.EXPLAIN}
+
+
+def _word(char):
+    return char.isalnum() or char == "_"
+
+
+def normalize(query):
+    """
+    Cache key text of ``query``: "SELECT  a\\n FROM t -- x" and "select a from t;"
+    give the same key, 'Engineering' and 'engineering' do not.
+    """
+    tokens = []
+    pos = 0
+    for match in _TOKENS.finditer(query):
+        tokens += [query[pos:match.start()].lower(), match["quoted"] or " "]
+        pos = match.end()
+    tokens.append(query[pos:].lower())
+    tokens = [token for token in tokens if token]
+    out = []
+    for i, token in enumerate(tokens):
+        if token != " ":
+            out.append(token)
+            continue
+        following = tokens[i + 1] if i + 1 < len(tokens) else " "
+        if out and following != " " and _word(out[-1][-1]) and _word(following[0]):
+            out.append(" ")  # only where it separates two words
+    return "".join(out).rstrip(";")
+
+
+def statement_types(query):
+    return {statement.type for statement in duckdb.extract_statements(query)}
+
+
+def cacheable(query):
+    """Only plain SELECTs without volatile functions are cached."""
+    return statement_types(query) == {duckdb.StatementType.SELECT} and not _VOLATILE.search(normalize(query))
+
+
+def writes(query):
+    """Whether running ``query`` may change what later queries return (DDL, DML, SET, ...)."""
+    return bool(statement_types(query) - _PASSIVE - {duckdb.StatementType.SELECT})
+
+
+class _Entry:
+    __slots__ = ("table", "nbytes", "seconds")
+
+    def __init__(self, table, seconds):
+        self.table = table
+        self.nbytes = table.nbytes
+        self.seconds = seconds  # what executing the query cost when it was cached
+
+
+class ResultCache:
+    """(normalized SQL, dataset, data version) -> Arrow table, LRU under a byte budget."""
+
+    def __init__(self, max_bytes=MAX_BYTES, isolated=False):
+        self.max_bytes = max_bytes
+        self.isolated = isolated  # connections are separate instances: writes never reach shared data
+        self._entries = OrderedDict()
+        self._versions = weakref.WeakKeyDictionary()  # connection -> private stamp, once it ran DDL/DML
+        self._stamps = itertools.count(1)
+        self._epoch = 0  # bumped by every DDL/DML, from any connection
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+        self.saved_seconds = 0.0
+
+    def version(self, con):
+        """
+        The connection's data-version stamp: (shared epoch, private stamp), the
+        latter None while it has only read the shared base.
+        """
+        with self._lock:
+            return self._epoch, self._versions.get(con)
+
+    def invalidate(self, con):
+        """
+        After ``con`` ran DDL/DML: its own cached results are dropped, and with
+        shared connections every other result too.
+        """
+        with self._lock:
+            old = self._versions.get(con)
+            self._versions[con] = next(self._stamps)
+            if self.isolated:
+                if old is not None:
+                    for key in [k for k in self._entries if k[2][1] == old]:
+                        self.bytes -= self._entries.pop(key).nbytes
+                return
+            self._epoch += 1  # a query still running under the old epoch caches its result unreachably
+            self._entries.clear()
+            self.bytes = 0
+
+    def lookup(self, con, query, dataset=None):
+        """
+        ``(key, table)`` for ``query`` on ``con``; ``dataset`` names what ``con``
+        reads (the base file path). ``key`` is None when the query must not be
+        cached, ``table`` is None on a miss.
+        """
+        if not cacheable(query):
+            return None, None
+        key = (normalize(query), dataset, self.version(con))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return key, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_seconds += entry.seconds
+            return key, entry.table
+
+    def store(self, key, table, seconds):
+        """Caches the complete result of the query ``lookup`` gave ``key`` for; it took ``seconds``."""
+        entry = _Entry(table, seconds)
+        if key is None or entry.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old.nbytes
+            self._entries[key] = entry
+            self.bytes += entry.nbytes
+            while self.bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def run(self, con, query, dataset=None):
+        """Result of ``query`` on ``con`` as a ``pyarrow.Table`` and whether it came from the cache."""
+        key, table = self.lookup(con, query, dataset)
+        if table is not None:
+            return table, True
+        start = time.perf_counter()
+        try:
+            table = con.execute(query).to_arrow_table()
+        finally:
+            if writes(query):
+                self.invalidate(con)  # even if it failed half-way through
+        self.store(key, table, time.perf_counter() - start)
+        return table, False
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"entries": len(self._entries), "bytes": self.bytes, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "hit_rate": self.hits / lookups if lookups else 0.0, "saved_seconds": self.saved_seconds}
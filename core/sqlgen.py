@@ -0,0 +1,175 @@
+"""
+Scale-factor data for the SQL challenges' ``employees`` and ``sales`` tables.
+
+``generate(sf)`` writes ``sf * SALES_PER_SF`` sales rows (10^7 at sf=10,
+10^9 at sf=1000) and ``sf * EMPLOYEES_PER_SF`` employees once, with
+DuckDB generating the rows itself, and returns the path of a database
+file that ``core.sqlpool.ConnectionPool`` attaches read-only. The tables
+are realistically lopsided:
+
+- sales per employee follow a Zipf law with exponent ``SKEW``: the top
+  seller has hundreds of times the sales of the median one. Ranks are
+  scattered over ids, so the stars are not simply ids 1, 2, 3;
+- ``len(DEPARTMENTS) * len(CITIES)`` departments ("Engineering Jakarta",
+  ...) whose sizes are skewed too;
+- sale dates span ``YEARS`` years, amounts and salaries are right-skewed.
+
+Every random number is a hash of (row id, column, seed), so a given
+``(sf, seed)`` always produces the same data, in parallel, without
+holding it in Python. With ``fmt="parquet"`` the rows go to Parquet files
+instead and the database file only holds views over them.
+
+``python -m core.sqlgen --sf 10`` builds a dataset ahead of time; the SQL
+page lists what exists (``available``) and never generates on start-up.
+"""
+import argparse
+import math
+import os
+import re
+import time
+
+import duckdb
+
+from core.sqlpool import CACHE_DIR, build_base
+
+# Bump when the generated rows change, so stale files are not reused.
+GEN_VERSION = 1
+SEED = 2024
+SALES_PER_SF = 1_000_000
+EMPLOYEES_PER_SF = 1_000
+SKEW = 1.1  # Zipf exponent of sales per employee
+YEARS = 5
+START_DATE = "2019-01-01"
+
+DEPARTMENTS = ("Engineering", "HR", "Marketing", "Sales", "Finance", "Legal", "Operations", "Support",
+               "Research", "Product", "Design", "Data", "Security", "Procurement", "Logistics", "Facilities")
+CITIES = ("Jakarta", "Bandung", "Surabaya", "Medan", "Makassar", "Denpasar", "Yogyakarta", "Singapore")
+
+_NAME = re.compile(r"^sf(?P<sf>[\d.]+)-s(?P<seed>\d+)-v(?P<version>\d+)\.duckdb$")
+
+
+def dataset_path(sf, seed=SEED, root=CACHE_DIR):
+    return os.path.join(root, f"sf{sf:g}-s{seed}-v{GEN_VERSION}.duckdb")
+
+
+def _coprime_step(n):
+    """A multiplier coprime with ``n``, so ``rank * step % n`` is a permutation of the ids."""
+    step = 2_654_435_761 % n or 1
+    while math.gcd(step, n) != 1:
+        step += 1
+    return step
+
+
+def _uniform(column, seed):
+    """SQL for a deterministic U[0, 1) per row ``i``, independent for every ``column`` name."""
+    return f"((hash(i, '{column}', {int(seed)}) >> 11)::DOUBLE / 9007199254740992.0)"
+
+
+def _selects(sf, seed, skew, years):
+    """``{table: SELECT}`` generating the rows of each table."""
+    employees = max(6, round(sf * EMPLOYEES_PER_SF))
+    departments = [f"{d} {c}" for c in CITIES for d in DEPARTMENTS]
+    u = lambda column: _uniform(column, seed)
+    # Inverse CDF of a continuous Zipf(skew) on [1, employees + 1), floored to a rank
+    if skew == 1:
+        rank = f"floor(pow({employees} + 1, {u('who')}))"
+    else:
+        a = 1 - skew
+        rank = f"floor(pow((pow({employees} + 1, {a}) - 1) * {u('who')} + 1, {1 / a}))"
+    dept_list = ", ".join(f"'{d}'" for d in departments)
+    return {
+        "employees": f"""
+            SELECT i::INTEGER AS id,
+                   printf('Karyawan %07d', i) AS name,
+                   ([{dept_list}])[1 + floor({len(departments)} * pow({u('dept')}, 2))::INTEGER] AS department,
+                   (round(30000 + 170000 * pow({u('salary')}, 2), -3))::INTEGER AS salary
+            FROM range(1, {employees} + 1) t(i)""",
+        "sales": f"""
+            SELECT i::BIGINT AS id,
+                   ((least({rank}, {employees})::BIGINT - 1) * {_coprime_step(employees)} % {employees} + 1)::INTEGER
+                       AS employee_id,
+                   (50 + floor(5000 * pow({u('amount')}, 3)))::INTEGER AS amount,
+                   (DATE '{START_DATE}' + floor({u('date')} * {round(365.25 * years)})::INTEGER) AS date
+            FROM range(1, {round(sf * SALES_PER_SF)} + 1) t(i)""",
+    }
+
+
+def generate(sf, seed=SEED, root=CACHE_DIR, fmt="duckdb", skew=SKEW, years=YEARS, threads=None):
+    """
+    Path of the DuckDB file for scale factor ``sf`` (``sf=0``: the six-row
+    sample tables), generating it first if it does not exist yet.
+    """
+    if sf == 0:
+        return build_base(root)
+    if fmt not in ("duckdb", "parquet"):
+        raise ValueError(f"Format tidak didukung: {fmt!r} (duckdb atau parquet)")
+    path = dataset_path(sf, seed, root)
+    if os.path.exists(path):
+        return path
+    os.makedirs(root, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    con = duckdb.connect(tmp, config={"threads": threads} if threads else {})
+    try:
+        con.execute("SET preserve_insertion_order = false")  # lets DuckDB write the tables in parallel
+        for table, select in _selects(sf, seed, skew, years).items():
+            if fmt == "duckdb":
+                con.execute(f"CREATE TABLE {table} AS {select}")
+            else:
+                target = f"{path[:-len('.duckdb')]}.{table}.parquet"
+                con.execute(f"COPY ({select}) TO '{target}' (FORMAT parquet)")
+                con.execute(f"CREATE VIEW {table} AS SELECT * FROM read_parquet('{target}')")
+        con.execute("CHECKPOINT")
+    finally:
+        con.close()
+    os.replace(tmp, path)
+    return path
+
+
+def available(root=CACHE_DIR):
+    """``{scale factor: path}`` of the generated datasets in ``root`` (0: the sample tables)."""
+    found = {0: build_base(root)}
+    if os.path.isdir(root):
+        for name in sorted(os.listdir(root)):
+            match = _NAME.match(name)
+            if match and int(match["version"]) == GEN_VERSION:
+                sf = float(match["sf"])
+                found.setdefault(int(sf) if sf.is_integer() else sf, os.path.join(root, name))
+    return found
+
+
+def summary(path):
+    """Row counts and skew figures of a generated file, read back through a read-only connection."""
+    con = duckdb.connect(path, read_only=True)
+    try:
+        employees, departments = con.execute("SELECT count(*), count(DISTINCT department) FROM employees").fetchone()
+        sales, first, last = con.execute("SELECT count(*), min(date), max(date) FROM sales").fetchone()
+        top, median = con.execute("""
+            WITH per AS (SELECT employee_id, count(*) AS n FROM sales GROUP BY employee_id)
+            SELECT max(n), median(n) FROM per""").fetchone()
+    finally:
+        con.close()
+    return dict(employees=employees, departments=departments, sales=sales, first=first, last=last,
+                top_seller=top, median_seller=median)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the employees/sales tables at a scale factor.")
+    parser.add_argument("--sf", type=float, default=10, help=f"scale factor: sf x {SALES_PER_SF:,} sales rows")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--format", choices=("duckdb", "parquet"), default="duckdb")
+    parser.add_argument("--skew", type=float, default=SKEW, help="Zipf exponent of sales per employee")
+    parser.add_argument("--dir", default=CACHE_DIR)
+    args = parser.parse_args(argv)
+    sf = int(args.sf) if args.sf.is_integer() else args.sf
+
+    start = time.perf_counter()
+    path = generate(sf, args.seed, args.dir, args.format, args.skew)
+    print(f"{path} ({time.perf_counter() - start:.1f} s)")
+    stats = summary(path)
+    print(f"{stats['employees']:,} employees in {stats['departments']} departments, {stats['sales']:,} sales "
+          f"from {stats['first']} to {stats['last']}")
+    print(f"sales per employee: top {stats['top_seller']:,}, median {stats['median_seller']:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
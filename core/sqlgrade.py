@@ -0,0 +1,132 @@
+"""
+Result-set grading for the SQL challenges, done inside DuckDB.
+
+Each problem in ``catalog/sql.toml`` carries a reference ``solution``
+query. ``grade(con, query, reference)`` compares the candidate's result
+with it in tiers, without fetching either result into pandas:
+
+1. the text must be exactly one ``SELECT`` statement that binds;
+2. ``DESCRIBE (query)`` binds both queries without running them: the
+   column counts must match, and column by column the types must belong
+   to the same family (any integer width, any float/decimal, text, date,
+   ...). Names are not compared: ``SUM(amount)`` and ``total_sales`` are
+   the same column;
+3. one statement runs both queries once as ``MATERIALIZED`` CTEs and
+   takes ``candidate EXCEPT ALL reference`` and the other way round, each
+   row tagged with its side; a window over that difference gives each
+   side's row count next to its first ``max_rows`` rows. ``EXCEPT ALL``
+   is a multiset difference, so row order does not matter but duplicates
+   do. Float columns are rounded to ``FLOAT_DIGITS`` first, since ``AVG``
+   computed two ways can differ in the last bits.
+
+Each query is executed exactly once, and only the counts and up to
+``max_rows`` differing rows per side leave DuckDB, so grading stays cheap
+when the tables hold millions of rows.
+"""
+from dataclasses import dataclass
+
+import duckdb
+import pyarrow.compute as pc
+
+FLOAT_DIGITS = 6
+MAX_ROWS = 5
+
+_FAMILIES = {
+    "integer": ("TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT", "UTINYINT", "USMALLINT", "UINTEGER",
+                "UBIGINT", "UHUGEINT"),
+    "float": ("FLOAT", "DOUBLE", "DECIMAL"),
+    "text": ("VARCHAR",),
+    "timestamp": ("TIMESTAMP", "TIMESTAMP WITH TIME ZONE", "TIMESTAMP_S", "TIMESTAMP_MS", "TIMESTAMP_NS"),
+}
+
+
+@dataclass
+class SqlVerdict:
+    equal: bool
+    stage: str = ""  # "statement" | "columns" | "types" | "rows"
+    message: str = ""
+    missing: int = 0  # reference rows the candidate does not return
+    extra: int = 0  # candidate rows the reference does not return
+    missing_rows: object = None  # DataFrame samples of both
+    extra_rows: object = None
+
+
+def type_family(sql_type):
+    """Coarse type class used for the column-type check (DECIMAL(18,3) -> "float", INTEGER -> "integer")."""
+    base = sql_type.split("(")[0].strip().upper()
+    for family, names in _FAMILIES.items():
+        if base in names:
+            return family
+    return base
+
+
+def single_select(query):
+    """The query without trailing semicolons; ValueError unless it is exactly one SELECT."""
+    statements = duckdb.extract_statements(query)
+    if len(statements) != 1:
+        raise ValueError(f"Tulis tepat satu query (ditemukan {len(statements)} statement).")
+    if statements[0].type != duckdb.StatementType.SELECT:
+        raise ValueError(f"Hanya query SELECT yang dinilai, bukan {statements[0].type.name}.")
+    return query.strip().rstrip(";").strip()
+
+
+def describe(con, query):
+    """[(column name, DuckDB type)] of ``query``'s result, from binding it without running it."""
+    return [(row[0], row[1]) for row in con.execute(f"DESCRIBE ({query})").fetchall()]
+
+
+def _projection(alias, columns, families):
+    parts = [f"round({c}, {FLOAT_DIGITS})" if f == "float" else c for c, f in zip(columns, families)]
+    return f"SELECT {', '.join(parts)} FROM {alias}"
+
+
+def _side(rows, side, header, max_rows):
+    """(row count, sample frame or None) of one side of the difference."""
+    part = rows.filter(pc.equal(rows["side"], side))
+    if not part.num_rows:
+        return 0, None
+    frame = part.drop_columns(["side", "n", "rn"]).slice(0, max_rows).to_pandas()  # per side: own dtypes
+    frame.columns = header
+    return int(part["n"][0].as_py()), frame
+
+
+def grade(con, query, reference, max_rows=MAX_ROWS):
+    """Compares the result of ``query`` with that of ``reference`` on ``con``; returns a ``SqlVerdict``."""
+    reference = single_select(reference)
+    expected = describe(con, reference)
+    try:
+        query = single_select(query)
+        actual = describe(con, query)
+    except (ValueError, duckdb.Error) as e:
+        return SqlVerdict(False, "statement", str(e))
+    if len(actual) != len(expected):
+        return SqlVerdict(False, "columns", f"Jumlah kolom {len(actual)}, seharusnya {len(expected)} "
+                                            f"({', '.join(name for name, _ in expected)}).")
+    wrong = [f"{a_name} ({a_type}, seharusnya {e_type} seperti {e_name})"
+             for (a_name, a_type), (e_name, e_type) in zip(actual, expected)
+             if type_family(a_type) != type_family(e_type)]
+    if wrong:
+        return SqlVerdict(False, "types", "Tipe kolom berbeda: " + "; ".join(wrong) + ".")
+
+    columns = [f"c{i}" for i in range(len(expected))]
+    families = [type_family(t) for _, t in expected]
+    names = ", ".join(columns)
+    cand, ref = _projection("cand", columns, families), _projection("ref", columns, families)
+    rows = con.execute(
+        f"WITH cand({names}) AS MATERIALIZED ({query}), ref({names}) AS MATERIALIZED ({reference}), "
+        f"diff AS (SELECT 'extra' AS side, * FROM ({cand} EXCEPT ALL {ref}) "
+        f"UNION ALL SELECT 'missing' AS side, * FROM ({ref} EXCEPT ALL {cand})) "
+        f"SELECT * FROM (SELECT *, count(*) OVER (PARTITION BY side) AS n, "
+        f"row_number() OVER (PARTITION BY side) AS rn FROM diff) WHERE rn <= {max(max_rows, 1)}").to_arrow_table()
+    if not rows.num_rows:
+        return SqlVerdict(True)
+
+    header = [name for name, _ in expected]
+    n_missing, missing_rows = _side(rows, "missing", header, max_rows)
+    n_extra, extra_rows = _side(rows, "extra", header, max_rows)
+    parts = []
+    if n_missing:
+        parts.append(f"{n_missing:,} baris jawaban tidak ada di hasil Anda")
+    if n_extra:
+        parts.append(f"{n_extra:,} baris hasil Anda tidak ada di jawaban")
+    return SqlVerdict(False, "rows", "; ".join(parts) + ".", n_missing, n_extra, missing_rows, extra_rows)
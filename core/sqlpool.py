@@ -0,0 +1,183 @@
+"""
+Per-session DuckDB connections over a read-only shared database.
+
+The SQL page used to share one ``@st.cache_resource`` connection between
+every browser session: queries serialized on it, and one candidate's
+``DROP TABLE employees`` broke the page for everyone. Here:
+
+- the tables live in a DuckDB file (``build_base``), written once and
+  ``ATTACH``-ed ``READ_ONLY`` into a single in-process DuckDB instance, so
+  all sessions share one copy of the data and one buffer pool;
+- every session leases its own connection to that instance
+  (``DuckDBPyConnection.cursor()``), with the base as its default catalog.
+  Connections run queries in parallel; ``DROP``/``INSERT`` on the base
+  fail with a read-only error, and ``CREATE TEMP TABLE`` stays private to
+  the session. Once the base is attached, external access (files, other
+  databases) is switched off and the configuration locked;
+- ``ConnectionPool`` bounds the number of open connections, closes the
+  ones idle for longer than ``idle_seconds``, and makes the least recently
+  used idle one give way when the pool is full. A connection is used by at
+  most one thread at a time: ``lease`` holds its lock for the whole query,
+  and a leased connection is never evicted.
+
+DuckDB's ``memory_limit`` and ``threads`` are per database instance, not
+per connection. With ``memory_limit`` set, every session gets its own
+small instance (that limit, ``threads`` threads) attaching the same file
+read-only instead of a cursor on the shared one, so one heavy query spills
+or waits inside its own budget while the other sessions keep theirs. The data pages are then
+cached per instance (the OS page cache is still shared).
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import duckdb
+
+# Bump when the schema or the rows written by build_base change.
+BASE_VERSION = 1
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "sql")
+
+SCHEMA = [
+    "CREATE TABLE employees (id INTEGER, name VARCHAR, department VARCHAR, salary INTEGER)",
+    "INSERT INTO employees VALUES (1, 'Alice', 'HR', 60000), (2, 'Bob', 'Engineering', 120000), "
+    "(3, 'Charlie', 'Engineering', 130000), (4, 'David', 'HR', 65000), (5, 'Eve', 'Marketing', 90000), "
+    "(6, 'Frank', 'Marketing', 85000)",
+    "CREATE TABLE sales (id INTEGER, employee_id INTEGER, amount INTEGER, date DATE)",
+    "INSERT INTO sales VALUES (1, 2, 500, '2023-01-01'), (2, 2, 700, '2023-01-02'), (3, 3, 200, '2023-01-01'), "
+    "(4, 5, 1000, '2023-01-05'), (5, 5, 500, '2023-01-06')",
+]
+
+MAX_CONNECTIONS = 32
+IDLE_SECONDS = 600.0
+
+
+class PoolExhausted(RuntimeError):
+    """Every connection is busy running a query and the pool is at its bound."""
+
+
+def build_base(root=CACHE_DIR, statements=SCHEMA):
+    """Path of the shared database file, created by running ``statements`` if it does not exist yet."""
+    path = os.path.join(root, f"base-v{BASE_VERSION}.duckdb")
+    if os.path.exists(path):
+        return path
+    os.makedirs(root, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    con = duckdb.connect(tmp)
+    try:
+        for statement in statements:
+            con.execute(statement)
+        con.execute("CHECKPOINT")
+    finally:
+        con.close()
+    os.replace(tmp, path)  # concurrent builders just overwrite each other
+    return path
+
+
+class _Entry:
+    def __init__(self, con):
+        self.con = con  # a cursor on the shared instance, or the session's own instance
+        self.lock = threading.Lock()
+        self.users = 0  # leases taken or waiting; guarded by the pool lock
+        self.last_used = time.monotonic()
+
+
+class ConnectionPool:
+    """Session id -> private DuckDB connection, all reading the same read-only base."""
+
+    def __init__(self, base_path, max_connections=MAX_CONNECTIONS, idle_seconds=IDLE_SECONDS,
+                 threads=None, alias="base", memory_limit=None):
+        self.max_connections = max_connections
+        self.idle_seconds = idle_seconds
+        self.alias = alias
+        self.base_path = base_path
+        config = {"threads": threads} if threads else {}
+        if memory_limit:
+            config["memory_limit"] = memory_limit
+        # Per-session instances when the caller asks for limits, else cursors on one shared instance
+        self.session_config = config if memory_limit else None
+        self._root = None if memory_limit else self._connect(config)
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.opened = self.evicted = 0
+
+    @property
+    def isolated(self):
+        """Whether every session has its own DuckDB instance (so its writes stay private)."""
+        return self.session_config is not None
+
+    def _connect(self, config):
+        con = duckdb.connect(database=":memory:", config=config)
+        con.execute(f"ATTACH '{self.base_path}' AS {self.alias} (READ_ONLY)")
+        # No read_csv('/etc/passwd'), glob(), ATTACH or COPY from here on, and no
+        # SET lifting memory_limit/threads: settings cannot change after the lock.
+        # The base's own directory stays readable for datasets stored as Parquet views.
+        con.execute(f"SET allowed_directories = ['{os.path.dirname(os.path.abspath(self.base_path))}/']")
+        con.execute("SET enable_external_access = false")
+        con.execute("SET lock_configuration = true")
+        return con
+
+    def _open(self):
+        con = self._connect(self.session_config) if self.session_config else self._root.cursor()
+        con.execute(f"USE {self.alias}")
+        self.opened += 1
+        return _Entry(con)
+
+    def _close(self, session_id):
+        entry = self._entries.pop(session_id)
+        entry.con.close()
+        self.evicted += 1
+
+    def _sweep(self, now):
+        """Closes idle connections; caller holds ``_lock``. Busy ones are never touched."""
+        for session_id, entry in list(self._entries.items()):
+            if now - entry.last_used > self.idle_seconds and not entry.users:
+                self._close(session_id)
+
+    def _entry(self, session_id):
+        now = time.monotonic()
+        with self._lock:
+            self._sweep(now)
+            entry = self._entries.get(session_id)
+            if entry is None:
+                if len(self._entries) >= self.max_connections:
+                    idle = [(e.last_used, s) for s, e in self._entries.items() if not e.users]
+                    if not idle:
+                        raise PoolExhausted(f"Semua {self.max_connections} koneksi sedang dipakai; coba lagi sebentar.")
+                    self._close(min(idle)[1])
+                entry = self._entries[session_id] = self._open()
+            entry.last_used = now
+            entry.users += 1
+            return entry
+
+    @contextmanager
+    def lease(self, session_id):
+        """The session's connection, held exclusively until the ``with`` block ends."""
+        entry = self._entry(session_id)
+        try:
+            with entry.lock:  # a second rerun of the same session waits for the first query
+                yield entry.con
+        finally:
+            with self._lock:
+                entry.users -= 1
+                entry.last_used = time.monotonic()
+
+    def release(self, session_id):
+        """Closes a session's connection (e.g. when its browser tab is gone) unless it is in use."""
+        with self._lock:
+            if session_id in self._entries and not self._entries[session_id].users:
+                self._close(session_id)
+
+    def stats(self):
+        with self._lock:
+            busy = sum(bool(e.users) for e in self._entries.values())
+            return {"open": len(self._entries), "busy": busy, "opened": self.opened, "evicted": self.evicted,
+                    "max": self.max_connections}
+
+    def close(self):
+        with self._lock:
+            for session_id in list(self._entries):
+                self._close(session_id)
+            if self._root is not None:
+                self._root.close()
@@ -0,0 +1,97 @@
+"""
+``EXPLAIN ANALYZE`` for the SQL page, as data instead of a text box.
+
+``profile(con, query)`` runs the query once as ``EXPLAIN (ANALYZE, FORMAT
+json)``, which returns DuckDB's JSON profile (with all metrics) as the
+result. No setting is touched, so it also works on the SQL page's
+connections, whose configuration is locked. The operator tree comes back
+flattened in plan order, each node with its depth, so the page can show
+the candidate's plan next to the reference query's:
+
+- ``seconds``: time spent in the operator itself, not its children;
+- ``rows``: rows it produced (its cardinality), next to the optimizer's
+  estimate, which is where a bad join order usually shows;
+- ``bytes``: size of what it produced (``result_set_size``); DuckDB keeps
+  buffer memory per query, so the peak is reported for the whole query.
+"""
+import json
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+
+@dataclass
+class Operator:
+    depth: int
+    name: str
+    seconds: float
+    rows: int
+    estimated: int  # optimizer's cardinality estimate (None when it gives none)
+    bytes: int
+    detail: str = ""
+
+
+@dataclass
+class QueryProfile:
+    seconds: float  # wall-clock latency of the whole query
+    rows: int
+    peak_memory: int  # bytes of buffer memory at the query's peak
+    operators: list = field(default_factory=list)  # Operator, in plan order (parents first)
+
+    @property
+    def hottest(self):
+        """The operator with the largest own time."""
+        return max(self.operators, key=lambda o: o.seconds, default=None)
+
+    def to_frame(self):
+        total = sum(o.seconds for o in self.operators) or 1.0
+        return pd.DataFrame({
+            "operator": [("  " * (o.depth - 1) + "└ " if o.depth else "") + o.name for o in self.operators],
+            "waktu (ms)": [round(o.seconds * 1e3, 3) for o in self.operators],
+            "% waktu": [f"{o.seconds / total:.0%}" for o in self.operators],
+            "baris": [o.rows for o in self.operators],
+            "estimasi": [o.estimated for o in self.operators],
+            "byte keluar": [o.bytes for o in self.operators],
+            "detail": [o.detail for o in self.operators],
+        })
+
+
+def _detail(extra):
+    parts = []
+    for key, value in extra.items():
+        if key == "Estimated Cardinality":
+            continue
+        value = ", ".join(map(str, value)) if isinstance(value, list) else str(value)
+        parts.append(f"{key}: {value}")
+    return "; ".join(parts)
+
+
+def _walk(node, depth, out):
+    extra = node.get("extra_info") or {}
+    estimated = extra.get("Estimated Cardinality")
+    out.append(Operator(depth, node.get("operator_name", "?"), node.get("operator_timing", 0.0),
+                        node.get("operator_cardinality", 0), int(estimated) if estimated else None,
+                        node.get("result_set_size", 0), _detail(extra)))
+    for child in node.get("children", []):
+        _walk(child, depth + 1, out)
+
+
+def parse(info):
+    """A ``QueryProfile`` from DuckDB's JSON profiling output (a str or the decoded dict)."""
+    if isinstance(info, str):
+        info = json.loads(info)
+    operators = []
+    for child in info.get("children", []):
+        _walk(child, 0, operators)
+    return QueryProfile(info.get("latency", 0.0), info.get("rows_returned", 0),
+                        info.get("system_peak_buffer_memory", 0), operators)
+
+
+def profile(con, query):
+    """Runs ``query`` on ``con`` under ``EXPLAIN ANALYZE``; returns its ``QueryProfile``."""
+    info = json.loads(con.execute(f"EXPLAIN (ANALYZE, FORMAT json) {query}").fetchall()[0][1])
+    # The plan sits under an EXPLAIN_ANALYZE node; its top operator produced the result rows
+    info["children"] = [node for child in info.get("children", []) for node in child.get("children", [])]
+    prof = parse(info)
+    prof.rows = prof.operators[0].rows if prof.operators else 0
+    return prof
@@ -0,0 +1,159 @@
+"""
+Bounded, interruptible result fetching for the SQL page.
+
+``con.execute(query).df()`` materializes the whole result in pandas, so a
+``SELECT *`` over a cross join at scale factor 100 can take the server's
+memory with it, and nothing stops a query that runs for minutes. Here:
+
+- ``execute`` opens the result as an Arrow ``RecordBatchReader``: DuckDB
+  produces rows only as they are read, and ``ResultStream.fetch`` reads
+  just enough batches for the preview (``PREVIEW_ROWS``), then more on
+  "load more", never past ``MAX_ROWS``;
+- every call that makes DuckDB work (the ``execute`` itself, each
+  ``fetch``) runs under ``deadline``: a timer calls ``con.interrupt()``
+  after ``timeout`` seconds and the query fails with ``QueryTimeout``;
+- statements that change the instance's settings or touch the server's
+  files (``SET``, ``PRAGMA``, ``ATTACH``, ``COPY``, ...) are refused with a
+  readable message. This is only the first line: ``core.sqlpool`` switches
+  external access off and locks the configuration of every connection, so
+  ``read_csv('/etc/passwd')`` inside a SELECT fails too, and a session
+  cannot lift the ``memory_limit``/``threads`` its pool gave it;
+- with a ``core.sqlcache.ResultCache``, a cached result is served from
+  memory, and a result read to the end is cached as it completes.
+
+A stream lives on its connection: running anything else there ends it, so
+the page grades and profiles before it opens the stream.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+import duckdb
+import pyarrow as pa
+
+from core.sqlcache import statement_types, writes
+
+PREVIEW_ROWS = 1_000
+MAX_ROWS = 100_000
+TIMEOUT_SECONDS = 30.0
+
+_RESTRICTED = {duckdb.StatementType.SET, duckdb.StatementType.PRAGMA, duckdb.StatementType.ATTACH,
+               duckdb.StatementType.DETACH, duckdb.StatementType.LOAD, duckdb.StatementType.EXTENSION,
+               duckdb.StatementType.COPY, duckdb.StatementType.COPY_DATABASE, duckdb.StatementType.EXPORT}
+
+
+class QueryTimeout(RuntimeError):
+    """The query ran longer than its wall-clock budget and was interrupted."""
+
+
+@contextmanager
+def deadline(con, seconds=TIMEOUT_SECONDS):
+    """Interrupts whatever ``con`` runs inside the block once ``seconds`` have passed (None: no limit)."""
+    if not seconds or con is None:
+        yield
+        return
+    fired = threading.Event()
+
+    def stop():
+        fired.set()
+        con.interrupt()
+
+    timer = threading.Timer(seconds, stop)
+    timer.daemon = True
+    timer.start()
+    try:
+        yield
+    except (duckdb.Error, OSError) as e:  # pyarrow reports an interrupt while reading as OSError
+        if fired.is_set():
+            raise QueryTimeout(f"Query dihentikan setelah {seconds:g} detik.") from e
+        raise
+    finally:
+        timer.cancel()
+
+
+def check(query):
+    """ValueError for the statements the page does not run (see ``_RESTRICTED``)."""
+    refused = sorted(t.name for t in statement_types(query) & _RESTRICTED)
+    if refused:
+        raise ValueError(f"Perintah {', '.join(refused)} tidak diizinkan di sini.")
+
+
+class ResultStream:
+    """The rows of one query, read from DuckDB a batch at a time."""
+
+    def __init__(self, schema, batches, cached=False, on_complete=None):
+        self.schema = schema
+        self.batches = []
+        self.rows = 0
+        self.seconds = 0.0  # time spent in DuckDB so far
+        self.done = False
+        self.cached = cached
+        self._pending = batches  # iterator of RecordBatch still to read
+        self._on_complete = on_complete
+
+    @classmethod
+    def from_table(cls, table, batch_rows=PREVIEW_ROWS):
+        return cls(table.schema, iter(table.to_batches(max_chunksize=batch_rows)), cached=True)
+
+    @property
+    def more(self):
+        """Whether "load more" can still add rows."""
+        return not self.done and self.rows < MAX_ROWS
+
+    def fetch(self, con=None, rows=PREVIEW_ROWS, timeout=TIMEOUT_SECONDS):
+        """
+        Reads at least ``rows`` more rows (fewer at the end); ``con`` is the
+        connection the query runs on, None for a cached result.
+        """
+        target = min(self.rows + rows, MAX_ROWS)
+        start = time.perf_counter()
+        with deadline(con, timeout):
+            while not self.done and self.rows < target:
+                batch = next(self._pending, None)
+                if batch is None:
+                    self.done = True
+                elif batch.num_rows:
+                    self.batches.append(batch)
+                    self.rows += batch.num_rows
+        self.seconds += time.perf_counter() - start
+        if self.done and self._on_complete is not None:
+            self._on_complete(self.table(), self.seconds)
+            self._on_complete = None
+        return self
+
+    def table(self):
+        return pa.Table.from_batches(self.batches, schema=self.schema)
+
+    def frame(self):
+        return self.table().to_pandas()
+
+
+def _batches(reader):
+    while True:
+        try:
+            yield reader.read_next_batch()
+        except StopIteration:
+            return
+
+
+def execute(con, query, cache=None, dataset=None, rows=PREVIEW_ROWS, timeout=TIMEOUT_SECONDS):
+    """
+    Runs ``query`` on ``con`` and returns a ``ResultStream`` holding its first
+    ``rows`` rows. ``cache``/``dataset``: a ``ResultCache`` and the key of the
+    data ``con`` reads, as in ``ResultCache.run``.
+    """
+    check(query)
+    key, table = cache.lookup(con, query, dataset) if cache is not None else (None, None)
+    if table is not None:
+        return ResultStream.from_table(table, rows).fetch(rows=rows)
+    start = time.perf_counter()
+    try:
+        with deadline(con, timeout):
+            reader = con.execute(query).to_arrow_reader(rows)
+    finally:
+        if cache is not None and writes(query):
+            cache.invalidate(con)
+    on_complete = (lambda table, seconds: cache.store(key, table, seconds)) if key is not None else None
+    stream = ResultStream(reader.schema, _batches(reader), on_complete=on_complete)
+    stream.seconds = time.perf_counter() - start
+    return stream.fetch(con, rows, timeout)
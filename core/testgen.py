@@ -0,0 +1,199 @@
+"""
+Randomized and adversarial test cases for the algorithm problems.
+
+``generate_cases(problem, seed, size)`` builds a deterministic mix of edge
+cases (empty input, duplicates, worst-case grids, k=1000 lists, ...) and
+random cases up to ``size`` elements. Expected outputs come from the
+reference solutions and are computed only once: ``CaseCache`` stores every
+(problem, seed, size) suite in an append-only file per problem and reads it
+back through ``mmap``, so a click on "Jalankan Kode" only runs the
+candidate's code.
+"""
+import json
+import mmap
+import os
+import pickle
+import random
+import string
+import threading
+import zlib
+
+from core.complexity import PROBLEMS
+from core.solutions import ADAPTERS, REFERENCES
+
+# Bump when a generator changes so stale cached suites are not reused.
+CASES_VERSION = 1
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         ".cache", "testcases")
+RANDOM_CASES = 25
+
+
+def _two_sum_unique(rng, n, low=-10**4, high=10**4):
+    """Random array with exactly one pair summing to target."""
+    while True:
+        nums = [rng.randint(low, high) for _ in range(max(n, 2))]
+        i, j = sorted(rng.sample(range(len(nums)), 2))
+        target = nums[i] + nums[j]
+        seen, pairs = {}, 0
+        for v in nums:
+            pairs += seen.get(target - v, 0)
+            seen[v] = seen.get(v, 0) + 1
+        if pairs == 1:
+            return [nums, target]
+
+
+def _two_sum(rng, size):
+    edge = [
+        [[3, 3], 6],                               # duplicate values form the answer
+        [[0, 4, 3, 0], 0],                         # zeros
+        [[-1, -2, -3, -4, -5], -8],                # negatives
+        [[1, 5, 5, 11], 10],                       # duplicates, answer uses both copies
+        [list(range(1, size)) + [10**9, 10**9 + 1], 2 * 10**9 + 1],  # answer at the very end
+    ]
+    return edge + [_two_sum_unique(rng, rng.randint(2, size)) for _ in range(RANDOM_CASES)]
+
+
+def _is_anagram(rng, size):
+    edge = [["", ""], ["a", ""], ["aa", "a"], ["aab", "abb"], ["ab", "ba"], ["a" * size, "a" * size]]
+    cases = []
+    for _ in range(RANDOM_CASES):
+        s = "".join(rng.choices("abc" if rng.random() < 0.5 else string.ascii_lowercase, k=rng.randint(0, size)))
+        t = list(s)
+        rng.shuffle(t)
+        if t and rng.random() < 0.5:
+            t[rng.randrange(len(t))] = rng.choice(string.ascii_lowercase)  # usually breaks it
+        cases.append([s, "".join(t)])
+    return edge + cases
+
+
+def _max_area(rng, size):
+    edge = [[[1, 1]], [[0, 0]], [[5] * size], [list(range(size))], [list(range(size, 0, -1))], [[1, 0, 0, 1]]]
+    return edge + [[[rng.randint(0, 100) for _ in range(rng.randint(2, size))]] for _ in range(RANDOM_CASES)]
+
+
+def _longest_substring(rng, size):
+    edge = [[""], ["a"], ["a" * size], [string.ascii_lowercase], ["abba"], ["dvdf"], [" "], ["ab" * size]]
+    return edge + [["".join(rng.choices(rng.choice(["ab", "abcde", string.ascii_letters + " "]),
+                                        k=rng.randint(0, size)))] for _ in range(RANDOM_CASES)]
+
+
+def _num_islands(rng, size):
+    side = max(2, size)
+    land = [["1"] * side for _ in range(side)]
+    checker = [["1" if (r + c) % 2 == 0 else "0" for c in range(side)] for r in range(side)]
+    # One long winding island: deep for recursive DFS, long queue for BFS.
+    snake = [["1" if r % 2 == 0 or (c == side - 1 if r % 4 == 1 else c == 0) else "0"
+              for c in range(side)] for r in range(side)]
+    edge = [[[["0"]]], [[["1"]]], [land], [checker], [snake], [[["1", "0", "1", "0", "1"]]], [[["1"], ["0"], ["1"]]]]
+    cases = []
+    for _ in range(RANDOM_CASES):
+        rows, cols, density = rng.randint(1, side), rng.randint(1, side), rng.random()
+        cases.append([[["1" if rng.random() < density else "0" for _ in range(cols)] for _ in range(rows)]])
+    return edge + cases
+
+
+def _merge_k_lists(rng, size):
+    many = [sorted(rng.randint(-100, 100) for _ in range(rng.randint(0, 3))) for _ in range(1000)]
+    edge = [[[]], [[[]]], [[[], [1]]], [[[1, 1, 1], [1, 1]]], [many], [[list(range(size))]]]
+    cases = []
+    for _ in range(RANDOM_CASES):
+        k = rng.randint(0, 20)
+        cases.append([[sorted(rng.randint(-50, 50) for _ in range(rng.randint(0, size // 4 + 1))) for _ in range(k)]])
+    return edge + cases
+
+
+GENERATORS = {
+    "twoSum": _two_sum,
+    "isAnagram": _is_anagram,
+    "maxArea": _max_area,
+    "lengthOfLongestSubstring": _longest_substring,
+    "numIslands": _num_islands,
+    "mergeKLists": _merge_k_lists,
+}
+
+
+def generate_cases(problem, seed=0, size=32):
+    """Returns ``[{"args": [...], "expected": ...}, ...]`` with reference outputs."""
+    args_list = GENERATORS[problem](random.Random(f"{problem}:{seed}:{size}"), size)
+    reference = REFERENCES[problem]
+    adapt_in, adapt_out = ADAPTERS.get(PROBLEMS[problem].adapter, (list, None))
+    cases = []
+    for args in args_list:
+        expected = reference(*adapt_in(args))
+        cases.append({"args": args, "expected": adapt_out(expected) if adapt_out else expected})
+    return cases
+
+
+class CaseCache:
+    """
+    Append-only on-disk store of generated suites, one data file per problem.
+
+    ``<problem>.bin`` holds zlib-compressed pickles back to back and
+    ``<problem>.idx.json`` maps ``v<version>:<seed>:<size>`` to an
+    (offset, length) slice of it. Reads go through a shared ``mmap`` of the
+    data file, so only the requested suite is touched.
+    """
+
+    def __init__(self, root=CACHE_DIR):
+        self.root = root
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index = {}
+        self._maps = {}
+
+    def _paths(self, problem):
+        base = os.path.join(self.root, problem)
+        return base + ".bin", base + ".idx.json"
+
+    def _load_index(self, problem):
+        if problem not in self._index:
+            _, idx_path = self._paths(problem)
+            try:
+                with open(idx_path) as f:
+                    self._index[problem] = json.load(f)
+            except (OSError, ValueError):
+                self._index[problem] = {}
+        return self._index[problem]
+
+    def _read(self, problem, offset, length):
+        data_path, _ = self._paths(problem)
+        mapped = self._maps.get(problem)
+        if mapped is None or len(mapped) < offset + length:
+            if mapped is not None:
+                mapped.close()
+            with open(data_path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[problem] = mapped
+        return pickle.loads(zlib.decompress(mapped[offset:offset + length]))
+
+    def _append(self, problem, key, cases):
+        data_path, idx_path = self._paths(problem)
+        os.makedirs(self.root, exist_ok=True)
+        blob = zlib.compress(pickle.dumps(cases, protocol=pickle.HIGHEST_PROTOCOL), 6)
+        with open(data_path, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(blob)
+        index = self._load_index(problem)
+        index[key] = [offset, len(blob)]
+        tmp = idx_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp, idx_path)
+
+    def get(self, problem, seed=0, size=32):
+        key = f"v{CASES_VERSION}:{seed}:{size}"
+        with self._lock:
+            entry = self._load_index(problem).get(key)
+            if entry is not None:
+                try:
+                    cases = self._read(problem, *entry)
+                    self.hits += 1
+                    return cases
+                except (OSError, ValueError, zlib.error, pickle.UnpicklingError):
+                    pass  # truncated or foreign file: rebuild below
+            self.misses += 1
+            cases = generate_cases(problem, seed, size)
+            self._append(problem, key, cases)
+            return cases
@@ -0,0 +1,156 @@
+"""
+Verdict cache for graded submissions.
+
+Streamlit reruns the whole page on every interaction, and candidates often
+click "Jalankan Kode" again without changing anything. ``VerdictCache``
+maps (normalized code, problem id, test-suite version) to whatever the
+grader produced (verdict, timings, result frame) so identical resubmissions
+return instantly. Entries are evicted least-recently-used beyond
+``maxsize`` entries or ``max_bytes`` (estimated by ``value_nbytes``, since
+the pandas and ML pages store result frames), and expire after ``ttl``
+seconds. A value bigger than ``max_bytes`` on its own is not stored.
+
+``VERDICTS`` is the process-wide instance shared by all pages.
+"""
+import ast
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+MAX_BYTES = 256 * 2**20
+
+_MISSING = object()
+
+
+def normalize_code(code):
+    """
+    Canonical form of a submission: the AST dump, so comments, blank lines
+    and formatting do not change the key. Code that does not parse falls
+    back to its whitespace-normalized text.
+    """
+    try:
+        return ast.dump(ast.parse(code))
+    except SyntaxError:
+        lines = [line.rstrip() for line in code.replace("\r\n", "\n").split("\n")]
+        return "\n".join(line for line in lines if line)
+
+
+def submission_key(code, problem_id, suite_version):
+    digest = hashlib.sha256()
+    for part in (normalize_code(code), problem_id, str(suite_version)):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def suite_fingerprint(*parts):
+    """Short hash of test-suite contents, usable as ``suite_version``."""
+    return hashlib.sha1(repr(parts).encode()).hexdigest()[:12]
+
+
+def value_nbytes(value, _seen=None):
+    """
+    Rough deep size of a cached value: pandas objects by
+    ``memory_usage(deep=True)``, arrays and Arrow tables by ``nbytes``,
+    containers and plain objects (verdicts, reports) by their contents.
+    """
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    usage = getattr(value, "memory_usage", None)
+    if callable(usage):
+        total = usage(deep=True)  # a Series of per-column bytes for a DataFrame
+        return int(total.sum() if hasattr(total, "sum") else total)
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        return size + sum(value_nbytes(k, seen) + value_nbytes(v, seen) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(value_nbytes(item, seen) for item in value)
+    if hasattr(value, "__dict__") and not isinstance(value, type):
+        return size + value_nbytes(vars(value), seen)
+    return size
+
+
+class VerdictCache:
+    def __init__(self, maxsize=512, ttl=3600, max_bytes=MAX_BYTES):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()  # key -> (stored at, value, bytes)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and time.monotonic() - item[0] > self.ttl:
+                del self._data[key]
+                self.bytes -= item[2]
+                item = None
+            if item is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def put(self, key, value):
+        nbytes = value_nbytes(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[2]
+            if nbytes > self.max_bytes:
+                return
+            self._data[key] = (time.monotonic(), value, nbytes)
+            self.bytes += nbytes
+            while len(self._data) > self.maxsize or self.bytes > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self.bytes -= evicted[2]
+                self.evictions += 1
+
+    def get_or_compute(self, code, problem_id, suite_version, compute, cacheable=None):
+        """
+        Returns ``(value, cached)``. ``compute()`` runs only on a miss; if it
+        raises, or ``cacheable(value)`` is false (e.g. a timeout under load),
+        nothing is stored.
+        """
+        key = submission_key(code, problem_id, suite_version)
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value, True
+        value = compute()
+        if cacheable is None or cacheable(value):
+            self.put(key, value)
+        return value, False
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._data),
+            "bytes": self.bytes,
+            "evictions": self.evictions,
+        }
+
+
+VERDICTS = VerdictCache()
@@ -1,6 +1,16 @@
 import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
 import time
 
+from core.catalog import load_catalog
+from core.complexity import PROBLEMS, compare_growth
+from core.memory import FLAG_RATIO, excess_ratio
+from core.sandbox import Limits, WorkerPool
+from core.solutions import reference_source
+from core.testgen import GENERATORS, CaseCache
+from core.verdicts import VERDICTS, suite_fingerprint
+
 st.set_page_config(page_title="Python Algorithms", page_icon="🐍", layout="wide")
 
 st.markdown("# 🐍 Python Algorithms & Data Structures")
@@ -20,387 +30,184 @@ with st.sidebar:
     - [Python for Coding Interviews](https://www.youtube.com/watch?v=0K_eZGS5NsU)
     """)
 
-# Tabs for Difficulty Levels
-tab1, tab2, tab3 = st.tabs(["🟢 Beginner (Pemula)", "🟡 Intermediate (Menengah)", "🔴 Advanced (Mahir)"])
-
-def check_solution(user_code, test_cases):
-    """
-    A simple helper to simulate running user code against test cases.
-    """
-    try:
-        # Dangerous in production, okay for local protected demo
-        # exec(user_code) 
-        st.success("✅ Kode berhasil dijalankan! (Simulasi output benar)")
-        st.balloons()
-    except Exception as e:
-        st.error(f"⚠️ Error: {e}")
-
-# BEGINNER
-with tab1:
-    st.header("🟢 Level Pemula: Arrays & Hashing")
-    
-    st.markdown("""
-    ### 📚 Materi Singkat: Hash Map
-    **Hash Map** (di Python disebut `dict`) adalah struktur data paling penting untuk interview.
-    -   **Keunggulan**: Mencari data (lookup) hanya butuh waktu rata-rata **O(1)**.
-    -   **Kapan dipakai?**: Jika Anda butuh mencari sesuatu (misal: "apakah angka ini pernah muncul sebelumnya?") dengan sangat cepat.
-    """)
-    
-    st.markdown("---")
-    
-    # Problem 1: Two Sum
-    st.subheader("📝 Soal 1: Two Sum (LeetCode #1)")
-    
-    st.markdown("""
-    **Deskripsi**: 
-    Diberikan array integer `nums` dan integer `target`, kembalikan **indeks** dari dua angka yang jika dijumlahkan menghasilkan `target`.
-    
-    **Contoh**:
-    ```python
-    Input: nums = [2,7,11,15], target = 9
-    Output: [0,1]
-    # Karena nums[0] + nums[1] == 2 + 7 == 9
-    ```
-    """)
-    
-    code1 = st.text_area("Tulis Solusi Anda:", height=150, key="code_beg_1", value="""def twoSum(nums, target):
-    # Tulis logika di sini
-    pass
-""")
-    if st.button("Jalankan Kode", key="btn_beg_1"):
-        check_solution(code1, [])
-        
-    with st.expander("💡 Lihat Penjelasan & Jawaban"):
-        st.markdown("""
-        **Strategi**: One-pass Hash Map
-        1.  Kita butuh mencari pasangan `x` sehingga `x + angka_sekarang = target`.
-        2.  Artinya, kita mencari `x = target - angka_sekarang`.
-        3.  Sambil kita loop array, kita simpan setiap angka dan indeksnya ke dalam *dictionary*.
-        4.  Di setiap langkah, cek apakah `diff` (selisih) sudah ada di dictionary.
-        
-        **Jawaban**:
-        ```python
-        def twoSum(nums, target):
-            prevMap = {}  # val : index
-            
-            for i, n in enumerate(nums):
-                diff = target - n
-                if diff in prevMap:
-                    return [prevMap[diff], i]
-                prevMap[n] = i
-            return []
-        ```
-        **Kompleksitas**:
-        -   **Waktu**: $O(n)$ - Kita hanya loop array sekali.
-        -   **Memori**: $O(n)$ - Dictionary menyimpan maksimal $n$ elemen.
-        """)
+# Problems, tests and explanations live in catalog/algorithms.toml
+CATALOG = load_catalog("algorithms")
 
-    st.markdown("---")
-    
-    # Problem 2: Valid Anagram
-    st.subheader("📝 Soal 2: Valid Anagram (LeetCode #242)")
-    
-    st.markdown("""
-    **Deskripsi**: 
-    Diberikan dua string `s` dan `t`, kembalikan `True` jika `t` adalah anagram dari `s` (huruf penyusunnya sama persis), dan `False` jika bukan.
-    """)
-    
-    code2 = st.text_area("Tulis Solusi Anda:", height=150, key="code_beg_2", value="def isAnagram(s, t):\n    pass")
-    
-    if st.button("Jalankan Kode", key="btn_beg_2"):
-        check_solution(code2, [])
-        
-    with st.expander("💡 Lihat Penjelasan & Jawaban"):
-        st.markdown("""
-        **Strategi**: Hitung Frekuensi Karakter
-        Anagram berarti jumlah setiap huruf harus sama persis.
-        1.  Jika panjang string beda, pasti bukan anagram.
-        2.  Hitung frekuensi huruf di `s` dan `t` menggunakan Hash Map atau Array (ukuran 26 untuk huruf a-z).
-        3.  Bandingkan kedua hitungan tersebut.
-        
-        **Jawaban**:
-        ```python
-        def isAnagram(s, t):
-            if len(s) != len(t):
-                return False
-                
-            countS, countT = {}, {}
-            
-            for i in range(len(s)):
-                countS[s[i]] = countS.get(s[i], 0) + 1
-                countT[t[i]] = countT.get(t[i], 0) + 1
-                
-            return countS == countT
-        ```
-        """)
+@st.cache_resource
+def get_pool():
+    # Shared by every session: warm worker processes, one sandboxed fork per submission
+    return WorkerPool(size=4, limits=Limits(cpu_seconds=2, wall_seconds=5, memory_mb=256))
 
-    st.markdown("---")
+PROFILE_LIMITS = Limits(cpu_seconds=20, wall_seconds=30, memory_mb=1024)
+MEMORY_LIMITS = Limits(cpu_seconds=10, wall_seconds=15, memory_mb=1024)
+# Bump when core.memory / core.complexity change how they measure: cached profiles are then stale
+MEMORY_SUITE_VERSION = 1
+PROFILE_SUITE_VERSION = 2
 
-    # Problem 3: Contains Duplicate
-    st.subheader("📝 Soal 3: Contains Duplicate (LeetCode #217)")
-    st.markdown("""
-    **Deskripsi**: 
-    Diberikan array integer `nums`, kembalikan `True` jika ada angka yang muncul minimal dua kali.
-    """)
-    
-    with st.expander("💡 Lihat Penjelasan & Jawaban"):
-        st.markdown("""
-        **Strategi**: Hash Set
-        Gunakan `set()` karena `set` tidak menyimpan duplikat dan pengecekan keberadaan elemen (`in`) sangat cepat $O(1)$.
-        
-        **Jawaban**:
-        ```python
-        def containsDuplicate(nums):
-            hashset = set()
-            for n in nums:
-                if n in hashset:
-                    return True
-                hashset.add(n)
-            return False
-        ```
-        """)
+@st.cache_resource
+def get_case_cache():
+    # Expected outputs are computed with the reference once and reused from disk
+    return CaseCache()
 
-# INTERMEDIATE
-with tab2:
-    st.header("🟡 Level Menengah: Two Pointers & Sliding Window")
-    
-    st.markdown("""
-    ### 📚 Materi Singkat
-    1.  **Two Pointers**: Menggunakan dua penunjuk (indeks) untuk memproses array, biasanya dari dua arah berlawanan atau bersamaan. Efisien untuk mengurangi kompleksitas dari $O(n^2)$ ke $O(n)$.
-    2.  **Sliding Window**: Mempertahankan "jendela" (sub-array) yang memenuhi kondisi tertentu, dan menggesernya.
-    """)
-    
-    # Problem 1: Valid Parentheses
-    st.subheader("📝 Soal 1: Valid Parentheses (LeetCode #20)")
-    st.markdown("""
-    **Deskripsi**: 
-    Cek apakah string kurung `()[]{}` valid. Valid jika kurung buka ditutup dengan jenis yang sama dan urutan yang benar.
-    """)
-    
-    with st.expander("💡 Lihat Penjelasan & Jawaban"):
-        st.markdown("""
-        **Strategi**: Stack (Tumpukan)
-        -   Stack bekerja dengan prinsip **LIFO** (Last In, First Out).
-        -   Jika ketemu kurung buka, masukkan ke stack.
-        -   Jika ketemu kurung tutup, cek apakah stack kosong ATAU elemen teratas stack bukan pasangannya.
-        
-        **Jawaban**:
-        ```python
-        def isValid(s):
-            stack = []
-            map = {")": "(", "]": "[", "}": "{"}
-            
-            for c in s:
-                if c in map:
-                    if stack and stack[-1] == map[c]:
-                        stack.pop()
-                    else:
-                        return False
-                else:
-                    stack.append(c)
-            return True if not stack else False
-        ```
-        """)
-
-    st.markdown("---")
-
-    # Problem 2: Container With Most Water
-    st.subheader("📝 Soal 2: Container With Most Water (LeetCode #11)")
-    st.markdown("**Deskripsi**: Cari dua garis vertikal yang menampung air paling banyak.")
-    
-    code_int_2 = st.text_area("Tulis Solusi Anda:", height=150, key="code_int_2")
-    if st.button("Jalankan Kode", key="btn_int_2"):
-        check_solution(code_int_2, [])
-        
-    with st.expander("💡 Lihat Penjelasan & Jawaban"):
-        st.markdown("""
-        **Strategi**: Two Pointers
-        -   Pasang pointer di ujung kiri (`l`) dan kanan (`r`).
-        -   Hitung luas area: `(r - l) * min(tinggi[l], tinggi[r])`.
-        -   Geser pointer yang garisnya **lebih pendek** ke dalam, dengan harapan menemukan garis yang lebih tinggi untuk memperbesar area.
-        
-        **Jawaban**:
-        ```python
-        def maxArea(height):
-            l, r = 0, len(height) - 1
-            res = 0
-            
-            while l < r:
-                area = (r - l) * min(height[l], height[r])
-                res = max(res, area)
-                
-                if height[l] < height[r]:
-                    l += 1
-                else:
-                    r -= 1
-                    
-            return res
-        ```
-        """)
-
-    st.markdown("---")
-
-    # Problem 3: Longest Substring Without Repeating Characters
-    st.subheader("📝 Soal 3: Longest Substring Unique (LeetCode #3)")
-    st.markdown("**Deskripsi**: Cari panjang substring terpanjang tanpa huruf berulang.")
-    
-    with st.expander("💡 Lihat Penjelasan & Jawaban"):
-        st.markdown("""
-        **Strategi**: Sliding Window
-        -   Gunakan `set` untuk menyimpan huruf di jendela saat ini.
-        -   Gunakan pointer `l` (kiri) dan `r` (kanan).
-        -   Jika `s[r]` sudah ada di `set`, geser `l` maju dan hapus karakter dari `set` sampai duplikat hilang.
-        
-        **Jawaban**:
-        ```python
-        def lengthOfLongestSubstring(s):
-            charSet = set()
-            l = 0
-            res = 0
-            
-            for r in range(len(s)):
-                while s[r] in charSet:
-                    charSet.remove(s[l])
-                    l += 1
-                charSet.add(s[r])
-                res = max(res, r - l + 1)
-            return res
-        ```
-        """)
-
-# ADVANCED
-with tab3:
-    st.header("🔴 Level Mahir: DP & Graphs")
-    
-    st.markdown("""
-    ### 📚 Materi Singkat
-    1.  **Graph (BFS/DFS)**: Digunakan untuk menelusuri hubungan antar node (misal: peta, jaringan). BFS menyebar melebar, DFS menukik mendalam.
-    2.  **Dynamic Programming (DP)**: Memecah masalah besar menjadi sub-masalah kecil dan menyimpan hasilnya (caching) agar tidak dihitung ulang.
-    """)
-    
-    # Problem 1: Number of Islands
-    st.subheader("📝 Soal 1: Number of Islands (LeetCode #200)")
-    st.markdown("**Deskripsi**: Hitung jumlah pulau ('1') dalam grid lautan ('0').")
-    
-    code_adv_1 = st.text_area("Tulis Solusi Anda:", height=200, key="code_adv_1")
-    if st.button("Jalankan Kode", key="btn_adv_1"):
-        check_solution(code_adv_1, [])
-        
-    with st.expander("💡 Lihat Penjelasan & Jawaban"):
-        st.markdown("""
-        **Strategi**: Graph Traversal (BFS/DFS)
-        -   Loop setiap sel di grid.
-        -   Jika ketemu daratan ('1') yang belum dikunjungi, itu adalah pulau baru. Tambah counter `islands + 1`.
-        -   Jalankan BFS/DFS dari titik itu untuk menandai **semua** daratan yang terhubung sebagai "sudah dikunjungi".
-        
-        **Penting**: Jangan lupa menandai `visited` agar tidak menghitung pulau yang sama dua kali!
-        
-        **Jawaban**:
-        ```python
-        import collections
+def check_solution(user_code, entry, test_cases, compare="exact", adapter=None):
+    """
+    Runs user code against the examples plus generated edge/random cases in the sandboxed worker pool.
+    """
+    if entry in GENERATORS:
+        test_cases = list(test_cases) + get_case_cache().get(entry, seed=0, size=32)
+    if not test_cases:
+        st.info("Belum ada test case untuk soal ini.")
+        return
+
+    def grade():
+        verdict = get_pool().run(user_code, entry, test_cases, compare=compare, adapter=adapter)
+        if not verdict.passed or entry not in PROBLEMS:
+            return verdict, None
+        # Only a passing submission is worth a memory profile; the reference's is measured once
+        yours = get_pool().run(user_code, entry, kind="memory", limits=MEMORY_LIMITS)
+        return verdict, (yours, reference_memory(entry))
+
+    with st.spinner("Menjalankan kode di sandbox..."):
+        (verdict, memory), cached = VERDICTS.get_or_compute(
+            user_code, f"algo/{entry}", suite_fingerprint(test_cases, compare, adapter), grade,
+            cacheable=lambda out: out[0].status != "timeout")
+    if cached:
+        st.caption("⚡ Kode identik dengan submisi sebelumnya — hasil diambil dari cache.")
+
+    if verdict.cases:
+        st.dataframe(pd.DataFrame([{
+            "Input": c.args,
+            "Expected": c.expected,
+            "Output": c.error or c.actual,
+            "Lulus": "✅" if c.passed else "❌",
+            "Waktu (ms)": round(c.seconds * 1000, 3),
+        } for c in verdict.cases]))
+
+    if verdict.passed:
+        st.success(f"✅ Semua {len(verdict.cases)} test case lulus! ({verdict.seconds * 1000:.2f} ms)")
+        st.balloons()
+    elif verdict.status == "wrong":
+        st.warning("⚠️ Kode berjalan, tapi ada output yang belum tepat.")
+    else:
+        st.error(f"⚠️ {verdict.status.upper()}: {verdict.message}" if verdict.message else "⚠️ Error saat menjalankan test case.")
 
-        def numIslands(grid):
-            if not grid: return 0
-            
-            rows, cols = len(grid), len(grid[0])
-            visit = set()
-            islands = 0
-            
-            def bfs(r, c):
-                q = collections.deque()
-                visit.add((r, c))
-                q.append((r, c))
-                
-                while q:
-                    row, col = q.popleft()
-                    directions = [[1, 0], [-1, 0], [0, 1], [0, -1]]
-                    
-                    for dr, dc in directions:
-                        r_new, c_new = row + dr, col + dc
-                        if (r_new in range(rows) and 
-                            c_new in range(cols) and 
-                            grid[r_new][c_new] == "1" and 
-                            (r_new, c_new) not in visit):
-                            q.append((r_new, c_new))
-                            visit.add((r_new, c_new))
+    if memory:
+        show_memory_report(entry, *memory)
 
-            for r in range(rows):
-                for c in range(cols):
-                    if grid[r][c] == "1" and (r, c) not in visit:
-                        bfs(r, c)
-                        islands += 1
-            return islands
-        ```
-        """)
+def reference_memory(entry):
+    """
+    Memory profile of the reference solution, kept in the verdict cache:
+    it only changes with the reference itself.
+    """
+    verdict, _ = VERDICTS.get_or_compute(
+        reference_source(entry), f"algo/{entry}/memory", MEMORY_SUITE_VERSION,
+        lambda: get_pool().run(None, entry, kind="memory", limits=MEMORY_LIMITS),
+        cacheable=lambda out: out.passed)
+    return verdict
 
-    st.markdown("---")
+def show_memory_report(entry, yours, reference):
+    """
+    Peak allocation per input size, candidate vs reference.
+    """
+    st.markdown(f"**🧠 Pemakaian Memori** (klaim di penjelasan: {PROBLEMS[entry].space})")
+    for verdict in (yours, reference):
+        if not verdict.passed:
+            st.warning(f"⚠️ Memori tidak bisa diukur: {verdict.message}")
+            return
+    ref_points = {p.n: p for p in reference.detail.points}
+    st.dataframe(pd.DataFrame([{
+        "n": p.n,
+        "Peak Anda (KB)": round(p.peak_bytes / 1024, 1),
+        "Peak Referensi (KB)": round(ref_points[p.n].peak_bytes / 1024, 1) if p.n in ref_points else None,
+        "Byte/elemen Anda": round(p.bytes_per_element, 2),
+        "Byte/elemen Referensi": round(ref_points[p.n].bytes_per_element, 2) if p.n in ref_points else None,
+        "Blok hidup": p.blocks,
+    } for p in yours.detail.points]))
+
+    ratio = excess_ratio(yours.detail, reference.detail)
+    if ratio is not None and ratio > FLAG_RATIO:
+        st.warning(f"⚠️ Solusi Anda memakai memori {ratio:.1f}× lebih banyak dari referensi. "
+                   "Apakah ada salinan input atau list perantara yang tidak perlu?")
+    else:
+        st.caption(f"Pertumbuhan memori (empiris): {yours.detail.label or '?'} — setara dengan referensi.")
+
+def profile_solution(user_code, entry):
+    """
+    Measures how runtime grows with input size, next to the reference solution.
+    """
+    # One job times both, alternating calls: two concurrent jobs would skew each other's timings
+    def run_profiles():
+        return get_pool().run(user_code, entry, kind="profile_pair", limits=PROFILE_LIMITS)
+
+    with st.spinner("Mengukur waktu pada input yang terus membesar (n = 256, 512, 1024, ...)..."):
+        verdict, _ = VERDICTS.get_or_compute(
+            user_code, f"algo/{entry}/profile", PROFILE_SUITE_VERSION, run_profiles,
+            cacheable=lambda out: out.passed and compare_growth(*out.detail) != "unstable")
+    if not verdict.passed:
+        st.error(f"⚠️ {verdict.status.upper()}: {verdict.message}")
+        return
+    yours, reference = verdict.detail
+
+    fig = go.Figure()
+    for name, prof in [("Solusi Anda", yours), ("Referensi", reference)]:
+        fig.add_trace(go.Scatter(x=prof.sizes, y=[t * 1000 for t in prof.times],
+                                 mode="lines+markers", name=f"{name} ({prof.label or '?'})"))
+    fig.update_layout(title="Waktu Eksekusi vs Ukuran Input (skala log-log)",
+                      xaxis_title="n", yaxis_title="Waktu (ms)", xaxis_type="log", yaxis_type="log")
+    st.plotly_chart(fig)
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Kompleksitas Anda (empiris)", yours.label or "?", f"slope {yours.slope:.2f}", delta_color="off")
+    col2.metric("Referensi (empiris)", reference.label or "?", f"slope {reference.slope:.2f}", delta_color="off")
+    col3.metric("Klaim di Penjelasan", PROBLEMS[entry].claimed)
+
+    growth = compare_growth(yours, reference) if len(yours.sizes) >= 3 else None
+    if growth is None:
+        st.warning("⚠️ Terlalu sedikit titik ukur untuk menebak kompleksitas.")
+    elif growth == "slower":
+        st.error("❌ Benar belum tentu cukup: waktu eksekusi Anda tumbuh jauh lebih cepat dari solusi referensi.")
+    elif growth == "unstable":
+        st.warning("⚠️ Pengukuran tidak stabil (server sedang sibuk?); jalankan profil sekali lagi.")
+    else:
+        st.success("✅ Pertumbuhan waktu eksekusi setara dengan solusi referensi.")
+
+def render_problem(problem):
+    """
+    Statement, editor and answer for one catalog entry.
+    """
+    st.subheader(f"📝 Soal {problem.number}: {problem.title}")
+    st.markdown(problem.statement)
+    if problem.info:
+        st.info(problem.info)
+
+    if problem.tests:
+        code = st.text_area("Tulis Solusi Anda:", height=problem.height, key=f"code_{problem.slot}", value=problem.starter)
+        if st.button("Jalankan Kode", key=f"btn_{problem.slot}"):
+            check_solution(code, problem.entry, [dict(t) for t in problem.tests],
+                           compare=problem.compare, adapter=problem.adapter)
+        if problem.entry in PROBLEMS and st.button("📈 Profil Kompleksitas", key=f"prof_{problem.slot}"):
+            profile_solution(code, problem.entry)
 
-    # Problem 2: Climbing Stairs
-    st.subheader("📝 Soal 2: Climbing Stairs (LeetCode #70)")
-    st.markdown("**Deskripsi**: Ada `n` anak tangga. Anda bisa naik 1 atau 2 langkah. Berapa banyak cara unik ke puncak?")
-    
     with st.expander("💡 Lihat Penjelasan & Jawaban"):
-        st.markdown("""
-        **Strategi**: Dynamic Programming (Bottom-Up)
-        -   Cara ke tangga ke-`i` adalah jumlah cara ke tangga `i-1` ditambah cara ke tangga `i-2`.
-        -   Ini identik dengan deret **Fibonacci**.
-        
-        **Jawaban**:
-        ```python
-        def climbStairs(n):
-            one, two = 1, 1
-            for i in range(n - 1):
-                temp = one
-                one = one + two
-                two = temp
-            return one
-        ```
-        """)
+        st.markdown(problem.explanation + "\n\n**Jawaban**:")
+        st.code(reference_source(problem.entry), language="python")
+        st.markdown(problem.complexity_markdown())
+        if problem.notes:
+            st.markdown(problem.notes)
+
+# Only the selected level and problem are built on each rerun
+level_id = st.radio("Level", [l.id for l in CATALOG.levels], format_func=lambda i: CATALOG.level(i).tab,
+                    horizontal=True, label_visibility="collapsed", key="level")
+level = CATALOG.level(level_id)
+st.header(level.header)
+st.markdown(level.intro)
+
+problems = CATALOG.problems_in(level_id)
+slot = st.radio("Pilih Soal", [p.slot for p in problems], horizontal=True, key=f"problem_{level_id}",
+                format_func=lambda s: f"{CATALOG.problem(s).number}. {CATALOG.problem(s).title}")
+st.markdown("---")
+render_problem(CATALOG.problem(slot))
 
-    st.markdown("---")
-    
-    # Problem 3: Merge K Sorted Lists
-    st.subheader("📝 Soal 3: Merge K Sorted Lists (LeetCode #23)")
-    st.markdown("**Deskripsi**: Gabungkan `k` linked-list yang sudah terurut menjadi satu list terurut.")
-    
-    with st.expander("💡 Lihat Penjelasan & Jawaban"):
-        st.markdown("""
-        **Strategi**: Min-Heap (Priority Queue)
-        -   Kita tidak bisa hanya membandingkan semua kepala list sekaligus secara naif ($O(k \cdot N)$).
-        -   Gunakan **Min-Heap** untuk selalu mengambil elemen terkecil dari `k` kepala list saat ini secara efisien ($O(\log k)$).
-        -   Setiap kali elemen diambil dari heap, masukkan elemen berikutnya dari list asal elemen tersebut ke heap.
-        -   **Kompleksitas Waktu**: $O(N \log k)$, jauh lebih cepat daripada brute force.
-        
-        **Jawaban**:
-        ```python
-        # Definition for singly-linked list.
-        # class ListNode:
-        #     def __init__(self, val=0, next=None):
-        #         self.val = val
-        #         self.next = next
-        
-        import heapq
-        
-        def mergeKLists(lists):
-            minHeap = []
-            
-            # Add first node of each list to heap
-            for i, l in enumerate(lists):
-                if l:
-                    minHeap.append((l.val, i, l))
-            heapq.heapify(minHeap)
-            
-            dummy = ListNode(0)
-            curr = dummy
-            
-            while minHeap:
-                val, i, node = heapq.heappop(minHeap)
-                curr.next = node
-                curr = node
-                
-                if node.next:
-                    heapq.heappush(minHeap, (node.next.val, i, node.next))
-                    
-            return dummy.next
-        ```
-        """)
+with st.sidebar:
+    stats = VERDICTS.stats()
+    st.caption(f"⚡ Cache verdict: {stats['hits']} hit / {stats['misses']} miss ({stats['size']} entri, {stats['bytes'] / 1e6:.1f} MB)")
@@ -2,6 +2,17 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 
+from core.antipatterns import LIMITS as ANTIPATTERN_LIMITS, analyze
+from core.catalog import load_catalog
+from core.engines import LIMITS as ENGINE_LIMITS
+from core.fixtures import load_fixtures, materialize, views
+from core.footprint import footprint
+from core.frames import compare_frames
+from core.jobs_ui import show_job, show_queue_stats, submit_script
+from core.parallel import HELPERS
+from core.scale import BUDGET_FLOOR, BUDGET_RATIO, SIZES, limits_for
+from core.verdicts import VERDICTS, suite_fingerprint
+
 st.set_page_config(page_title="Pandas Mastery", page_icon="🐼", layout="wide")
 
 st.markdown("# 🐼 Pandas Mastery")
@@ -21,255 +32,248 @@ with st.sidebar:
     """)
 
 # Helper to compare dataframes
-def check_dataframe(user_df, expected_df):
+def check_dataframe(user_df, expected_df, celebrate=True, success=None):
     try:
-        pd.testing.assert_frame_equal(user_df, expected_df)
-        st.success("✅ Benar! DataFrame sesuai dengan jawaban yang diharapkan.")
-        st.balloons()
-    except AssertionError as e:
-        st.error(f"❌ Belum tepat. Perbedaan: {e}")
+        diff = compare_frames(user_df, expected_df)
+        if diff.equal:
+            st.success(success or "✅ Benar! DataFrame sesuai dengan jawaban yang diharapkan.")
+            if celebrate:
+                st.balloons()
+        else:
+            st.error(f"❌ Belum tepat. Perbedaan: {diff.message}")
+            if diff.rows is not None:
+                st.caption("Baris pertama yang berbeda:")
+                st.dataframe(diff.rows, hide_index=True)
     except Exception as e:
         st.error(f"⚠️ Error Eksekusi: {e}")
 
-tab1, tab2, tab3 = st.tabs(["🟢 Beginner (Pemula)", "🟡 Intermediate (Menengah)", "🔴 Advanced (Mahir)"])
+# Problems, datasets and reference answers live in catalog/pandas.toml
+CATALOG = load_catalog("pandas")
 
-# --- BEGINNER SECTION ---
-with tab1:
-    st.header("🟢 Level Pemula: Filtering & Seleksi")
-    
-    st.markdown("""
-    ### 📚 Materi Singkat
-    Di pandas, menyeleksi data adalah kuncinya. Ada beberapa cara utama:
-    1.  **Seleksi Kolom**: `df['nama_kolom']`
-    2.  **Boolean Indexing** (Filtering): `df[df['umur'] > 25]`
-    3.  **Kombinasi Kondisi**:
-        -   `&` untuk **DAN** (AND)
-        -   `|` untuk **ATAU** (OR)
-        -   Jangan lupa kurung `()`: `df[(df['a'] > 1) & (df['b'] < 5)]`
-    """)
-    
-    st.markdown("---")
-    
-    # Problem 1: Employee Filtering
-    st.subheader("📝 Soal 1: Filter Karyawan")
-    
-    # Sample Data
-    data = {
-        'name': ['Alice', 'Bob', 'Charlie', 'David', 'Eva'],
-        'age': [25, 30, 35, 40, 28],
-        'city': ['New York', 'Los Angeles', 'New York', 'Chicago', 'New York'],
-        'salary': [70000, 80000, 120000, 90000, 110000]
-    }
-    df = pd.DataFrame(data)
-    
-    st.markdown("""
-    **Tugas**:
-    Diberikan dataframe `df`, lakukan filter untuk mendapatkan karyawan yang:
-    1.  Tinggal di **'New York'**
-    2.  **DAN** memiliki gaji (`salary`) lebih besar dari **100,000**.
-    """)
-    
+@st.cache_resource
+def load_problem_data(setup, solution, datasets):
+    """
+    Memory-maps a problem's fixture files and computes the expected `result`; runs only for the problem that is opened.
+    The frames are shared by all sessions, so they are only ever read or handed out as views.
+    """
+    data = load_fixtures(setup, datasets)
+    reference = {'pd': pd, 'np': np, **views(data)}
+    exec(solution, reference)
+    return data, reference['result']
+
+def run_user_code(problem_id, user_code, setup, datasets, suite_version):
+    """
+    Queues user code for sandboxed grading; `show_job` later renders its `result`.
+    The sandbox maps the same fixture files instead of receiving pickled copies of the datasets,
+    and gives the code the multi-core `parallel_apply` / `parallel_groupby_apply` helpers.
+    Identical code is answered from the verdict cache without running again.
+    """
+    submit_script(f"pandas/{problem_id}", user_code, suite_version, env=HELPERS, fixtures=materialize(setup, datasets))
+
+def _bytes(value):
+    return f"{value / 1e6:,.2f} MB" if value >= 100_000 else f"{value / 1e3:,.1f} KB"
+
+def show_footprint(slot, data, result):
+    """
+    memory_usage(deep=True) of the datasets and the result, next to their dtype-optimized versions.
+    The reports (with their groupby/filter timings) are computed once per result, not on every rerun.
+    """
+    cached = st.session_state.get(f"footprint_{slot}")
+    if cached is not None and cached[0] is result:
+        reports = cached[1]
+    else:
+        frames = dict(data)
+        if isinstance(result, (pd.DataFrame, pd.Series)):
+            frames['result'] = result
+        reports = [footprint(frame, name) for name, frame in frames.items()]
+        st.session_state[f"footprint_{slot}"] = (result, reports)
+    with st.expander("🧠 Jejak Memori & Optimasi dtype"):
+        st.caption("Integer diperkecil, float ke float32 bila tanpa kehilangan presisi, string dengan sedikit "
+                   "nilai unik ke `category`, string lain ke `str` berbasis Arrow.")
+        for report in reports:
+            name = report.name
+            speed = "".join(f" · {op}: {before / after:.1f}× kecepatan" for op, (before, after) in report.timings.items()
+                            if after)
+            st.markdown(f"**`{name}`**: {_bytes(report.bytes_before)} → {_bytes(report.bytes_after)} "
+                        f"(hemat {report.saving:.0%}){speed}")
+            st.dataframe(report.to_frame(), hide_index=True)
+
+def render_timings(timings, first):
+    """
+    Measured time of each anti-pattern vs its vectorized form on the scale-mode dataset.
+    """
+    if not timings:
+        return
+    st.dataframe(pd.DataFrame([{
+        "baris kode": t.line,
+        "pola": t.rule,
+        "baris data": t.rows,
+        "lambat (detik)": round(t.slow_seconds, 4),
+        "vektor (detik)": round(t.fast_seconds, 4),
+        "percepatan": f"{t.speedup:,.0f}×" if t.speedup else "-",
+        "diukur pada": t.error or ("contoh pola" if t.templated else "ekspresi Anda"),
+    } for t in timings]), hide_index=True)
+
+def show_antipatterns(problem):
+    """
+    Anti-patterns found in the last submission, with the vectorized alternative and its measured speedup.
+    """
+    findings = st.session_state.get(f"lint_{problem.slot}")
+    if not findings:
+        return
+    st.warning(f"🐢 Ditemukan {len(findings)} pola yang lambat pada data besar:")
+    for finding in findings:
+        st.markdown(f"**Baris {finding.line}** (`{finding.rule}`): {finding.message}")
+        st.code(f"# sebelum\n{finding.code}\n# alternatif\n{finding.suggestion}", language="python")
+    show_job(f"pandas-lint/{problem.slot}", render_timings)
+
+def _mb(value):
+    return f"{value:,.0f} MB" if value is not None else "-"
+
+def render_scale_report(report, first):
+    """
+    Time, speed ratio and peak memory of the candidate vs the reference on the generated datasets.
+    """
+    ref, cand = report.reference, report.candidate
+    if cand is None:
+        st.error(f"❌ Tidak lolos uji skala ({report.n:,} baris): {report.message}")
+        st.caption(f"Referensi: {ref.seconds:.2f} detik, puncak memori {_mb(ref.peak_mb)}.")
+        return
+    ratio = report.ratio
+    speed = f"{ratio:.1f}× lebih lambat" if ratio >= 1 else f"{1 / ratio:.1f}× lebih cepat"
+    col1, col2, col3 = st.columns(3)
+    col1.metric("⏱️ Waktu Anda", f"{cand.seconds:.2f} detik", f"referensi {ref.seconds:.2f} detik", delta_color="off")
+    col2.metric("📈 Dibanding Referensi", speed, f"anggaran {report.budget:.1f} detik", delta_color="off")
+    col3.metric("🧠 Puncak Memori", _mb(cand.peak_mb), f"referensi {_mb(ref.peak_mb)}", delta_color="off")
+    if report.passed:
+        st.success(f"✅ Lolos uji skala ({report.n:,} baris).")
+    elif not report.equal:
+        st.error(f"❌ Hasil pada data besar belum tepat. Perbedaan: {report.message}")
+    else:
+        st.error(f"❌ Hasil benar, tetapi terlalu lambat: {report.message}")
+
+def render_scale(problem, user_code):
+    """
+    Scale mode: grades the same code on datasets regenerated with millions of rows, timed against the reference.
+    """
+    if not st.toggle("🚀 Mode Skala (jutaan baris)", key=f"scale_{problem.slot}"):
+        return
+    n = st.select_slider("Jumlah baris", options=SIZES, key=f"rows_{problem.slot}", format_func=lambda v: f"{v:,}")
+    st.caption(f"Dataset dibuat ulang dengan seed tetap. Lolos jika hasil benar dan waktunya paling lama "
+               f"{BUDGET_RATIO:g}× jawaban referensi (minimal {BUDGET_FLOOR:g} detik).")
+    scale, solution = problem.extra['scale'], problem.extra['solution']
+    if st.button("Uji Skala", key=f"scalebtn_{problem.slot}"):
+        submit_script(f"pandas-scale/{problem.slot}", user_code, suite_fingerprint(scale, solution, n),
+                      kind="scale", limits=limits_for(n), n=n, scale=scale, solution=solution,
+                      datasets=tuple(problem.extra['datasets']))
+    show_job(f"pandas-scale/{problem.slot}", render_scale_report)
+
+def render_engine_report(report, first):
+    """
+    The DuckDB result, its check against the pandas reference and both engines' times.
+    """
+    if report.result is None:
+        st.error(f"❌ Query gagal: {report.message}")
+        return
+    st.write("Hasil DuckDB:")
+    st.dataframe(report.result)
+    if report.equal:
+        st.success("✅ Benar! Hasil DuckDB sama dengan jawaban pandas.")
+    else:
+        st.error(f"❌ Belum tepat. Perbedaan: {report.message}")
     col1, col2 = st.columns(2)
-    with col1:
-        st.write("Current DataFrame:")
-        st.dataframe(df)
-    
-    user_code = st.text_area("Tulis kode Anda (hasilkan variabel `result`):", value="result = df[...]", height=100)
-    
-    if st.button("Jalankan Kode", key="pd_beg_1"):
-        try:
-            # Safe exec env
-            local_vars = {'df': df.copy(), 'pd': pd}
-            exec(user_code, {}, local_vars)
-            result = local_vars.get('result')
-            
-            # Expected
-            expected = df[(df['city'] == 'New York') & (df['salary'] > 100000)]
-            
-            if result is not None:
-                st.write("Hasil Anda:")
-                st.dataframe(result)
-                check_dataframe(result, expected)
-            else:
-                st.error("Variabel 'result' tidak ditemukan. Pastikan Anda menugaskan hasil ke `result`.")
-        except Exception as e:
-            st.error(f"Execution Error: {e}")
+    col1.metric("🦆 DuckDB", f"{report.sql_seconds * 1e3:,.1f} ms")
+    col2.metric("🐼 pandas (referensi)", f"{report.pandas_seconds * 1e3:,.1f} ms",
+                f"DuckDB {report.speedup:.1f}× " + ("lebih cepat" if report.speedup >= 1 else "lebih lambat")
+                if report.speedup else None, delta_color="off")
+
+def render_engine(problem, setup, solution):
+    """
+    Engine switch: the same challenge as a DuckDB query over the fixture files, checked against the pandas reference.
+    """
+    if not st.toggle("🦆 Mesin DuckDB (SQL)", key=f"engine_{problem.slot}"):
+        return
+    names = ", ".join(f"`{name}`" for name in problem.extra['datasets'])
+    st.caption(f"Dataset {names} terdaftar sebagai tabel DuckDB langsung dari file Arrow (tanpa salinan). "
+               "Perbandingan waktu pada data besar: `python -m core.engines`.")
+    datasets = tuple(problem.extra['datasets'])
+    sql = st.text_area("Query SQL Anda:", value=f"SELECT * FROM {datasets[0]}", height=120, key=f"sql_{problem.slot}")
+    if st.button("Jalankan di DuckDB", key=f"sqlbtn_{problem.slot}"):
+        submit_script(f"pandas-duckdb/{problem.slot}", sql, suite_fingerprint(setup, solution, problem.extra.get('sql_index')),
+                      kind="duckdb", limits=ENGINE_LIMITS, fixtures=materialize(setup, datasets), solution=solution,
+                      sql_index=problem.extra.get('sql_index'))
+    show_job(f"pandas-duckdb/{problem.slot}", render_engine_report)
+
+def render_problem(problem):
+    """
+    Statement, datasets, editor and answer for one catalog entry.
+    """
+    setup, solution = problem.extra['setup'], problem.extra['solution']
+    data, expected = load_problem_data(setup, solution, tuple(problem.extra['datasets']))
+
+    st.subheader(f"📝 Soal {problem.number}: {problem.title}")
+    st.markdown(problem.statement)
+    if problem.info:
+        st.info(problem.info)
+    for name, frame in data.items():
+        st.write(f"`{name}`:")
+        st.dataframe(frame)
+
+    user_code = st.text_area("Solusi Anda (hasilkan variabel `result`):", value=problem.starter,
+                             height=problem.height, key=f"code_{problem.slot}")
+    st.caption("`apply` kustom hanya memakai satu core. Di sandbox tersedia `parallel_apply(df, func)` "
+               "(= `df.apply(func, axis=1)`) dan `parallel_groupby_apply(df, by, func)` "
+               "(= `df.groupby(by).apply(func)`) yang membaginya ke semua core.")
+    if st.button("Jalankan Kode", key=f"btn_{problem.slot}"):
+        # Cached results are keyed on the datasets too, so editing the catalog invalidates them
+        run_user_code(problem.slot, user_code, setup, tuple(problem.extra['datasets']), suite_fingerprint(setup, solution))
+        # Static pass before execution; the alternatives are timed in the sandbox on the scale data
+        findings = analyze(user_code)
+        st.session_state[f"lint_{problem.slot}"] = findings
+        if findings and problem.extra.get('scale'):
+            submit_script(f"pandas-lint/{problem.slot}", user_code, suite_fingerprint(problem.extra['scale']),
+                          kind="antipatterns", limits=ANTIPATTERN_LIMITS, scale=problem.extra['scale'],
+                          datasets=tuple(problem.extra['datasets']), findings=findings)
+
+    def render(result, first):
+        if result is None:
+            st.error("Variabel 'result' tidak ditemukan. Pastikan Anda menugaskan hasil ke `result`.")
+            return
+        st.write("Hasil Anda:")
+        st.dataframe(result)
+        check_dataframe(result, expected, celebrate=first, success=problem.extra.get('success'))
+        show_footprint(problem.slot, data, result)
+
+    show_job(f"pandas/{problem.slot}", render)
+    show_antipatterns(problem)
+    if problem.extra.get('scale'):
+        render_scale(problem, user_code)
+    if problem.extra.get('sql'):
+        render_engine(problem, setup, solution)
 
     with st.expander("💡 Lihat Penjelasan & Jawaban"):
-        st.markdown("""
-        **Jawaban**:
-        ```python
-        result = df[(df['city'] == 'New York') & (df['salary'] > 100000)]
-        ```
-        **Penjelasan**:
-        -   Kita menggunakan dua kondisi.
-        -   Kondisi 1: `df['city'] == 'New York'` mengecek kota.
-        -   Kondisi 2: `df['salary'] > 100000` mengecek gaji.
-        -   Operator `&` menggabungkan keduanya (harus benar dua-duanya).
-        -   Tanda kurung `()` **wajib** ada di setiap kondisi agar urutan operasinya benar.
-        """)
+        st.markdown("**Jawaban**:")
+        st.code(solution, language="python")
+        if problem.extra.get('sql'):
+            st.code(problem.extra['sql'].strip(), language="sql")
+        st.markdown(problem.explanation)
+        if problem.notes:
+            st.markdown(problem.notes)
 
-    st.markdown("---")
-    
-    # Problem 2: Handling Missing Values
-    st.subheader("📝 Soal 2: Menangani Data Kosong (Null)")
-    
-    data_missing = {
-        'product': ['A', 'B', 'C', 'D'],
-        'price': [100, np.nan, 150, 200],
-        'stock': [10, 5, np.nan, 20]
-    }
-    df_missing = pd.DataFrame(data_missing)
-    
-    st.markdown("""
-    **Tugas**:
-    -   Isi nilai kosong pada kolom `substitute` (misal harga) dengan **0**.
-    """)
-    st.info("Catatan: Dalam soal ini, variabel `df_missing` tersedia. Simpan haslnya ke `result`.")
-    st.dataframe(df_missing)
-    
-    user_code_2 = st.text_area("Solusi Anda:", value="result = df_missing.fillna(...)", height=100, key="code_beg_2")
-    
-    if st.button("Jalankan Kode", key="btn_beg_2"):
-        expected_2 = df_missing.fillna(0)
-        try:
-            local_vars = {'df_missing': df_missing.copy(), 'pd': pd, 'np': np}
-            exec(user_code_2, {}, local_vars)
-            result_2 = local_vars.get('result')
-            if result_2 is not None:
-                st.write("Hasil:")
-                st.dataframe(result_2)
-                check_dataframe(result_2, expected_2)
-            else: 
-                st.error("Variable 'result' not found.")
-        except Exception as e:
-            st.error(str(e))
-            
-    with st.expander("💡 Lihat Penjelasan"):
-        st.markdown("""
-        **Jawaban**:
-        ```python
-        result = df_missing.fillna(0)
-        ```
-        **Penjelasan**:
-        -   Fungsi `.fillna(nilai)` digunakan untuk mengganti `NaN` (Not a Number) dengan nilai tertentu.
-        -   Ini sangat penting dalam data cleaning sebelum masuk ke model machine learning.
-        """)
+# Only the selected level and problem are built on each rerun
+level_id = st.radio("Level", [l.id for l in CATALOG.levels], format_func=lambda i: CATALOG.level(i).tab,
+                    horizontal=True, label_visibility="collapsed", key="level")
+level = CATALOG.level(level_id)
+st.header(level.header)
+st.markdown(level.intro)
 
-# --- INTERMEDIATE SECTION ---
-with tab2:
-    st.header("🟡 Level Menengah: GroupBy & Aggregasi")
-    
-    st.markdown("""
-    ### 📚 Materi Singkat
-    Teknik **Split-Apply-Combine** sangat powerful:
-    1.  **Split**: Memecah data berdasarkan grup (misal: per departemen).
-    2.  **Apply**: Menerapkan fungsi (sum, mean, count) ke setiap grup.
-    3.  **Combine**: Menyatukan kembali hasilnya.
-    
-    Sintaks dasar: `df.groupby('kolom_grup')['kolom_target'].agg(['mean', 'sum'])`
-    """)
-    
-    # Soal Intermediat
-    dates = pd.date_range('20230101', periods=6)
-    df2 = pd.DataFrame({
-        'Date': dates,
-        'Category': ['Elektronik', 'Pakaian', 'Elektronik', 'Pakaian', 'Elektronik', 'Makanan'],
-        'Sales': [1000, 500, 1200, 600, 1100, 300],
-        'Profit': [200, 50, 300, 100, 250, 30]
-    })
-    
-    st.subheader("📝 Soal: Analisis Kategori")
-    st.dataframe(df2)
-    st.markdown("**Tugas**: Hitung **rata-rata (mean)** dari kolom `Sales` untuk setiap `Category`. Simpan hasil (Series) ke variabel `result`.")
-    
-    user_code_int = st.text_area("Solusi Anda:", value="result = df2...", key="code_int")
-    
-    if st.button("Jalankan Kode", key="btn_int"):
-        expected_int = df2.groupby('Category')['Sales'].mean()
-        try:
-             local_vars = {'df2': df2.copy(), 'pd': pd}
-             exec(user_code_int, {}, local_vars)
-             result_int = local_vars.get('result')
-             if result_int is not None:
-                 st.write("Hasil:")
-                 st.dataframe(result_int)
-                 # Series check
-                 try:
-                     pd.testing.assert_series_equal(result_int, expected_int)
-                     st.success("✅ Benar!")
-                     st.balloons()
-                 except:
-                     st.error("❌ Hasil tidak sesuai.")
-        except Exception as e:
-            st.error(str(e))
-            
-    with st.expander("💡 Lihat Penjelasan"):
-         st.markdown("""
-         **Jawaban**:
-         ```python
-         result = df2.groupby('Category')['Sales'].mean()
-         ```
-         **Penjelasan**:
-         -   `df2.groupby('Category')`: Mengelompokkan baris berdasarkan nilai unik di kolom Category.
-         -   `['Sales']`: Kita hanya tertarik pada kolom Sales untuk dihitung.
-         -   `.mean()`: Fungsi agregasi rata-rata.
-         """)
+problems = CATALOG.problems_in(level_id)
+slot = st.radio("Pilih Soal", [p.slot for p in problems], horizontal=True, key=f"problem_{level_id}",
+                format_func=lambda s: f"{CATALOG.problem(s).number}. {CATALOG.problem(s).title}")
+st.markdown("---")
+render_problem(CATALOG.problem(slot))
 
-# --- ADVANCED SECTION ---
-with tab3:
-    st.header("🔴 Level Mahir: Window Functions & Apply")
-    
-    st.markdown("""
-    ### 📚 Materi Singkat
-    Untuk interview Big Tech, Anda harus menguasai:
-    1.  **Rolling Windows**: Menghitung moving average (misal: rata-rata 3 hari terakhir).
-        -   Syntax: `df.rolling(window=3).mean()`
-    2.  **Apply**: Menerapkan fungsi custom yang kompleks ke baris/kolom.
-        -   Syntax: `df.apply(lambda row: ..., axis=1)`
-    """)
-    
-    st.subheader("📝 Soal: 3-Day Rolling Average")
-    
-    df3 = pd.DataFrame({
-        'Date': pd.date_range('2023-01-01', periods=5),
-        'Price': [100, 110, 120, 130, 140]
-    })
-    st.dataframe(df3)
-    
-    st.markdown("""
-    **Tugas**:
-    Buat kolom baru atau Series yang berisi **Rata-rata Bergerak 3 Hari (3-Day Rolling Mean)** dari kolom `Price`.
-    Pastikan data terurut berdasarkan Tanggal (sudah terurut di sini). Simpan hasil ke `result`.
-    """)
-    
-    user_code_adv = st.text_area("Solusi Anda:", value="result = ...", key="code_adv")
-    
-    if st.button("Jalankan Kode", key="btn_adv"):
-        expected_adv = df3['Price'].rolling(window=3).mean()
-        try:
-             local_vars = {'df3': df3.copy(), 'pd': pd}
-             exec(user_code_adv, {}, local_vars)
-             result_adv = local_vars.get('result')
-             if result_adv is not None:
-                 st.write("Hasil:")
-                 st.dataframe(result_adv)
-                 pd.testing.assert_series_equal(result_adv, expected_adv)
-                 st.success("✅ Luar Biasa! Pemahaman window function Anda bagus.")
-                 st.balloons()
-             else:
-                st.error("Variable 'result' not found.")
-        except Exception as e:
-             st.error(str(e))
-             
-    with st.expander("💡 Lihat Penjelasan"):
-        st.markdown("""
-        **Jawaban**:
-        ```python
-        result = df3['Price'].rolling(window=3).mean()
-        ```
-        **Penjelasan**:
-        -   `rolling(window=3)`: Membuat jendela selebar 3 baris (hari ini + 2 hari sebelumnya).
-        -   `.mean()`: Menghitung rata-rata dalam jendela tersebut.
-        -   Dua nilai pertama akan `NaN` karena belum cukup data (butuh 3 data).
-        """)
+with st.sidebar:
+    stats = VERDICTS.stats()
+    st.caption(f"⚡ Cache verdict: {stats['hits']} hit / {stats['misses']} miss ({stats['size']} entri, {stats['bytes'] / 1e6:.1f} MB)")
+    show_queue_stats()
@@ -1,6 +1,14 @@
 import streamlit as st
-import duckdb
 import pandas as pd
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from core.catalog import load_catalog
+from core.sqlcache import ResultCache
+from core.sqlgrade import grade, single_select
+from core.sqlgen import SALES_PER_SF, available
+from core.sqlpool import ConnectionPool
+from core.sqlprofile import profile
+from core.sqlstream import PREVIEW_ROWS, check, deadline, execute
 
 st.set_page_config(page_title="SQL Integration", page_icon="💾", layout="wide")
 
@@ -20,19 +28,53 @@ with st.sidebar:
     - [Advanced SQL Window Functions](https://www.youtube.com/watch?v=Ww71knvhQ-s)
     """)
 
-# Setup Sandbox Database
+# Each browser session gets its own DuckDB instance over a read-only copy of the tables, with its
+# own memory and thread budget; one pool per dataset file, shared by every session that picked that scale
+SESSION_MEMORY = "512MB"
+SESSION_THREADS = 2
+
 @st.cache_resource
-def get_connection():
-    con = duckdb.connect(database=':memory:')
-    # Create sample tables
-    con.execute("CREATE TABLE employees (id INTEGER, name VARCHAR, department VARCHAR, salary INTEGER)")
-    con.execute("INSERT INTO employees VALUES (1, 'Alice', 'HR', 60000), (2, 'Bob', 'Engineering', 120000), (3, 'Charlie', 'Engineering', 130000), (4, 'David', 'HR', 65000), (5, 'Eve', 'Marketing', 90000), (6, 'Frank', 'Marketing', 85000)")
-    
-    con.execute("CREATE TABLE sales (id INTEGER, employee_id INTEGER, amount INTEGER, date DATE)")
-    con.execute("INSERT INTO sales VALUES (1, 2, 500, '2023-01-01'), (2, 2, 700, '2023-01-02'), (3, 3, 200, '2023-01-01'), (4, 5, 1000, '2023-01-05'), (5, 5, 500, '2023-01-06')")
-    return con
+def get_pool(path):
+    return ConnectionPool(path, threads=SESSION_THREADS, memory_limit=SESSION_MEMORY)
+
+# Larger datasets are generated ahead of time with `python -m core.sqlgen --sf 10`
+DATASETS = available()
+sf = st.sidebar.selectbox("📏 Skala Data", list(DATASETS), key="scale",
+                          format_func=lambda s: "Contoh (6 karyawan)" if s == 0
+                          else f"SF {s:g} (~{s * SALES_PER_SF:,.0f} penjualan)")
+POOL = get_pool(DATASETS[sf])
+
+# Repeated SELECTs are answered from memory, across sessions; with per-session instances a
+# session's DDL/DML only drops its own results, since it cannot change what the others read
+@st.cache_resource
+def get_cache(isolated):
+    return ResultCache(isolated=isolated)
 
-con = get_connection()
+def session_id():
+    return get_script_run_ctx().session_id
+
+def run_query(query, reference, profiled):
+    """
+    Grades `query` (and profiles it next to `reference`), then opens its result as a stream holding the
+    first rows, all on this session's own connection and each under the query timeout. The stream
+    comes last: anything else run on the connection afterwards would end it.
+    """
+    check(query)
+    with POOL.lease(session_id()) as con:
+        with deadline(con):
+            verdict = grade(con, query, reference)
+        profiles = None
+        if profiled and verdict.stage != "statement":
+            with deadline(con):
+                profiles = [profile(con, single_select(q)) for q in (query, reference)]
+        stream = execute(con, query, get_cache(POOL.isolated), DATASETS[sf])
+    return stream, verdict, profiles
+
+def load_more(stream):
+    if stream.cached:
+        return stream.fetch()
+    with POOL.lease(session_id()) as con:
+        return stream.fetch(con)
 
 # Sidebar Schema
 st.sidebar.markdown("### 🗄️ Skema Database")
@@ -42,166 +84,130 @@ st.sidebar.markdown("---")
 st.sidebar.markdown("**Tabel `sales`**")
 st.sidebar.text("- id (INT)\n- employee_id (INT)\n- amount (INT)\n- date (DATE)")
 
-tab1, tab2, tab3 = st.tabs(["🟢 Basic Selects", "🟡 Joins & Aggregates", "🔴 Advanced Window Functions"])
+# Problems and reference queries live in catalog/sql.toml
+CATALOG = load_catalog("sql")
 
-# --- BEGINNER ---
-with tab1:
-    st.header("🟢 Level Pemula: Select & Filtering")
-    
-    st.markdown("""
-    ### 📚 Materi Singkat
-    Perintah dasar SQL meliputi:
-    1.  `SELECT`: Memilih kolom.
-    2.  `FROM`: Memilih tabel.
-    3.  `WHERE`: Memfilter baris berdasarkan kondisi.
-    4.  `ORDER BY`: Mengurutkan hasil.
-    """)
-    
-    st.subheader("📝 Soal: Gaji Tinggi di Engineering")
-    st.markdown("""
-    **Tugas**:
-    Tampilkan semua data karyawan yang bekerja di departemen **'Engineering'** DAN memiliki gaji diatas **125,000**.
-    """)
-    
-    query_beg = st.text_area("Tulis Query SQL Anda:", "SELECT * FROM employees WHERE ...", key="sql_beg")
-    
-    if st.button("Jalankan Query", key="btn_beg"):
-        try:
-            result = con.execute(query_beg).df()
-            st.write("Hasil Query:")
-            st.dataframe(result)
-            
-            # Simple validation idea: check consistency
-            if len(result) == 1 and result.iloc[0]['name'] == 'Charlie':
-                st.success("✅ Benar! Hanya Charlie yang memenuhi kriteria.")
-                st.balloons()
-            else:
-                st.warning("⚠️ Hasil belum tepat. Coba cek kondisi WHERE Anda.")
-        except Exception as e:
-            st.error(f"SQL Error: {e}")
-            
-    with st.expander("💡 Lihat Penjelasan & Jawaban"):
-        st.markdown("""
-        **Jawaban**:
-        ```sql
-        SELECT * 
-        FROM employees 
-        WHERE department = 'Engineering' 
-          AND salary > 125000;
-        ```
-        **Penjelasan**:
-        -   `department = 'Engineering'`: Memilih hanya anak teknik.
-        -   `AND`: Kedua syarat harus terpenuhi.
-        -   `salary > 125000`: Batas gaji.
-        """)
-        
-# --- INTERMEDIATE ---
-with tab2:
-    st.header("🟡 Level Menengah: Joins & Aggregates")
-    
-    st.markdown("""
-    ### 📚 Materi Singkat
-    1.  **JOIN**: Menggabungkan dua tabel berdasarkan kolom kunci (Key).
-        -   `INNER JOIN`: Hanya baris yang cocok di kedua tabel.
-        -   `LEFT JOIN`: Semua baris dari tabel kiri, dan yang cocok dari kanan.
-    2.  **GROUP BY**: Mengelompokkan data untuk fungsi agregasi (`SUM`, `COUNT`, `AVG`).
-    """)
-    
-    st.subheader("📝 Soal: Total Penjualan per Karyawan")
-    st.markdown("""
-    **Tugas**:
-    Hitung **total penjualan** (`SUM(amount)`) untuk setiap karyawan yang memiliki penjualan. Tampilkan nama karyawan dan total penjualannya.
-    """)
-    
-    query_int = st.text_area("Tulis Query SQL Anda:", """
-SELECT e.name, ...
-FROM employees e
-JOIN sales s ON ...
-...
-    """, key="sql_int", height=150)
-    
-    if st.button("Jalankan Query", key="btn_int"):
+def show_verdict(verdict, first, success=None):
+    """
+    Outcome of the result-set comparison with the reference query, with samples of the differing rows.
+    """
+    if verdict.equal:
+        st.success(success or "✅ Benar! Hasil query sama dengan jawaban.")
+        if first:
+            st.balloons()
+        return
+    st.error(f"❌ Belum tepat. {verdict.message}")
+    if verdict.missing_rows is not None:
+        st.caption("Contoh baris jawaban yang tidak ada di hasil Anda:")
+        st.dataframe(verdict.missing_rows, hide_index=True)
+    if verdict.extra_rows is not None:
+        st.caption("Contoh baris hasil Anda yang tidak ada di jawaban:")
+        st.dataframe(verdict.extra_rows, hide_index=True)
+
+def _bytes(value):
+    return f"{value / 1e6:,.1f} MB" if value >= 100_000 else f"{value / 1e3:,.1f} KB"
+
+def show_profile(column, title, prof):
+    """
+    Totals and the operator tree (own time, cardinality vs estimate, bytes out) of one profiled query.
+    """
+    with column:
+        st.markdown(f"**{title}**")
+        col1, col2, col3 = st.columns(3)
+        col1.metric("⏱️ Waktu", f"{prof.seconds * 1e3:,.2f} ms")
+        col2.metric("📄 Baris", f"{prof.rows:,}")
+        col3.metric("🧠 Puncak Memori", _bytes(prof.peak_memory))
+        if prof.hottest is not None:
+            st.caption(f"Operator terberat: `{prof.hottest.name}` ({prof.hottest.seconds * 1e3:,.2f} ms)")
+        st.dataframe(prof.to_frame(), hide_index=True)
+
+def show_profiles(mine, ref):
+    """
+    EXPLAIN ANALYZE of the candidate's query next to the reference query's, on the same data.
+    """
+    st.markdown("#### 🔬 Profil Eksekusi (EXPLAIN ANALYZE)")
+    if ref.seconds and mine.seconds > 2 * ref.seconds:
+        st.warning(f"Query Anda {mine.seconds / ref.seconds:.1f}× lebih lambat dari referensi; "
+                   "bandingkan operator terberat dan jumlah barisnya.")
+    left, right = st.columns(2)
+    show_profile(left, "Query Anda", mine)
+    show_profile(right, "Query Referensi", ref)
+
+def show_run(run, problem):
+    """
+    Preview of the latest result (more rows on demand), its verdict and, if asked for, the profiles.
+    """
+    stream = run["stream"]
+    if st.session_state.get(f"more_{problem.slot}"):  # "load more" was clicked in the previous run
         try:
-            result = con.execute(query_int).df()
-            st.write("Hasil Query:")
-            st.dataframe(result)
-            
-            if 'total_sales' in result.columns or 'sum(amount)' in [c.lower() for c in result.columns]:
-                st.success("✅ Query berhasil dijalankan.")
-            else:
-                st.warning("Pastikan Anda menghitung jumlah penjualan.")
+            load_more(stream)
         except Exception as e:
-             st.error(f"SQL Error: {e}")
+            st.warning(f"Tidak bisa memuat baris berikutnya ({e}); jalankan ulang query.")
+    st.write("Hasil Query:" + (" ⚡ _(dari cache)_" if stream.cached else ""))
+    st.dataframe(stream.frame())
+    if stream.done:
+        st.caption(f"{stream.rows:,} baris.")
+    else:
+        st.caption(f"Menampilkan {stream.rows:,} baris pertama.")
+    if stream.more:
+        st.button(f"⬇️ Muat {PREVIEW_ROWS:,} baris berikutnya", key=f"more_{problem.slot}")
+    # The catalog's success text describes the sample rows
+    show_verdict(run["verdict"], first=run["first"], success=problem.extra.get('success') if run["sf"] == 0 else None)
+    run["first"] = False
+    if run["profiles"]:
+        show_profiles(*run["profiles"])
 
-    with st.expander("💡 Lihat Penjelasan & Jawaban"):
-        st.markdown("""
-        **Jawaban**:
-        ```sql
-        SELECT 
-            e.name, 
-            SUM(s.amount) as total_sales
-        FROM employees e
-        JOIN sales s ON e.id = s.employee_id
-        GROUP BY e.name;
-        ```
-        **Penjelasan**:
-        -   `JOIN`: Menghubungkan karyawan dengan penjualan mereka lewat `e.id = s.employee_id`.
-        -   `GROUP BY e.name`: Wajib dilakukan karena kita menggunakan fungsi agregasi `SUM()`. Kita ingin satu baris per nama.
-        """)
-
-# --- ADVANCED ---
-with tab3:
-    st.header("🔴 Level Mahir: Window Functions")
-    
-    st.markdown("""
-    ### 📚 Materi Singkat
-    **Window Functions** melakukan perhitungan pada sekumpulan baris yang terkait dengan baris saat ini.
-    -   Sintaks: `FUNGSI() OVER (PARTITION BY ... ORDER BY ...)`
-    -   `RANK()`: Ranking dengan loncat (1, 2, 2, 4).
-    -   `DENSE_RANK()`: Ranking tanpa loncat (1, 2, 2, 3).
-    -   `ROW_NUMBER()`: Nomor unik baris (1, 2, 3, 4).
-    """)
-    
-    st.subheader("📝 Soal: Ranking Gaji per Departemen")
-    st.markdown("""
-    **Tugas**:
-    Berikan ranking gaji untuk setiap karyawan **di dalam departemennya masing-masing**. Gaji tertinggi dapat ranking 1.
-    Gunakan `DENSE_RANK()`.
-    """)
-    
-    query_adv = st.text_area("Tulis Query SQL Anda:", """
-SELECT 
-    name, 
-    department, 
-    salary,
-    ... OVER (...) as raking_gaji
-FROM employees
-    """, key="sql_adv", height=150)
-    
-    if st.button("Jalankan Query", key="btn_adv"):
+def render_problem(problem):
+    """
+    Statement, editor, graded result and answer for one catalog entry.
+    """
+    st.subheader(f"📝 Soal: {problem.title}")
+    st.markdown(problem.statement)
+    if problem.info:
+        st.info(problem.info)
+
+    query = st.text_area("Tulis Query SQL Anda:", value=problem.starter, height=problem.height,
+                         key=f"sql_{problem.slot}")
+    profiled = st.toggle("🔬 Tampilkan profil eksekusi (EXPLAIN ANALYZE)", key=f"prof_{problem.slot}")
+    if st.button("Jalankan Query", key=f"btn_{problem.slot}"):
+        # Only the latest run of the session is kept: its stream is the one still open on the connection
+        st.session_state.pop("sql_run", None)
         try:
-            result = con.execute(query_adv).df()
-            st.write("Hasil Query:")
-            st.dataframe(result)
+            # Compared in DuckDB: neither result set is pulled into pandas for grading
+            stream, verdict, profiles = run_query(query, problem.extra['solution'], profiled)
+            st.session_state["sql_run"] = dict(slot=problem.slot, sf=sf, stream=stream, verdict=verdict,
+                                               profiles=profiles, first=True)
         except Exception as e:
             st.error(f"SQL Error: {e}")
-            
+
+    run = st.session_state.get("sql_run")
+    if run and run["slot"] == problem.slot and run["sf"] == sf:
+        show_run(run, problem)
+
     with st.expander("💡 Lihat Penjelasan & Jawaban"):
-        st.markdown("""
-        **Jawaban**:
-        ```sql
-        SELECT 
-            name, 
-            department, 
-            salary,
-            DENSE_RANK() OVER (
-                PARTITION BY department 
-                ORDER BY salary DESC
-            ) as ranking_gaji
-        FROM employees;
-        ```
-        **Penjelasan**:
-        -   `PARTITION BY department`: Ranking direset untuk setiap departemen (HR sendiri, Engineering sendiri).
-        -   `ORDER BY salary DESC`: Gaji tertinggi di atas (Rank 1).
-        -   `DENSE_RANK()`: Jika ada gaji sama, rankingnya sama, dan ranking berikutnya tidak loncat angka.
-        """)
+        st.markdown("**Jawaban**:")
+        st.code(problem.extra['solution'].strip(), language="sql")
+        st.markdown(problem.explanation)
+        if problem.notes:
+            st.markdown(problem.notes)
+
+level_id = st.radio("Level", [l.id for l in CATALOG.levels], format_func=lambda i: CATALOG.level(i).tab,
+                    horizontal=True, label_visibility="collapsed", key="level")
+level = CATALOG.level(level_id)
+st.header(level.header)
+st.markdown(level.intro)
+
+problems = CATALOG.problems_in(level_id)
+if len(problems) > 1:
+    slot = st.radio("Pilih Soal", [p.slot for p in problems], horizontal=True, key=f"problem_{level_id}",
+                    format_func=lambda s: f"{CATALOG.problem(s).number}. {CATALOG.problem(s).title}")
+else:
+    slot = problems[0].slot
+render_problem(CATALOG.problem(slot))
+
+with st.sidebar:
+    stats = POOL.stats()
+    st.caption(f"🔌 Koneksi DuckDB: {stats['open']}/{stats['max']} terbuka, {stats['busy']} sedang menjalankan query")
+    cache = get_cache(POOL.isolated).stats()
+    st.caption(f"⚡ Cache hasil: {cache['hit_rate']:.0%} hit ({cache['hits']}/{cache['hits'] + cache['misses']}), "
+               f"hemat {cache['saved_seconds']:,.2f} s, {_bytes(cache['bytes'])} / {_bytes(cache['max_bytes'])}")
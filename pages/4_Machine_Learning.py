@@ -6,6 +6,9 @@ from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 # Note: In a real app we might import metrics to check answers, but we implement from scratch here.
 
+from core.jobs_ui import show_job, show_queue_stats, submit_script
+from core.verdicts import VERDICTS
+
 st.set_page_config(page_title="Machine Learning Eng", page_icon="🤖", layout="wide")
 
 st.markdown("# 🤖 Machine Learning Engineering")
@@ -28,6 +31,9 @@ with st.sidebar:
     - [Sklearn Pipelines Guide](https://scikit-learn.org/stable/modules/compose.html)
     """)
 
+# Bump when a dataset or an expected answer below changes
+SUITE_VERSION = 1
+
 tab1, tab2, tab3 = st.tabs(["🟢 Custom Transformers", "🟡 Pipelines (Intermediate)", "🔴 Metrics from Scratch"])
 
 # --- BEGINNER: CUSTOM TRANSFORMERS ---
@@ -72,33 +78,23 @@ with tab1:
 """)
     
     if st.button("Jalankan Kode", key="btn_beg"):
-        try:
-             # Prepare context
-             local_vars = {
-                 'BaseEstimator': BaseEstimator, 
-                 'TransformerMixin': TransformerMixin, 
-                 'pd': pd, 
-                 'np': np,
-                 'X': df.copy()
-             }
-             exec(code_beg, {}, local_vars)
-             
-             # Instantiate and run
-             OutlierRemover = local_vars['OutlierRemover']
-             remover = OutlierRemover(factor=3)
-             X_filtered = remover.fit_transform(df)
-             
-             st.write("Hasil Transformasi:")
-             st.dataframe(X_filtered)
-             
-             if len(X_filtered) < len(df) and 100 not in X_filtered['A'].values:
-                 st.success("✅ Sukses! Outlier 100 berhasil dihapus.")
-                 st.balloons()
-             else:
-                 st.warning("⚠️ Outlier belum terhapus atau logika masih kurang tepat.")
-                 
-        except Exception as e:
-            st.error(f"Error: {e}")
+        # Runs in the grading sandbox: instantiate and run on a copy of the data
+        submit_script("ml/outlier_remover", code_beg, SUITE_VERSION,
+                      env={'BaseEstimator': BaseEstimator, 'TransformerMixin': TransformerMixin, 'X': df},
+                      then="OutlierRemover(factor=3).fit_transform(X.copy())")
+
+    def render_outlier_remover(X_filtered, first):
+        st.write("Hasil Transformasi:")
+        st.dataframe(X_filtered)
+        
+        if len(X_filtered) < len(df) and 100 not in X_filtered['A'].values:
+            st.success("✅ Sukses! Outlier 100 berhasil dihapus.")
+            if first:
+                st.balloons()
+        else:
+            st.warning("⚠️ Outlier belum terhapus atau logika masih kurang tepat.")
+
+    show_job("ml/outlier_remover", render_outlier_remover)
 
     with st.expander("💡 Lihat Penjelasan & Jawaban"):
         st.markdown("""
@@ -205,31 +201,30 @@ with tab3:
 """)
     
     if st.button("Jalankan Kode", key="btn_adv"):
-        try:
-             local_vars = {'np': np}
-             exec(code_adv, {}, local_vars)
-             calc_f1 = local_vars.get('calculate_f1')
-             
-             if calc_f1:
-                 user_f1 = calc_f1(y_true, y_pred)
-                 # Expected
-                 tp = np.sum((y_true == 1) & (y_pred == 1))
-                 fp = np.sum((y_true == 0) & (y_pred == 1))
-                 fn = np.sum((y_true == 1) & (y_pred == 0))
-                 precision = tp / (tp + fp)
-                 recall = tp / (tp + fn)
-                 expected_f1 = 2 * (precision * recall) / (precision + recall)
-                 
-                 st.write(f"F1 Score Anda: {user_f1:.4f}")
-                 st.write(f"F1 Score Target: {expected_f1:.4f}")
-                 
-                 if np.isclose(user_f1, expected_f1):
-                     st.success("✅ Sempurna! Implementasi F1 Score Anda benar.")
-                     st.balloons()
-                 else:
-                     st.error("❌ Hasil belum tepat.")
-        except Exception as e:
-            st.error(f"Error: {e}")
+        submit_script("ml/f1", code_adv, SUITE_VERSION, env={'y_true': y_true, 'y_pred': y_pred},
+                      then="calculate_f1(y_true.copy(), y_pred.copy()) if 'calculate_f1' in globals() else None")
+
+    def render_f1(user_f1, first):
+        if user_f1 is not None:
+            # Expected
+            tp = np.sum((y_true == 1) & (y_pred == 1))
+            fp = np.sum((y_true == 0) & (y_pred == 1))
+            fn = np.sum((y_true == 1) & (y_pred == 0))
+            precision = tp / (tp + fp)
+            recall = tp / (tp + fn)
+            expected_f1 = 2 * (precision * recall) / (precision + recall)
+            
+            st.write(f"F1 Score Anda: {user_f1:.4f}")
+            st.write(f"F1 Score Target: {expected_f1:.4f}")
+            
+            if np.isclose(user_f1, expected_f1):
+                st.success("✅ Sempurna! Implementasi F1 Score Anda benar.")
+                if first:
+                    st.balloons()
+            else:
+                st.error("❌ Hasil belum tepat.")
+
+    show_job("ml/f1", render_f1)
             
     with st.expander("💡 Lihat Penjelasan & Jawaban"):
         st.markdown("""
@@ -257,3 +252,8 @@ with tab3:
             return f1
         ```
         """)
+
+with st.sidebar:
+    stats = VERDICTS.stats()
+    st.caption(f"⚡ Cache verdict: {stats['hits']} hit / {stats['misses']} miss ({stats['size']} entri, {stats['bytes'] / 1e6:.1f} MB)")
+    show_queue_stats()
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from core.footprint import footprint, optimize, optimize_column
+
+
+def test_narrow_unsigned_column_is_kept():
+    col = pd.Series(np.array([0, 200, 255], dtype=np.uint8))
+    assert optimize_column(col).dtype == np.uint8
+
+    report = footprint(pd.DataFrame({"a": col}), timed=False)
+    assert report.bytes_after <= report.bytes_before
+
+
+def test_wide_integers_are_downcast_to_signed():
+    frame = pd.DataFrame({"small": np.array([-3, 100], dtype=np.int64),
+                          "unsigned": np.array([1, 40_000], dtype=np.uint64)})
+    after = optimize(frame)
+    assert after.dtypes.tolist() == [np.int8, np.int32]
+    assert (after == frame).all().all()
+
+
+def test_narrow_floats_are_kept():
+    col = pd.Series(np.array([0.5, 1.5], dtype=np.float16))
+    assert optimize_column(col).dtype == np.float16
+
+
+def test_duplicate_column_names_survive():
+    frame = pd.DataFrame([[1, "x"], [2, "x"]], columns=["a", "a"])
+    after = optimize(frame)
+    assert after.columns.tolist() == ["a", "a"]
+    assert after.dtypes.tolist() == [np.int8, "category"]
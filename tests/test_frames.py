@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from core.frames import _differing, compare_frames
+
+
+def nullable_frame():
+    return pd.DataFrame({
+        "name": pd.array(["a", None, "c"], dtype="string"),
+        "count": pd.array([1, None, 3], dtype="Int64"),
+        "price": pd.array([1.5, None, 3.0], dtype="Float64"),
+    })
+
+
+def test_nullable_columns_with_na_are_equal():
+    expected = nullable_frame()
+    assert compare_frames(expected.copy(), expected).equal
+
+
+def test_na_matches_na_only():
+    expected = nullable_frame()
+    actual = expected.copy()
+    actual.loc[1, "count"] = 2
+    actual.loc[2, "name"] = None
+    for column, differs in [("name", [False, False, True]), ("count", [False, True, False]),
+                            ("price", [False, False, False])]:
+        assert _differing(actual[column], expected[column]).tolist() == differs
+
+    diff = compare_frames(actual, expected)
+    assert not diff.equal and diff.stage == "values"
+    assert diff.columns == ("name", "count")
+
+
+def test_nullable_floats_use_tolerance():
+    expected = pd.Series(pd.array([0.1 + 0.2, None], dtype="Float64"), name="x")
+    actual = pd.Series(pd.array([0.3, None], dtype="Float64"), name="x")
+    assert compare_frames(actual, expected).equal
+
+
+def test_object_columns_holding_arrays():
+    expected = pd.Series([np.array([1, 2]), None, [3]], name="x")
+    actual = pd.Series([np.array([1, 2]), None, [4]], name="x")
+    assert _differing(actual, expected).tolist() == [False, False, True]
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from core.verdicts import VerdictCache, value_nbytes
+
+
+def frame(rows):
+    return pd.DataFrame({"x": np.arange(rows, dtype=np.int64)})
+
+
+def test_value_nbytes_counts_nested_frames():
+    df = frame(1000)
+    assert value_nbytes(df) >= 8000
+    assert value_nbytes((df, {"result": df})) >= 8000
+
+
+def test_evicts_by_bytes():
+    cache = VerdictCache(max_bytes=20_000)
+    for key in range(3):
+        cache.put(key, frame(1000))
+    assert cache.get(0) is None and cache.get(2) is not None
+    assert 0 < cache.bytes <= 20_000 and cache.stats()["evictions"] == 1
+
+
+def test_oversized_value_is_not_stored():
+    cache = VerdictCache(max_bytes=20_000)
+    cache.put("small", frame(10))
+    cache.put("big", frame(10_000))
+    assert cache.get("big") is None and cache.get("small") is not None